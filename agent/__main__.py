@@ -2,20 +2,29 @@
 Run the LangGraph A2A agent server (OpenAI).
 Set OPENAI_API_KEY in env. Default port 8001.
 """
+import argparse
 import os
 
-import uvicorn
-from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from dotenv import load_dotenv
 load_dotenv()
 from agent.agent_executor import LangGraphAgentExecutor
+from utilities.a2a_app import A2AApplication
+from utilities.llm_simulator import is_simulated
+from utilities.push_notifications import PUSH_ENABLED, push_handler_kwargs
+from utilities.shutdown import serve
+from utilities.task_store import add_task_store_argument, create_task_store
 
 
-def main(host: str = "0.0.0.0", port: int = 8001):
-    if not os.getenv("OPENAI_API_KEY"):
+def build_app(
+    host: str = "0.0.0.0",
+    port: int = 8001,
+    task_store: str | None = None,
+    url: str | None = None,
+) -> A2AApplication:
+    """The agent's A2A application (card URL: url, else AGENT_URL, else http://host:port)."""
+    if not os.getenv("OPENAI_API_KEY") and not is_simulated():
         raise ValueError("OPENAI_API_KEY environment variable is required")
 
     skill = AgentSkill(
@@ -26,7 +35,7 @@ def main(host: str = "0.0.0.0", port: int = 8001):
         examples=["What is the capital of France?", "Explain recursion briefly"],
     )
 
-    app_url = os.environ.get("AGENT_URL", f"http://{host}:{port}")
+    app_url = url or os.environ.get("AGENT_URL", f"http://{host}:{port}")
     agent_card = AgentCard(
         name="LangGraph Assistant",
         description="A simple LangGraph agent powered by OpenAI.",
@@ -34,22 +43,30 @@ def main(host: str = "0.0.0.0", port: int = 8001):
         version="1.0.0",
         default_input_modes=["text"],
         default_output_modes=["text"],
-        capabilities=AgentCapabilities(streaming=True),
+        capabilities=AgentCapabilities(streaming=True, push_notifications=PUSH_ENABLED),
         skills=[skill],
     )
 
+    executor = LangGraphAgentExecutor()
     request_handler = DefaultRequestHandler(
-        agent_executor=LangGraphAgentExecutor(),
-        task_store=InMemoryTaskStore(),
+        agent_executor=executor,
+        task_store=create_task_store(task_store, name="agent"),
+        **push_handler_kwargs(),
     )
 
-    app = A2AStarletteApplication(
+    return A2AApplication(
         agent_card=agent_card,
         http_handler=request_handler,
+        warmup=[("agent", executor.warm_up)],
     )
 
-    uvicorn.run(app.build(), host=host, port=port)
+
+def main(host: str = "0.0.0.0", port: int = 8001, task_store: str | None = None):
+    app = build_app(host, port, task_store)
+    serve(app.build(), host, port, [app])
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(prog="agent", description=__doc__.strip().splitlines()[0])
+    add_task_store_argument(parser)
+    main(task_store=parser.parse_args().task_store)
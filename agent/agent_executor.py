@@ -1,16 +1,35 @@
 """
 LangGraph agent executor: bridges A2A protocol and the LangGraph OpenAI agent.
 """
+import asyncio
+import sys
+
 from a2a.server.agent_execution import AgentExecutor
 from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events import EventQueue
 from a2a.utils.message import new_agent_text_message
 
-from agent.langgraph_agent import run_agent  # noqa: E402
+from utilities.graph_streaming import stream_to_queue
+from utilities.tracing import extract, span
 
 
 class LangGraphAgentExecutor(AgentExecutor):
-    """A2A AgentExecutor that runs the LangGraph OpenAI agent."""
+    """A2A AgentExecutor that runs the LangGraph OpenAI agent, streaming its tokens."""
+
+    async def warm_up(self) -> None:
+        """Startup warm-up step: import the agent module and build its graph and chat model, off the event loop."""
+
+        def build() -> None:
+            from agent.langgraph_agent import get_agent
+
+            get_agent()
+
+        await asyncio.to_thread(build)
+
+    async def aclose(self) -> None:
+        """Close the response cache's SQLite connection, if the cache was used (on shutdown; see utilities.shutdown)."""
+        if "agent.response_cache" in sys.modules:
+            await sys.modules["agent.response_cache"].close_response_cache()
 
     async def execute(
         self,
@@ -23,13 +42,12 @@ class LangGraphAgentExecutor(AgentExecutor):
                 new_agent_text_message("Please provide a message.")
             )
             return
-        try:
-            result = await run_agent(user_input.strip())
-            await event_queue.enqueue_event(new_agent_text_message(result))
-        except Exception as e:
-            await event_queue.enqueue_event(
-                new_agent_text_message(f"Error: {e!s}")
-            )
+        # Imported on first use: langgraph and langchain take most of the server's startup time
+        from agent.langgraph_agent import stream_agent
+
+        remote = extract(context.metadata, context.message.metadata)
+        with span("agent.execute", remote_parent=remote, context_id=context.context_id):
+            await stream_to_queue(context, event_queue, stream_agent(user_input.strip(), context.context_id))
 
     async def cancel(
         self,
@@ -3,20 +3,33 @@ Simple LangGraph agent using OpenAI (no tools).
 """
 import os
 
-from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 
+from agent.response_cache import get_response_cache
+from utilities.agent_budget import answer_text, run_budgeted
+from utilities.conversation_memory import memory_config, memory_graph_kwargs
+from utilities.graph_streaming import GraphEvent
+from utilities.llm_simulator import get_chat_model
+
+AGENT_PROMPT = "You are a helpful assistant. Answer concisely."
+NO_RESPONSE = "No response generated."
+
+
+def _model_name() -> str:
+    return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
 
 def _get_agent():
-    model = ChatOpenAI(
-        model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+    model = get_chat_model(
+        _model_name(),
         temperature=0,
         api_key=os.getenv("OPENAI_API_KEY"),
     )
     return create_react_agent(
         model=model,
         tools=[],  # No tools for simple agent
-        prompt="You are a helpful assistant. Answer concisely.",
+        prompt=AGENT_PROMPT,
+        **memory_graph_kwargs(model),
     )
 
 
@@ -30,16 +43,40 @@ def get_agent():
     return _agent
 
 
-async def run_agent(user_message: str) -> str:
-    """Run the LangGraph agent and return the final text response."""
-    agent = get_agent()
-    result = await agent.ainvoke({"messages": [{"role": "user", "content": user_message}]})
-    messages = result.get("messages", [])
-    if not messages:
-        return "No response generated."
-    last = messages[-1]
-    if hasattr(last, "content"):
-        return (last.content or "").strip() or "No response generated."
-    if isinstance(last, dict):
-        return (last.get("content") or "").strip() or "No response generated."
-    return str(last).strip() or "No response generated."
+def _cache_for(config: dict | None):
+    # Answers that depend on conversation memory are never cached
+    return get_response_cache() if config is None else None
+
+
+async def stream_agent(user_message: str, context_id: str | None = None):
+    """Run the LangGraph agent within its budget (agent_budget), yielding GraphEvents as they are produced."""
+    config = memory_config(context_id)
+    cache = _cache_for(config)
+    if cache is not None:
+        cached = await cache.get(_model_name(), AGENT_PROMPT, user_message)
+        if cached is not None:
+            yield GraphEvent("final", text=cached)
+            return
+    async for event in run_budgeted(
+        "agent",
+        get_agent(),
+        {"messages": [{"role": "user", "content": user_message}]},
+        config=config,
+        prompt=user_message,
+    ):
+        if event.kind == "final" and cache is not None and event.text and not event.data.exhausted:
+            await cache.put(_model_name(), AGENT_PROMPT, user_message, event.text)
+        yield event
+
+
+async def run_agent(user_message: str, context_id: str | None = None) -> str:
+    """
+    Run the LangGraph agent and return the final text response (with AGENT_MEMORY, in the
+    context's thread; otherwise served from the response cache when the prompt was seen).
+    When the run's budget ran out, the partial answer is followed by the budget status.
+    """
+    answer = ""
+    async for event in stream_agent(user_message, context_id):
+        if event.kind == "final":
+            answer = answer_text(event).strip()
+    return answer or NO_RESPONSE
@@ -0,0 +1,222 @@
+"""
+Response cache for the LangGraph assistant.
+
+Answers are keyed by LLM backend (with the simulator's script and recordings, so simulated
+answers are never served to a real model), model, system prompt and normalized user prompt
+(case, whitespace and trailing punctuation folded). Two tiers: an in-memory LRU and an optional SQLite file shared
+across restarts, both with a TTL. Optionally, a miss can be served by a near-duplicate prompt:
+hashed character n-gram vectors compared by cosine similarity, only between prompts with the
+same numbers in them ("2 + 3" never matches "2 + 4").
+
+Configured by AGENT_CACHE (off by default; AGENT_CACHE=1 turns it on), AGENT_CACHE_SIZE, AGENT_CACHE_TTL (seconds),
+AGENT_CACHE_DB (SQLite path; unset keeps the cache in memory only) and AGENT_CACHE_NEAR_DUP
+(cosine threshold such as 0.85; unset disables near-duplicate matching). SQLite reads and
+writes run in a worker thread (asyncio.to_thread), and expired rows are purged at most once a
+minute.
+"""
+import asyncio
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from utilities import llm_simulator
+
+CACHE_ENABLED = os.getenv("AGENT_CACHE", "0").lower() in ("1", "true", "yes")
+CACHE_SIZE = int(os.getenv("AGENT_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.getenv("AGENT_CACHE_TTL", "3600"))
+CACHE_DB = os.getenv("AGENT_CACHE_DB") or None
+CACHE_NEAR_DUP = float(os.getenv("AGENT_CACHE_NEAR_DUP", "0") or 0)
+
+_NGRAM = 3
+_DIMS = 1 << 12
+_PURGE_INTERVAL = 60.0
+
+
+def _backend() -> str:
+    if llm_simulator.is_simulated():
+        return "\0".join((llm_simulator.LLM_BACKEND, llm_simulator.SIM_SCRIPT or "", llm_simulator.SIM_RECORDINGS or ""))
+    return llm_simulator.LLM_BACKEND
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.lower().split()).rstrip(" .!?")
+
+
+def cache_key(model: str, system_prompt: str, prompt: str) -> str:
+    raw = "\0".join((_backend(), model, system_prompt, normalize_prompt(prompt)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def ngram_vector(text: str) -> dict[int, float]:
+    """L2-normalized sparse vector of hashed character trigrams of a normalized prompt."""
+    padded = f" {text} "
+    counts: dict[int, float] = {}
+    for i in range(len(padded) - _NGRAM + 1):
+        h = zlib.crc32(padded[i:i + _NGRAM].encode("utf-8")) % _DIMS
+        counts[h] = counts.get(h, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def _cosine(a: dict[int, float], b: dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+@dataclass
+class _Entry:
+    response: str
+    expires: float
+    scope: str  # backend + model + system prompt: near-duplicates never cross it
+    numbers: tuple[str, ...]
+    vector: dict[int, float] | None = None
+
+
+class ResponseCache:
+    """In-memory LRU with TTL, backed by an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        db_path: str | None = CACHE_DB,
+        near_dup_threshold: float = CACHE_NEAR_DUP,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.near_dup_threshold = near_dup_threshold
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._last_purge = 0.0
+        self.stats = {"hits": 0, "near_hits": 0, "disk_hits": 0, "misses": 0}
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, prompt TEXT, response TEXT, expires REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+            self._db.commit()
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _entry(self, model: str, system_prompt: str, prompt: str, response: str, expires: float) -> _Entry:
+        normalized = normalize_prompt(prompt)
+        return _Entry(
+            response=response,
+            expires=expires,
+            scope=f"{_backend()}\0{model}\0{system_prompt}",
+            numbers=tuple(re.findall(r"\d+(?:\.\d+)?", normalized)),
+            vector=ngram_vector(normalized) if self.near_dup_threshold > 0 else None,
+        )
+
+    def _db_get(self, key: str) -> tuple[str, float] | None:
+        with self._db_lock:
+            return self._db.execute("SELECT response, expires FROM responses WHERE key = ?", (key,)).fetchone()
+
+    def _db_put(self, row: tuple) -> None:
+        now = time.time()
+        with self._db_lock:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, prompt, response, expires) VALUES (?, ?, ?, ?, ?)",
+                    row,
+                )
+                if now - self._last_purge >= _PURGE_INTERVAL:
+                    self._last_purge = now
+                    self._db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+
+    def _db_clear(self) -> None:
+        with self._db_lock:
+            with self._db:
+                self._db.execute("DELETE FROM responses")
+
+    async def get(self, model: str, system_prompt: str, prompt: str) -> str | None:
+        """Cached response for the prompt (exact, then disk, then near-duplicate), or None."""
+        now = time.time()
+        key = cache_key(model, system_prompt, prompt)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.response
+            del self._entries[key]
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key)
+            if row is not None and row[1] > now:
+                self._remember(key, self._entry(model, system_prompt, prompt, row[0], row[1]))
+                self.stats["disk_hits"] += 1
+                return row[0]
+        if self.near_dup_threshold > 0:
+            probe = self._entry(model, system_prompt, prompt, "", 0.0)
+            best, best_score = None, self.near_dup_threshold
+            for candidate in self._entries.values():
+                if candidate.scope != probe.scope or candidate.numbers != probe.numbers or candidate.expires <= now:
+                    continue
+                score = _cosine(probe.vector, candidate.vector or {})
+                if score >= best_score:
+                    best, best_score = candidate, score
+            if best is not None:
+                self.stats["near_hits"] += 1
+                return best.response
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, model: str, system_prompt: str, prompt: str, response: str) -> None:
+        expires = time.time() + self.ttl
+        key = cache_key(model, system_prompt, prompt)
+        self._remember(key, self._entry(model, system_prompt, prompt, response, expires))
+        if self._db is not None:
+            await asyncio.to_thread(self._db_put, (key, model, normalize_prompt(prompt), response, expires))
+
+    def _db_close(self) -> None:
+        with self._db_lock:
+            self._db.close()
+
+    async def close(self) -> None:
+        """Close the SQLite tier (the in-memory tier needs nothing)."""
+        if self._db is not None:
+            await asyncio.to_thread(self._db_close)
+            self._db = None
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        if self._db is not None:
+            await asyncio.to_thread(self._db_clear)
+
+
+_cache: ResponseCache | None = None
+
+
+async def close_response_cache() -> None:
+    """Close the process-wide cache, if one was created (call on shutdown)."""
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        await cache.close()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Process-wide cache, or None when AGENT_CACHE is off."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
@@ -6,6 +6,8 @@ import os
 from pathlib import Path
 from typing import Any
 
+from utilities.metrics import phase
+
 # Default path to registry relative to this file
 DEFAULT_REGISTRY_PATH = Path(__file__).parent / "agent_registry.json"
 
@@ -13,10 +15,11 @@ DEFAULT_REGISTRY_PATH = Path(__file__).parent / "agent_registry.json"
 def load_registry(registry_path: str | Path | None = None) -> dict[str, Any]:
     """Load agent registry from JSON file."""
     path = Path(registry_path) if registry_path else DEFAULT_REGISTRY_PATH
-    if not path.is_file():
-        return {"agents": []}
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    with phase("registry_load"):
+        if not path.is_file():
+            return {"agents": []}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
 
 
 def get_agents(registry_path: str | Path | None = None) -> list[dict[str, Any]]:
@@ -14,6 +14,10 @@ import logging                        # Standard library for configurable loggin
 from client.client import A2AClient
 # Import Task model to represent the full task response
 from models.task import Task
+# Per-phase latency metrics (served at /metrics)
+from utilities.metrics import phase
+# Trace context for the remote agent (W3C traceparent in the task metadata)
+from utilities.tracing import inject
 
 # Create a logger for this module using its namespace
 logger = logging.getLogger(__name__)
@@ -69,7 +73,10 @@ class AgentConnector:
         }
 
         # Use the A2AClient to send the task asynchronously and await the response
-        task_result = await self.client.send_task(payload)
+        with phase("downstream_call"):
+            # Carry the trace context in the task metadata too (A2AClient also sends it as a header)
+            payload["metadata"] = inject()
+            task_result = await self.client.send_task(payload)
         # Log receipt of the completed task for debugging/tracing
         logger.info(f"AgentConnector: received response from {self.name} for task {task_id}")
         # Return the Task Pydantic model for further processing by the orchestrator
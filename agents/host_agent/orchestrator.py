@@ -61,6 +61,9 @@ from models.task import Message, TaskStatus, TaskState, TextPart
 from agents.host_agent.agent_connect import AgentConnector
 # AgentConnector: lightweight wrapper around A2AClient to call other agents
 
+from utilities.llm_simulator import get_adk_model
+# get_adk_model: the Gemini model name, or an offline simulated model when LLM_BACKEND=simulated
+
 from models.agent import AgentCard
 # AgentCard: metadata structure for agent discovery results
 
@@ -109,7 +112,7 @@ class OrchestratorAgent:
         - Available tool functions
         """
         return LlmAgent(
-            model="gemini-2.5-flash",    # Specify Gemini model version
+            model=get_adk_model("gemini-2.5-flash"),  # Gemini model version (simulated offline if LLM_BACKEND=simulated)
             name="orchestrator_agent",          # Human identifier for this agent
             description="Delegates user queries to either portfolio agent or validator agent",
             instruction=self._root_instruction,  # Function providing system prompt text
@@ -283,6 +286,7 @@ class OrchestratorTaskManager(InMemoryTaskManager):
         async with self.lock:
             task.status = TaskStatus(state=TaskState.COMPLETED)
             task.history.append(reply)
+            self.tasks[task.id] = task  # Store again so the reply is counted in the task's size
 
         # Step 4: return structured response
         return SendTaskResponse(id=request.id, result=task)
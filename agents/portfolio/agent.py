@@ -11,25 +11,14 @@
 # 📦 Built-in & External Library Imports
 # -----------------------------------------------------------------------------
 
-from datetime import datetime
-import traceback  # Used to get the current system time
+import traceback  # Used to print the stack trace of an error
 
-# 🧠 Gemini-based AI agent provided by Google's ADK
-from google.adk.agents.llm_agent import LlmAgent
+# 🧠 Google's ADK (LlmAgent, Runner, session/memory/artifact services) and
+# google.genai types are only needed by the Gemini code commented out below;
+# import them inside __init__/invoke when it is brought back, not here, so the
+# server starts without loading them. The same goes for
+# agents.portfolio.mcp_client (fastmcp).
 
-# 📚 ADK services for session, memory, and file-like "artifacts"
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
-
-# 🏃 The "Runner" connects the agent, session, memory, and files into a complete system
-from google.adk.runners import Runner
-
-# 🧾 Gemini-compatible types for formatting input/output messages
-from google.genai import types
-from agents.portfolio.mcp_client import call_add_tool
-
-import asyncio
 # 🔐 Load environment variables (like API keys) from a `.env` file
 from dotenv import load_dotenv
 load_dotenv()  # Load variables like GOOGLE_API_KEY into the system
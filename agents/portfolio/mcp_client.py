@@ -1,20 +1,19 @@
-from mcp import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
+import os
 
+from mcp_connector import client_for_url
 
-async def call_add_tool():
 
-    async with streamablehttp_client(
-        "http://localhost:8000"
-    ) as (read, write, _):
+async def call_add_tool():
 
-        async with ClientSession(read, write) as session:
+    # PORTFOLIO_MCP_URL overrides the server (memory://standin runs against the
+    # bundled in-process stand-in server)
+    client = client_for_url(os.environ.get("PORTFOLIO_MCP_URL", "http://localhost:8000"))
 
-            await session.initialize()
+    async with client:
 
-            result = await session.call_tool(
-                "add",
-                {"a": 5, "b": 10}
-            )
+        result = await client.call_tool_mcp(
+            "add",
+            {"a": 5, "b": 10}
+        )
 
-            return result
+        return result
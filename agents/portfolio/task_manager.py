@@ -106,6 +106,7 @@ class AgentTaskManager(InMemoryTaskManager):
         async with self.lock:                   # Lock access to avoid concurrent writes
             task.status = TaskStatus(state=TaskState.COMPLETED)  # Mark task as done
             task.history.append(agent_message)  # Append the agent's message to the task history
+            self.tasks[task.id] = task          # Store again so the reply counts toward A2A_TASK_MAX_BYTES
 
         # Step 6: Return a structured response back to the A2A client
         return SendTaskResponse(id=request.id, result=task)
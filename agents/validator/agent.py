@@ -1,21 +1,9 @@
 
 
-from datetime import datetime
-import traceback  # Used to get the current system time
+import traceback  # Used to print the stack trace of an error
 
-# 🧠 Gemini-based AI agent provided by Google's ADK
-from google.adk.agents.llm_agent import LlmAgent
-
-# 📚 ADK services for session, memory, and file-like "artifacts"
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
-
-# 🏃 The "Runner" connects the agent, session, memory, and files into a complete system
-from google.adk.runners import Runner
-
-# 🧾 Gemini-compatible types for formatting input/output messages
-from google.genai import types
+# The validator answers from a fixed report, so it needs none of Google's ADK
+# (agent, runner, session/memory services): importing them took most of its startup.
 
 # 🔐 Load environment variables (like API keys) from a `.env` file
 from dotenv import load_dotenv
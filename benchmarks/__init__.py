@@ -0,0 +1 @@
+# Micro-benchmarks and load scripts (run with python -m benchmarks.<name>)
@@ -0,0 +1,145 @@
+"""
+Benchmark: co-located single process (host.colocated) vs. three processes (host, agent, mcp_agent).
+
+Starts each topology on local ports with the LLM simulator (no model latency unless --llm-ms) and
+the in-process MCP stand-in, then sends message/send requests to the host, routed by agent_id to
+the MCP agent ("Add 3 and 5", answered by its fast path) and to the LangGraph agent. Prints
+mean/p50/p95 per topology and agent.
+
+    python -m benchmarks.colocated [--requests 200] [--base-port 18080] [--llm-ms 0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from mcp_connector.bench import percentile  # noqa: E402
+
+TARGETS = {"mcp-tool-agent": "Add 3 and 5", "langgraph-assistant": "What is the capital of France?"}
+
+
+def _body(text: str, agent_id: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "message/send",
+        "params": {
+            "metadata": {"agent_id": agent_id},
+            "message": {"kind": "message", "messageId": "m1", "role": "user", "parts": [{"kind": "text", "text": text}]},
+        },
+    }
+
+
+def _env(llm_ms: float) -> dict:
+    env = dict(os.environ)
+    env.setdefault("LLM_BACKEND", "simulated")
+    env.setdefault("LLM_SIM_SCRIPT", str(ROOT / "benchmarks" / "llm_sim_script.json"))
+    env.setdefault("MCP_SERVER_URL", "memory://standin")
+    env.update(LLM_SIM_TTFT_MS=str(llm_ms), LLM_SIM_PREFILL_MS="0", LLM_SIM_TPOT_MS="0", AGENT_CACHE="0")
+    env["PYTHONPATH"] = str(ROOT)
+    return env
+
+
+def _registry(path: Path, agent_port: int, mcp_port: int) -> None:
+    registry = json.loads((ROOT / "agent_registry.json").read_text())
+    ports = {"langgraph-assistant": agent_port, "mcp-tool-agent": mcp_port}
+    for agent in registry["agents"]:
+        if agent["id"] in ports:
+            agent["url"] = f"http://127.0.0.1:{ports[agent['id']]}"
+    path.write_text(json.dumps(registry))
+
+
+def _spawn(code: str, env: dict) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def _wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/.well-known/agent-card.json")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not start")
+
+
+async def _measure(url: str, requests: int) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = {agent_id: [] for agent_id in TARGETS}
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        for agent_id, text in TARGETS.items():
+            for _ in range(10):  # warm up
+                (await client.post("/", json=_body(text, agent_id))).raise_for_status()
+        for i in range(requests * len(TARGETS)):
+            agent_id = list(TARGETS)[i % len(TARGETS)]
+            start = time.perf_counter()
+            response = await client.post("/", json=_body(TARGETS[agent_id], agent_id))
+            samples[agent_id].append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+    return samples
+
+
+async def run(opts) -> None:
+    env = _env(opts.llm_ms)
+    host_port, agent_port, mcp_port = opts.base_port, opts.base_port + 1, opts.base_port + 2
+    results: dict[str, dict[str, list[float]]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = Path(tmp) / "agent_registry.json"
+        _registry(registry, agent_port, mcp_port)
+        topologies = {
+            "3 procs": [
+                f"from agent.__main__ import main; main(port={agent_port})",
+                f"from mcp_agent.__main__ import main; main(port={mcp_port})",
+                f"from host.__main__ import main; main(port={host_port}, registry_path={str(registry)!r})",
+            ],
+            "1 proc": [
+                "import sys; from host.colocated import main; "
+                f"sys.argv = ['colocated', '--port', '{host_port}', '--registry', {str(registry)!r}]; main()"
+            ],
+        }
+        for label, programs in topologies.items():
+            procs = [_spawn(code, env) for code in programs]
+            try:
+                if len(procs) > 1:
+                    await _wait_ready(f"http://127.0.0.1:{agent_port}")
+                    await _wait_ready(f"http://127.0.0.1:{mcp_port}")
+                await _wait_ready(f"http://127.0.0.1:{host_port}")
+                results[label] = await _measure(f"http://127.0.0.1:{host_port}", opts.requests)
+            finally:
+                for proc in procs:
+                    proc.terminate()
+                for proc in procs:
+                    proc.wait()
+    print(f"{'topology':<9} {'agent':<20} {'n':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for label, by_agent in results.items():
+        for agent_id, lat in by_agent.items():
+            lat.sort()
+            print(
+                f"{label:<9} {agent_id:<20} {len(lat):>5} {statistics.fmean(lat):>9.2f} "
+                f"{statistics.median(lat):>9.2f} {percentile(lat, 95):>9.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="requests per agent and topology")
+    parser.add_argument("--base-port", type=int, default=18080, help="host port; agents on the next two")
+    parser.add_argument("--llm-ms", type=float, default=0.0, help="simulated time to first token")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: MCP agent latency for simple tool intents, fast path vs. LLM path.
+
+Sends the registry examples ("Add 3 and 5", "Greet Alice", ...) through run_mcp_agent with the
+deterministic fast path on (after checking that none of NEGATIVE_MESSAGES, ordinary questions
+that start with a tool name, takes it), then (when OPENAI_API_KEY is set) with it off, and prints p50/p95
+per path. Uses the in-process stand-in MCP server unless MCP_SERVER_URL is set.
+
+    python -m benchmarks.fast_path [--repeat 50] [--llm-repeat 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("MCP_SERVER_URL", "memory://standin")
+
+from mcp_agent import fast_path  # noqa: E402
+from mcp_agent.mcp_langgraph_agent import run_mcp_agent  # noqa: E402
+from mcp_connector.bench import percentile  # noqa: E402
+
+MESSAGES = ["Add 3 and 5", "Greet Alice", "Echo hello world", "generate random number between 10 and 20"]
+# Must go to the LLM: a question or a second clause is not the registry examples' imperative
+NEGATIVE_MESSAGES = [
+    "Echo is a nymph in Greek mythology, tell me more",
+    "echo what did I just say?",
+    "Echo hello world, then add 3 and 5",
+    "repeat what you said 3 times",
+    "Greet Alice and tell me a joke",
+    "Echo hello. Now add 3 and 5",
+    "Echo hello world twice",
+    "Greet the team",
+    "Greet my boss",
+    "Search for cheap flights",
+]
+
+
+async def _time_path(repeat: int) -> tuple[list[float], str]:
+    samples = []
+    answer = ""
+    for i in range(repeat):
+        message = MESSAGES[i % len(MESSAGES)]
+        start = time.perf_counter()
+        answer = await run_mcp_agent(message)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, answer
+
+
+def _row(label: str, samples: list[float]) -> str:
+    lat = sorted(samples)
+    return f"{label:<10} {len(lat):>6} {statistics.median(lat):>12.2f} {percentile(lat, 95):>12.2f}"
+
+
+async def run(repeat: int, llm_repeat: int) -> None:
+    matched = [m for m in MESSAGES if fast_path.parse_intent(m, await _manifest())]
+    print(f"fast-path hits: {len(matched)}/{len(MESSAGES)} registry examples")
+    wrong = [m for m in NEGATIVE_MESSAGES if fast_path.parse_intent(m, await _manifest())]
+    print(f"fast-path false hits: {len(wrong)}/{len(NEGATIVE_MESSAGES)} ordinary questions")
+    for message in wrong:
+        print(f"    {message!r} -> {fast_path.parse_intent(message, await _manifest())}")
+    await run_mcp_agent(MESSAGES[0])  # connect the pooled session and load the manifest
+    fast, answer = await _time_path(repeat)
+    print(f"{'path':<10} {'n':>6} {'p50 ms':>12} {'p95 ms':>12}")
+    print(_row("fast", fast))
+    if not os.getenv("OPENAI_API_KEY"):
+        print("llm        skipped (set OPENAI_API_KEY to measure the LLM path)")
+        return
+    fast_path.FAST_PATH_ENABLED = False
+    try:
+        llm, _ = await _time_path(llm_repeat)
+    finally:
+        fast_path.FAST_PATH_ENABLED = True
+    print(_row("llm", llm))
+    print(f"p50 speedup: {statistics.median(llm) / statistics.median(fast):.0f}x")
+
+
+async def _manifest() -> list[dict]:
+    from mcp_connector import get_pooled_session
+
+    return await get_pooled_session().manifest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50, help="Fast-path requests (default 50)")
+    parser.add_argument("--llm-repeat", type=int, default=5, help="LLM-path requests (default 5)")
+    opts = parser.parse_args()
+    asyncio.run(run(opts.repeat, opts.llm_repeat))
+
+
+if __name__ == "__main__":
+    main()
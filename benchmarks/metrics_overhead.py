@@ -0,0 +1,138 @@
+"""
+Benchmark: cost of the per-phase metrics (utilities.metrics).
+
+1. Micro: one `with phase(...)` block vs. an empty context manager, in ns per call.
+2. End to end: message/send through the A2A app in-process (httpx ASGI transport, echo executor
+   that times a routing and a downstream_call phase like the host does), A2AApplication vs. the
+   plain A2AStarletteApplication, alternating rounds; prints mean/p50 per request and the overhead.
+3. Scrape: time to render /metrics with every phase populated.
+
+    python -m benchmarks.metrics_overhead [--calls 200000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import contextlib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from a2a.server.agent_execution import AgentExecutor  # noqa: E402
+from a2a.server.apps import A2AStarletteApplication  # noqa: E402
+from a2a.server.request_handlers import DefaultRequestHandler  # noqa: E402
+from a2a.server.tasks import InMemoryTaskStore  # noqa: E402
+from a2a.types import AgentCapabilities, AgentCard  # noqa: E402
+from a2a.utils.message import new_agent_text_message  # noqa: E402
+
+from mcp_connector.bench import percentile  # noqa: E402
+from utilities import metrics  # noqa: E402
+from utilities.a2a_app import A2AApplication  # noqa: E402
+
+BODY = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "message/send",
+    "params": {"message": {"kind": "message", "messageId": "m1", "role": "user", "parts": [{"kind": "text", "text": "hi"}]}},
+}
+
+
+class _EchoExecutor(AgentExecutor):
+    async def execute(self, context, event_queue):
+        with metrics.phase("routing"):
+            pass
+        with metrics.phase("downstream_call"):
+            text = context.get_user_input()
+        await event_queue.enqueue_event(new_agent_text_message(text))
+
+    async def cancel(self, context, event_queue):
+        raise NotImplementedError
+
+
+def _app(app_class):
+    card = AgentCard(
+        name="bench",
+        description="bench",
+        url="http://bench",
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    handler = DefaultRequestHandler(agent_executor=_EchoExecutor(), task_store=InMemoryTaskStore())
+    return app_class(agent_card=card, http_handler=handler).build()
+
+
+def micro(calls: int) -> None:
+    null = contextlib.nullcontext()
+    start = time.perf_counter()
+    for _ in range(calls):
+        with null:
+            pass
+    base = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.phase("tool_call"):
+            pass
+    timed = time.perf_counter() - start
+    print(f"phase(): {(timed - base) / calls * 1e9:.0f} ns per call over an empty context manager")
+
+
+async def _round(client: httpx.AsyncClient, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await client.post("/", json=BODY)
+        samples.append((time.perf_counter() - start) * 1e6)
+        response.raise_for_status()
+    return samples
+
+
+async def end_to_end(requests: int, rounds: int = 5) -> None:
+    clients = {
+        label: httpx.AsyncClient(transport=httpx.ASGITransport(app=_app(cls)), base_url="http://bench")
+        for label, cls in (("plain", A2AStarletteApplication), ("metrics", A2AApplication))
+    }
+    samples: dict[str, list[float]] = {label: [] for label in clients}
+    for label, client in clients.items():
+        await _round(client, 50)  # warm up
+    # Without metrics, the executor's phase() calls are no-ops too
+    for _ in range(rounds):
+        for label, client in clients.items():
+            metrics.METRICS_ENABLED = label == "metrics"
+            samples[label] += await _round(client, requests // rounds)
+    metrics.METRICS_ENABLED = True
+    print(f"{'app':<8} {'n':>6} {'mean us':>10} {'p50 us':>10} {'p95 us':>10}")
+    for label, lat in samples.items():
+        lat.sort()
+        print(f"{label:<8} {len(lat):>6} {statistics.fmean(lat):>10.0f} {statistics.median(lat):>10.0f} {percentile(lat, 95):>10.0f}")
+    plain, timed = statistics.median(samples["plain"]), statistics.median(samples["metrics"])
+    print(f"p50 overhead: {timed - plain:.1f} us ({(timed - plain) / plain * 100:+.2f}%)")
+    for client in clients.values():
+        await client.aclose()
+
+
+def scrape() -> None:
+    for name in metrics.PHASES:
+        metrics.observe_phase(name, 0.01)
+    start = time.perf_counter()
+    for _ in range(1000):
+        text = metrics.render()
+    print(f"render(): {(time.perf_counter() - start) * 1000:.0f} us per scrape ({len(text)} bytes)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200_000, help="phase() calls for the micro benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="message/send requests per app")
+    opts = parser.parse_args()
+    micro(opts.calls)
+    asyncio.run(end_to_end(opts.requests))
+    scrape()
+
+
+if __name__ == "__main__":
+    main()
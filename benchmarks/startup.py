@@ -0,0 +1,158 @@
+"""
+Benchmark: import time of every server entry point, against a budget.
+
+Each entry point is imported in a fresh interpreter with `python -X importtime`; the module's
+cumulative import time (median of --runs, after one run that warms the bytecode cache) is checked
+against its budget, and the modules it loaded against the heavy ones it must leave to first use
+(LLM stacks, fastmcp, Google ADK). --check exits 1 when an entry point is over budget or loads a
+deferred module, so it can gate CI (tests/test_startup.py runs it). An entry point is skipped
+only when one of its optional packages (Google ADK, not in requirements.txt) is not installed;
+any other import error fails the check.
+
+Budgets are about twice the medians measured on a development machine (agent, mcp_agent and
+host around 0.7-1.0 s, with runs up to 1.15 s), so --check catches an eager heavy import, not
+noise; scale them with --budget-scale on slower CI runners.
+
+    python -m benchmarks.startup [--runs 5] [--top 5] [--budget-scale 1.0] [--check]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LLM_STACK = ("langgraph", "langchain_core", "langchain_openai", "openai")
+ADK = ("google.adk", "google.genai")
+
+
+@dataclass(frozen=True)
+class EntryPoint:
+    module: str
+    budget_ms: float
+    deferred: tuple[str, ...] = ()
+    # Packages the entry point needs that are not in requirements.txt; skipped when missing
+    optional: tuple[str, ...] = ()
+
+
+ENTRY_POINTS = [
+    EntryPoint("agent.__main__", 2000, LLM_STACK),
+    EntryPoint("mcp_agent.__main__", 2000, LLM_STACK + ("fastmcp",)),
+    EntryPoint("host.__main__", 2000, LLM_STACK + ("fastmcp",)),
+    EntryPoint("host.colocated", 2000, LLM_STACK + ("fastmcp",)),
+    EntryPoint("agents.portfolio.__main__", 1200, LLM_STACK + ADK + ("fastmcp",), optional=ADK),
+    EntryPoint("agents.validator.__main__", 1200, LLM_STACK + ADK + ("fastmcp",), optional=ADK),
+    # The orchestrator builds its ADK agent at startup, so ADK stays in its budget
+    EntryPoint("agents.host_agent.entry", 5000, LLM_STACK, optional=ADK),
+]
+
+_PROBE = "import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+
+
+@dataclass
+class Sample:
+    total_us: int
+    children: dict[str, int]
+    modules: list[str]
+
+
+def _parse_importtime(stderr: str, module: str) -> tuple[int, dict[str, int]]:
+    """Cumulative microseconds of module and of each of its direct imports."""
+    total, children, pending = 0, {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.startswith("import time: self"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        depth = len(name) - len(name.lstrip(" "))
+        name = name.strip()
+        # A module's line comes after those of the modules it imported
+        if depth == 1:
+            if name == module:
+                total, children = int(cumulative), pending
+            pending = {}
+        elif depth == 3:
+            pending[name] = pending.get(name, 0) + int(cumulative)
+    return total, children
+
+
+def _sample(entry: EntryPoint) -> Sample | str:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=entry.module)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if line and not line.startswith("import time:")]
+        return errors[-1] if errors else f"exit code {proc.returncode}"
+    total, children = _parse_importtime(proc.stderr, entry.module)
+    return Sample(total, children, json.loads(proc.stdout.splitlines()[-1]))
+
+
+def _missing_optional(entry: EntryPoint, error: str) -> str | None:
+    """The optional package whose absence caused error, or None for any other failure."""
+    m = re.fullmatch(r"ModuleNotFoundError: No module named '([\w.]+)'", error)
+    if m is None:
+        return None
+    name = m[1]
+    # "google" missing means "google.adk" is too
+    if any(name == p or name.startswith(p + ".") or p.startswith(name + ".") for p in entry.optional):
+        return name
+    return None
+
+
+def _loaded(modules: list[str], prefixes: tuple[str, ...]) -> list[str]:
+    return [p for p in prefixes if any(m == p or m.startswith(p + ".") for m in modules)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="measured imports per entry point")
+    parser.add_argument("--top", type=int, default=0, help="also show the N slowest direct imports")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply budgets (slow CI machines)")
+    parser.add_argument("--check", action="store_true", help="exit 1 on a budget or deferred-import violation")
+    opts = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<28} {'import ms':>10} {'budget ms':>10}  status")
+    for entry in ENTRY_POINTS:
+        first = _sample(entry)  # also writes the .pyc files
+        if isinstance(first, str):
+            missing = _missing_optional(entry, first)
+            status = f"skipped: {missing} not installed" if missing else f"import failed: {first}"
+            print(f"{entry.module:<28} {'-':>10} {entry.budget_ms * opts.budget_scale:>10.0f}  {status}")
+            if not missing:
+                failures.append(entry.module)
+            continue
+        samples = [_sample(entry) for _ in range(opts.runs)]
+        samples = [s for s in samples if isinstance(s, Sample)] or [first]
+        median_ms = statistics.median(s.total_us for s in samples) / 1000
+        budget_ms = entry.budget_ms * opts.budget_scale
+        problems = []
+        if median_ms > budget_ms:
+            problems.append("over budget")
+        loaded = _loaded(samples[0].modules, entry.deferred)
+        if loaded:
+            problems.append("loads " + ", ".join(loaded))
+        status = "; ".join(problems) or "ok"
+        print(f"{entry.module:<28} {median_ms:>10.1f} {budget_ms:>10.0f}  {status}")
+        if problems:
+            failures.append(entry.module)
+        if opts.top:
+            children = sorted(samples[0].children.items(), key=lambda item: -item[1])[: opts.top]
+            for name, us in children:
+                print(f"    {name:<40} {us / 1000:>8.1f} ms")
+    if opts.check and failures:
+        print(f"startup check failed: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
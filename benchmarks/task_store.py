@@ -0,0 +1,197 @@
+"""
+Benchmark: SqliteTaskStore vs. InMemoryTaskStore (utilities.task_store).
+
+1. Store: N tasks saved sequentially, then --concurrency tasks each saved --updates times at once
+   (like streamed status updates), then every task read back; ops/s per store. For SQLite also
+   the transactions used (group commit), bytes per task and a reopen check (tasks survive).
+2. End to end: message/send through the A2A app in-process (httpx ASGI transport, echo executor
+   answering with a task), memory vs. sqlite task store; mean/p50/p95 per request.
+3. Soak: --soak tasks through the in-memory store (each saved working, then completed), bounded
+   (max 1000 tasks) vs. unbounded; Python heap (tracemalloc) at each tenth of the run.
+
+    python -m benchmarks.task_store [--tasks 2000] [--concurrency 100] [--updates 10] [--requests 1000]
+        [--soak 50000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from a2a.server.agent_execution import AgentExecutor  # noqa: E402
+from a2a.server.request_handlers import DefaultRequestHandler  # noqa: E402
+from a2a.server.tasks import InMemoryTaskStore, TaskUpdater  # noqa: E402
+from a2a.types import (  # noqa: E402
+    AgentCapabilities,
+    AgentCard,
+    Artifact,
+    Message,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from a2a.utils import new_task  # noqa: E402
+
+from mcp_connector.bench import percentile  # noqa: E402
+from utilities.a2a_app import A2AApplication  # noqa: E402
+from utilities.task_store import BoundedInMemoryTaskStore, SqliteTaskStore, encode_task  # noqa: E402
+
+BODY = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "message/send",
+    "params": {"message": {"kind": "message", "messageId": "m1", "role": "user", "parts": [{"kind": "text", "text": "hi"}]}},
+}
+
+
+def _task(i: int, state: TaskState = TaskState.working) -> Task:
+    text = f"Answer number {i}: " + "lorem ipsum " * 20
+    return Task(
+        id=f"task-{i}",
+        context_id=f"ctx-{i % 50}",
+        status=TaskStatus(state=state),
+        history=[Message(message_id=str(uuid.uuid4()), role=Role.user, parts=[Part(TextPart(text=f"Question {i}"))])],
+        artifacts=[Artifact(artifact_id=str(uuid.uuid4()), parts=[Part(TextPart(text=text))])],
+    )
+
+
+async def store_bench(label: str, store, tasks: int, concurrency: int, updates: int) -> None:
+    start = time.perf_counter()
+    for i in range(tasks):
+        await store.save(_task(i))
+    sequential = time.perf_counter() - start
+
+    async def stream(i: int) -> None:
+        for u in range(updates):
+            await store.save(_task(i, TaskState.completed if u == updates - 1 else TaskState.working))
+
+    transactions = getattr(store, "stats", {}).get("transactions", 0)
+    start = time.perf_counter()
+    await asyncio.gather(*(stream(tasks + i) for i in range(concurrency)))
+    concurrent = time.perf_counter() - start
+    transactions = getattr(store, "stats", {}).get("transactions", 0) - transactions
+
+    start = time.perf_counter()
+    for i in range(tasks):
+        assert await store.get(f"task-{i}") is not None
+    reads = time.perf_counter() - start
+
+    extra = f"  ({transactions} transactions for {concurrency * updates} saves)" if transactions else ""
+    print(
+        f"{label:<8} save {tasks / sequential:>9.0f}/s   concurrent save {concurrency * updates / concurrent:>9.0f}/s"
+        f"   get {tasks / reads:>9.0f}/s{extra}"
+    )
+
+
+async def _round(client: httpx.AsyncClient, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await client.post("/", json=BODY)
+        samples.append((time.perf_counter() - start) * 1e6)
+        response.raise_for_status()
+    return samples
+
+
+class _EchoExecutor(AgentExecutor):
+    """Answers as a task like the agents do: submitted, working, one artifact, completed."""
+
+    async def execute(self, context, event_queue):
+        task = new_task(context.message)
+        await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+        await updater.start_work()
+        await updater.add_artifact([Part(TextPart(text=context.get_user_input()))], name="answer")
+        await updater.complete()
+
+    async def cancel(self, context, event_queue):
+        raise NotImplementedError
+
+
+def _app(task_store):
+    card = AgentCard(
+        name="bench",
+        description="bench",
+        url="http://bench",
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    handler = DefaultRequestHandler(agent_executor=_EchoExecutor(), task_store=task_store)
+    return A2AApplication(agent_card=card, http_handler=handler).build()
+
+
+async def end_to_end(stores: dict, requests: int) -> None:
+    print(f"{'store':<8} {'n':>6} {'mean us':>10} {'p50 us':>10} {'p95 us':>10}")
+    for label, store in stores.items():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_app(store)), base_url="http://bench") as client:
+            await _round(client, 50)  # warm up
+            lat = sorted(await _round(client, requests))
+        print(f"{label:<8} {len(lat):>6} {statistics.fmean(lat):>10.0f} {statistics.median(lat):>10.0f} {percentile(lat, 95):>10.0f}")
+
+
+async def soak(tasks: int) -> None:
+    checkpoints = {tasks * k // 10 for k in range(1, 11)}
+    print(f"{'store':<10} heap MB after each {tasks // 10} tasks")
+    for label, limits in (("unbounded", {"max_tasks": 0}), ("bounded", {"max_tasks": 1000})):
+        store = BoundedInMemoryTaskStore(f"soak-{label}", max_bytes=0, ttl=0, **limits)
+        tracemalloc.start()
+        heap = []
+        for i in range(1, tasks + 1):
+            await store.save(_task(i))
+            await store.save(_task(i, TaskState.completed))
+            if i in checkpoints:
+                heap.append(tracemalloc.get_traced_memory()[0] / 1e6)
+        tracemalloc.stop()
+        evicted = store.stats()["evictions"]["lru"]
+        print(f"{label:<10} {' '.join(f'{mb:6.1f}' for mb in heap)}   ({len(store.tasks)} kept, {evicted} evicted)")
+        del store
+
+
+async def run(opts) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.db")
+        sqlite = SqliteTaskStore(path)
+        await store_bench("memory", InMemoryTaskStore(), opts.tasks, opts.concurrency, opts.updates)
+        await store_bench("sqlite", sqlite, opts.tasks, opts.concurrency, opts.updates)
+        await sqlite.close()
+        total = opts.tasks + opts.concurrency
+        size = sum(os.path.getsize(p) for p in Path(tmp).glob("tasks.db*"))
+        print(f"sqlite: {size / total:.0f} bytes per task on disk, {len(encode_task(_task(0)))} bytes of JSON")
+
+        reopened = SqliteTaskStore(path)
+        found = sum([await reopened.get(f"task-{i}") is not None for i in range(total)])
+        print(f"sqlite: {found}/{total} tasks found after reopening")
+        await reopened.close()
+
+        e2e = SqliteTaskStore(os.path.join(tmp, "e2e.db"))
+        await end_to_end({"memory": InMemoryTaskStore(), "sqlite": e2e}, opts.requests)
+        await e2e.close()
+    await soak(opts.soak)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=2000, help="tasks saved sequentially")
+    parser.add_argument("--concurrency", type=int, default=100, help="tasks updated concurrently")
+    parser.add_argument("--updates", type=int, default=10, help="saves per concurrent task")
+    parser.add_argument("--requests", type=int, default=1000, help="message/send requests per store")
+    parser.add_argument("--soak", type=int, default=50_000, help="tasks for the memory soak run")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
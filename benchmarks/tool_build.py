@@ -0,0 +1,97 @@
+"""
+Benchmark: building LangChain tools for the MCP agent, cold vs. cached by manifest hash.
+
+For manifests of 5, 100 and 1000 synthetic tools, times a cold build (create_model +
+StructuredTool.from_function per tool) against the per-request path with the cache warm:
+"cached" reuses the pooled session's manifest object, "rehash" gets an equal manifest
+after a TTL refresh and pays for hashing it.
+
+    python -m benchmarks.tool_build [--sizes 5,100,1000] [--repeat 20]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_agent import mcp_langgraph_agent as agent_mod  # noqa: E402
+
+
+def synthetic_manifest(n: int) -> list[dict]:
+    return [
+        {
+            "name": f"tool_{i}",
+            "description": f"Synthetic tool number {i} that combines a count, a label and a flag.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "count": {"type": "integer", "description": "How many"},
+                    "label": {"type": "string", "description": "Label to apply"},
+                    "ratio": {"type": "number", "description": "Scaling ratio"},
+                    "flag": {"type": "boolean", "description": "Optional flag"},
+                },
+                "required": ["count", "label"],
+            },
+            "annotations": {},
+        }
+        for i in range(n)
+    ]
+
+
+def _clear_caches() -> None:
+    agent_mod._args_models.clear()
+    agent_mod._tool_cache.clear()
+
+
+def _time_ms(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    session = object()  # stands in for the pooled MCP session the tools are bound to
+    rows = []
+    for n in sizes:
+        manifest = synthetic_manifest(n)
+
+        def cold():
+            _clear_caches()
+            agent_mod.get_langchain_tools(session, manifest)
+
+        cold_ms = _time_ms(cold, max(1, repeat // 4) if n >= 1000 else repeat)
+        agent_mod.get_langchain_tools(session, manifest)
+        warm_ms = _time_ms(lambda: agent_mod.get_langchain_tools(session, manifest), repeat)
+        rehash_ms = _time_ms(lambda: agent_mod.get_langchain_tools(session, list(manifest)), repeat)
+        cold_p50, rehash_p50 = statistics.median(cold_ms), statistics.median(rehash_ms)
+        rows.append({
+            "tools": n,
+            "cold_p50_ms": round(cold_p50, 3),
+            "cached_p50_ms": round(statistics.median(warm_ms), 4),
+            "rehash_p50_ms": round(rehash_p50, 3),
+            "rehash_speedup": round(cold_p50 / rehash_p50, 1) if rehash_p50 else float("inf"),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="5,100,1000")
+    parser.add_argument("--repeat", type=int, default=20)
+    opts = parser.parse_args()
+    rows = run([int(s) for s in opts.sizes.split(",")], opts.repeat)
+    print(f"{'tools':>6} {'cold p50 ms':>14} {'cached p50 ms':>14} {'rehash p50 ms':>14} {'speedup':>9}")
+    for r in rows:
+        print(
+            f"{r['tools']:>6} {r['cold_p50_ms']:>14} {r['cached_p50_ms']:>14} "
+            f"{r['rehash_p50_ms']:>14} {r['rehash_speedup']:>8}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
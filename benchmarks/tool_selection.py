@@ -0,0 +1,160 @@
+"""
+Evaluation: relevance-filtered tool binding (mcp_agent.tool_index) on a large synthetic catalog.
+
+Builds a catalog of domain x action tools (plus the stand-in's add/greet/echo/just_fun_random),
+runs labelled paraphrased queries through ToolIndex.select, and reports tool-selection recall@k
+(the expected tool is among the bound ones) and the prompt tokens of the bound tool schemas
+against binding the whole catalog, then checks that follow-ups sharing no word with any tool
+(NO_MATCH_QUERIES) still get k tools bound. Tokens are counted with tiktoken when its encoding is
+available offline, else estimated as characters / 4.
+
+    python -m benchmarks.tool_selection [--k 4,8,16] [--show-misses]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.utils.function_calling import convert_to_openai_tool  # noqa: E402
+
+from mcp_agent import mcp_langgraph_agent as agent_mod  # noqa: E402
+from mcp_agent.tool_index import ToolIndex  # noqa: E402
+
+DOMAINS = {
+    "calendar_event": ("calendar event", "meeting on my calendar", {"title": "string", "start": "string"}),
+    "email": ("email message", "email", {"to": "string", "subject": "string"}),
+    "contact": ("address book contact", "contact", {"name": "string", "phone": "string"}),
+    "invoice": ("customer invoice", "invoice", {"customer_id": "string", "amount": "number"}),
+    "github_issue": ("GitHub issue in a repository", "GitHub issue", {"repo": "string", "title": "string"}),
+    "file": ("file in cloud storage", "file in my drive", {"path": "string"}),
+    "database_row": ("row in a database table", "database row", {"table": "string", "id": "string"}),
+    "support_ticket": ("customer support ticket", "support ticket", {"ticket_id": "string"}),
+    "playlist": ("music playlist", "playlist", {"playlist_id": "string"}),
+    "reminder": ("reminder notification", "reminder", {"text": "string", "at": "string"}),
+    "user_account": ("user account", "user account", {"username": "string"}),
+    "order": ("e-commerce order", "shop order", {"order_id": "string"}),
+    "shipment": ("parcel shipment with a carrier", "parcel shipment", {"tracking_number": "string"}),
+    "expense": ("expense report entry", "expense", {"amount": "number", "category": "string"}),
+    "vm_instance": ("cloud virtual machine instance", "cloud VM instance", {"instance_id": "string"}),
+    "dns_record": ("DNS record for a domain", "DNS record", {"domain": "string", "record_type": "string"}),
+    "wiki_page": ("wiki documentation page", "wiki page", {"page_title": "string"}),
+    "slack_channel": ("Slack channel", "Slack channel", {"channel": "string"}),
+    "task": ("to-do list task", "to-do task", {"task_id": "string"}),
+    "note": ("personal note", "note", {"note_id": "string"}),
+    "customer": ("CRM customer record", "customer in the CRM", {"customer_id": "string"}),
+    "product": ("catalog product listing", "product listing", {"sku": "string"}),
+    "coupon": ("discount coupon code", "discount coupon", {"code": "string"}),
+    "webhook": ("webhook subscription", "webhook", {"url": "string"}),
+    "api_key": ("API access key", "API key", {"key_id": "string"}),
+}
+
+ACTIONS = {
+    "create": ("Create a new {d}.", ["make a new {q}", "set up a new {q}", "create a {q} for tomorrow"]),
+    "get": ("Get the details of a {d} by id.", ["fetch the {q} details", "look up that {q}", "retrieve the {q}"]),
+    "list": ("List all {d}s.", ["show me every {q}", "list my {q}s", "enumerate each {q}"]),
+    "update": ("Update fields of an existing {d}.", ["change the {q}", "modify my {q}", "edit the {q} fields"]),
+    "delete": ("Delete a {d} permanently.", ["remove the {q}", "cancel that {q}", "delete this {q}"]),
+    "search": ("Search {d}s matching a text query.", ["find a {q} matching acme", "search for a {q} about billing"]),
+}
+
+STANDIN_TOOLS = [
+    ("add", "Add two integers.", {"a": "integer", "b": "integer"}, ["add 3 and 5 then explain", "what do 40 and 2 add up to"]),
+    ("greet", "Greeting with optional title.", {"name": "string"}, ["greet my colleague Alice warmly"]),
+    ("echo", "Echo a message (optional repeat).", {"message": "string"}, ["echo back what I typed"]),
+    ("just_fun_random", "Generate a random number between a and b (inclusive).", {"a": "integer", "b": "integer"},
+     ["give me a random number from 1 to 6"]),
+]
+
+# Follow-ups that score zero against every tool; select() must still fill the k slots
+NO_MATCH_QUERIES = ["now do it for 7", "and again", "same as before but twice"]
+
+
+def build_catalog() -> tuple[list[dict], list[tuple[str, str]]]:
+    """Synthetic manifest and (query, expected tool) pairs."""
+    tools, queries = [], []
+
+    def add_tool(name: str, description: str, params: dict[str, str]) -> None:
+        tools.append({
+            "name": name,
+            "description": description,
+            "input_schema": {
+                "type": "object",
+                "properties": {p: {"type": t, "description": p.replace("_", " ")} for p, t in params.items()},
+                "required": list(params),
+            },
+        })
+
+    for domain, (desc, phrase, params) in DOMAINS.items():
+        for action, (tmpl, paraphrases) in ACTIONS.items():
+            name = f"{action}_{domain}"
+            add_tool(name, tmpl.format(d=desc), params)
+            queries += [(p.format(q=phrase), name) for p in paraphrases]
+    for name, desc, params, examples in STANDIN_TOOLS:
+        add_tool(name, desc, params)
+        queries += [(q, name) for q in examples]
+    return tools, queries
+
+
+def _token_counter():
+    try:
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        return (lambda s: len(enc.encode(s))), "tiktoken cl100k_base"
+    except Exception:
+        return (lambda s: max(1, len(s) // 4)), "chars/4 estimate"
+
+
+def run(ks: list[int], show_misses: bool) -> None:
+    tools, queries = build_catalog()
+    count_tokens, counter_name = _token_counter()
+    lc_tools = agent_mod._build_langchain_tools(object(), tools)
+    schema_tokens = {t.name: count_tokens(json.dumps(convert_to_openai_tool(t))) for t in lc_tools}
+    all_tokens = sum(schema_tokens.values())
+
+    start = time.perf_counter()
+    index = ToolIndex(tools)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"catalog: {len(tools)} tools, {len(queries)} queries, all-tools schema tokens {all_tokens} ({counter_name})")
+    print(f"index build: {build_ms:.2f} ms")
+    print(f"{'k':>4} {'recall':>8} {'bound':>7} {'tokens':>8} {'saved':>7} {'select p50 ms':>14}")
+    for k in ks:
+        hits, bound_tokens, bound_counts, lat, misses = 0, [], [], [], []
+        for query, expected in queries:
+            t0 = time.perf_counter()
+            names = index.select(query, k=k, always=[])
+            lat.append((time.perf_counter() - t0) * 1000)
+            if expected in names:
+                hits += 1
+            else:
+                misses.append((query, expected, names[:3]))
+            bound_counts.append(len(names))
+            bound_tokens.append(sum(schema_tokens[n] for n in names))
+        mean_tokens = statistics.mean(bound_tokens)
+        print(
+            f"{k:>4} {hits / len(queries):>8.3f} {statistics.mean(bound_counts):>7.1f} {mean_tokens:>8.0f} "
+            f"{1 - mean_tokens / all_tokens:>7.1%} {statistics.median(lat):>14.3f}"
+        )
+        if show_misses:
+            for query, expected, top in misses:
+                print(f"     miss: {query!r} expected {expected}, got {top}")
+    for query in NO_MATCH_QUERIES:
+        bound = [len(index.select(query, k=k, always=[])) for k in ks]
+        status = "ok" if bound == ks else "UNDERFILLED"
+        print(f"no-match {query!r}: bound {', '.join(map(str, bound))} tools for k={','.join(map(str, ks))}  {status}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--k", default="4,8,16", help="Comma-separated top-k values (default 4,8,16)")
+    parser.add_argument("--show-misses", action="store_true", help="Print queries whose tool was not selected")
+    opts = parser.parse_args()
+    run([int(k) for k in opts.k.split(",")], opts.show_misses)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,9 @@ from models.json_rpc import JSONRPCRequest
 from models.task import Task, TaskSendParams
 from models.agent import AgentCard
 
+# Trace context: the current span's traceparent is sent as an HTTP header
+from utilities.tracing import inject
+
 
 # -----------------------------------------------------------------------------
 # Custom Error Classes
@@ -100,6 +103,7 @@ class A2AClient:
                 response = await client.post(
                     self.url,
                     json=request.model_dump(),  # Convert Pydantic model to JSON
+                    headers=inject(),           # traceparent of the current span, if tracing
                     timeout=30
                 )
                 response.raise_for_status()     # Raise error if status code is 4xx/5xx
@@ -2,7 +2,9 @@
 Run the host A2A server: reads agent_registry.json and agent_discovery, routes requests to registered agents.
 Reads mcp_registry and uses mcp_connector to list MCP tools for discovery. Default port 8080.
 """
+import argparse
 import asyncio
+import logging
 import os
 import sys
 from pathlib import Path
@@ -11,33 +13,32 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-import uvicorn
-from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
 import agent_discovery
 from host.host_executor import HostAgentExecutor
+from utilities.a2a_app import A2AApplication
+from utilities.shutdown import serve
+from utilities.task_store import add_task_store_argument, create_task_store
+
+logger = logging.getLogger(__name__)
 
 MCP_REGISTRY_DIR = ROOT / "mcp_registry"
 
+DEFAULT_SKILL = AgentSkill(id="default", name="Default", description="Route to registered agents", tags=[], examples=[])
 
-def main(host: str = "0.0.0.0", port: int = 8080, registry_path: str | Path | None = None):
-    path = registry_path or ROOT / "agent_registry.json"
-    agents = agent_discovery.get_agents(path)
-    if not agents:
-        raise ValueError("No agents in registry; ensure agent_registry.json has at least one enabled agent.")
 
-    # Aggregate skills from all agents for the host card
-    all_skills = []
+def _agent_skills(agents: list[dict]) -> list[AgentSkill]:
+    """Skills of all agents, first occurrence of each skill id."""
+    skills = []
     seen = set()
     for a in agents:
         for s in a.get("skills", []):
             sid = s.get("id", "")
             if sid and sid not in seen:
                 seen.add(sid)
-                all_skills.append(
+                skills.append(
                     AgentSkill(
                         id=sid,
                         name=s.get("name", ""),
@@ -46,15 +47,69 @@ def main(host: str = "0.0.0.0", port: int = 8080, registry_path: str | Path | No
                         examples=s.get("examples", []),
                     )
                 )
+    return skills
+
+
+class _RegistryCard:
+    """
+    card_modifier for the host card: when agent_registry.json changes, a copy with the agents'
+    current skills; otherwise the same card object, so its cached JSON and ETag are reused.
+    A registry that cannot be read (e.g. half-written) keeps the previous card until the next change.
+    """
+
+    def __init__(self, registry_path: Path, extra_skills: list[AgentSkill]):
+        self.registry_path = Path(registry_path)
+        self.extra_skills = extra_skills
+        self._mtime = self._stat()
+        self._bad_mtime: int | None = None
+        self._card: AgentCard | None = None
+
+    def _stat(self) -> int | None:
+        try:
+            return self.registry_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def __call__(self, card: AgentCard) -> AgentCard:
+        mtime = self._stat()
+        if mtime != self._mtime and mtime != self._bad_mtime:
+            try:
+                skills = _agent_skills(agent_discovery.get_agents(self.registry_path)) + self.extra_skills
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                # Retried once the file changes again (the write completes)
+                self._bad_mtime = mtime
+                logger.warning("Could not reload %s, serving the previous card: %s", self.registry_path, e)
+                return self._card or card
+            self._card = card.model_copy(update={"skills": skills or [DEFAULT_SKILL]})
+            self._mtime = mtime
+        return self._card or card
+
+
+def build_app(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    registry_path: str | Path | None = None,
+    task_store: str | None = None,
+    local_clients: dict | None = None,
+) -> A2AApplication:
+    """The host's A2A application; local_clients as in HostAgentExecutor."""
+    path = registry_path or ROOT / "agent_registry.json"
+    agents = agent_discovery.get_agents(path)
+    if not agents:
+        raise ValueError("No agents in registry; ensure agent_registry.json has at least one enabled agent.")
+
+    # Aggregate skills from all agents for the host card
+    all_skills = _agent_skills(agents)
 
     # Read mcp_registry and use mcp_connector to list tools (for host card discovery)
+    mcp_skills = []
     try:
         from mcp_connector import list_tools_from_registry
         mcp_tools = asyncio.run(list_tools_from_registry(MCP_REGISTRY_DIR))
         if mcp_tools:
             tool_names = [t.get("name", "") for t in mcp_tools if t.get("name")]
             if tool_names:
-                all_skills.append(
+                mcp_skills.append(
                     AgentSkill(
                         id="mcp_registry_tools",
                         name="MCP registry tools",
@@ -65,11 +120,10 @@ def main(host: str = "0.0.0.0", port: int = 8080, registry_path: str | Path | No
                 )
     except Exception:
         pass  # MCP server may be down; host still works
+    all_skills += mcp_skills
 
     if not all_skills:
-        all_skills = [
-            AgentSkill(id="default", name="Default", description="Route to registered agents", tags=[], examples=[])
-        ]
+        all_skills = [DEFAULT_SKILL]
 
     app_url = os.environ.get("HOST_URL", f"http://{host}:{port}")
     agent_card = AgentCard(
@@ -83,18 +137,31 @@ def main(host: str = "0.0.0.0", port: int = 8080, registry_path: str | Path | No
         skills=all_skills,
     )
 
+    executor = HostAgentExecutor(registry_path=path, local_clients=local_clients)
     request_handler = DefaultRequestHandler(
-        agent_executor=HostAgentExecutor(registry_path=path),
-        task_store=InMemoryTaskStore(),
+        agent_executor=executor,
+        task_store=create_task_store(task_store, name="host"),
     )
 
-    app = A2AStarletteApplication(
+    return A2AApplication(
         agent_card=agent_card,
         http_handler=request_handler,
+        card_modifier=_RegistryCard(path, mcp_skills),
+        warmup=[("agents", executor.warm_up)],
     )
 
-    uvicorn.run(app.build(), host=host, port=port)
+
+def main(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    registry_path: str | Path | None = None,
+    task_store: str | None = None,
+):
+    app = build_app(host, port, registry_path, task_store)
+    serve(app.build(), host, port, [app])
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(prog="host", description=__doc__.strip().splitlines()[0])
+    add_task_store_argument(parser)
+    main(task_store=parser.parse_args().task_store)
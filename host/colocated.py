@@ -0,0 +1,110 @@
+"""
+Co-located deployment: the host, the LangGraph agent and the MCP agent in one process and event loop.
+
+The host calls co-located agents through InProcessClient, which hands the SendMessageRequest object
+straight to the agent's JSON-RPC handler (no HTTP, no JSON encoding); other agents in the registry
+are still called over HTTP. The agents stay reachable from outside too, mounted at /agents/agent/
+and /agents/mcp_agent/ (JSON-RPC and agent card) next to the host at /.
+
+    python -m host.colocated [--port 8080] [--registry agent_registry.json] [--task-store sqlite]
+        [--agent langgraph-assistant=agent] [--agent mcp-tool-agent=mcp_agent]
+
+--agent maps a registry agent id to a co-located component (agent or mcp_agent); the default maps
+the two registry entries shipped with the repo. See benchmarks/colocated.py for the latency
+against the three-process topology.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from a2a.server.context import ServerCallContext
+from a2a.types import SendMessageRequest, SendMessageResponse
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+load_dotenv()
+
+from agent.__main__ import build_app as build_agent_app
+from host.__main__ import build_app as build_host_app
+from mcp_agent.__main__ import build_app as build_mcp_agent_app
+from utilities.a2a_app import A2AApplication
+from utilities.shutdown import serve
+from utilities.task_store import add_task_store_argument
+
+COMPONENTS = {"agent": build_agent_app, "mcp_agent": build_mcp_agent_app}
+DEFAULT_AGENTS = {"langgraph-assistant": "agent", "mcp-tool-agent": "mcp_agent"}
+
+
+class InProcessClient:
+    """Stands in for a2a.client.A2AClient: send_message() calls the agent's JSON-RPC handler directly."""
+
+    def __init__(self, app: A2AApplication):
+        self._handler = app.handler
+
+    async def send_message(
+        self, request: SendMessageRequest, *, http_kwargs: dict | None = None, context=None
+    ) -> SendMessageResponse:
+        # http_kwargs (trace headers) have no use here: the trace context is in the message metadata
+        return await self._handler.on_message_send(request, ServerCallContext())
+
+
+def build_colocated_app(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    registry_path: str | Path | None = None,
+    task_store: str | None = None,
+    agents: dict[str, str] | None = None,
+) -> Starlette:
+    """Host app at / with the mapped agents in process (agent id -> component name)."""
+    agents = DEFAULT_AGENTS if agents is None else agents
+    base_url = os.environ.get("HOST_URL", f"http://{host}:{port}")
+    apps: dict[str, A2AApplication] = {}
+    for component in sorted(set(agents.values())):
+        apps[component] = COMPONENTS[component](
+            host, port, task_store=task_store, url=f"{base_url}/agents/{component}/"
+        )
+    local_clients = {agent_id: InProcessClient(apps[component]) for agent_id, component in agents.items()}
+    host_app = build_host_app(host, port, registry_path, task_store, local_clients=local_clients)
+    # Mounted apps get no lifespan of their own: the host's warm-up runs theirs first, and /ready
+    # (the host's) turns healthy once all are warm; on shutdown the host drains first, then them
+    host_app.warmup.steps[:0] = [(component, app.warmup.run) for component, app in apps.items()]
+    host_app.drain.resources[:0] = [app.drain for app in apps.values()]
+    routes = [Mount(f"/agents/{component}", app=app.build()) for component, app in apps.items()]
+    colocated = Starlette(routes=[*routes, Mount("/", app=host_app.build())], lifespan=host_app.lifespan)
+    colocated.state.a2a_apps = [host_app, *apps.values()]
+    return colocated
+
+
+def _agent_mapping(values: list[str] | None) -> dict[str, str] | None:
+    if not values:
+        return None
+    mapping = {}
+    for value in values:
+        agent_id, _, component = value.partition("=")
+        if component not in COMPONENTS:
+            raise SystemExit(f"--agent {value}: component must be one of {', '.join(COMPONENTS)}")
+        mapping[agent_id] = component
+    return mapping
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="host.colocated", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--registry", default=None, help="Agent registry (default: agent_registry.json)")
+    parser.add_argument(
+        "--agent", action="append", metavar="ID=COMPONENT", help="Co-locate a registry agent (repeatable)"
+    )
+    add_task_store_argument(parser)
+    opts = parser.parse_args()
+    app = build_colocated_app(opts.host, opts.port, opts.registry, opts.task_store, _agent_mapping(opts.agent))
+    serve(app, opts.host, opts.port, app.state.a2a_apps)
+
+
+if __name__ == "__main__":
+    main()
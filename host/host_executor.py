@@ -1,6 +1,7 @@
 """
 Host agent executor: reads agent_registry + agent_discovery and routes requests to registered agents.
 """
+import asyncio
 import sys
 import uuid
 from pathlib import Path
@@ -20,10 +21,15 @@ from a2a.types import (
     Message,
     MessageSendParams,
     SendMessageRequest,
+    Task,
+    TaskState,
 )
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
 import agent_discovery
 from agent_discovery import resolve_agent_for_request
+from utilities.metrics import phase
+from utilities.tracing import extract, inject, span
 
 
 def _registry_to_agent_card(agent_config: dict) -> AgentCard:
@@ -51,37 +57,97 @@ def _registry_to_agent_card(agent_config: dict) -> AgentCard:
     )
 
 
+def _task_to_text(task: Task) -> str:
+    """Text of a downstream agent's Task: its artifacts' text parts, else its status message."""
+    texts = [
+        part.root.text
+        for artifact in task.artifacts or []
+        for part in artifact.parts
+        if getattr(part.root, "text", None)
+    ]
+    if not texts and task.status.message:
+        texts = [p.root.text for p in task.status.message.parts if getattr(p.root, "text", None)]
+    text = "".join(texts) or "No response generated."
+    if task.status.state == TaskState.failed:
+        return f"Agent error: {text}"
+    return text
+
+
+def _downstream_context_id(context_id: str | None, agent_config: dict) -> str | None:
+    """The agent's context id for a host context: the same for every turn, distinct per agent."""
+    if not context_id:
+        return None
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"a2a-host:{agent_config.get('id', '')}:{context_id}"))
+
+
 class HostAgentExecutor(AgentExecutor):
-    """Routes A2A requests to agents discovered from agent_registry.json."""
+    """
+    Routes A2A requests to agents discovered from agent_registry.json. local_clients maps agent ids
+    to in-process clients (see host.colocated) used instead of HTTP for those agents.
+    """
 
-    def __init__(self, registry_path: str | Path | None = None):
+    def __init__(self, registry_path: str | Path | None = None, local_clients: dict | None = None):
         self._registry_path = registry_path
-        self._clients: dict[str, A2AClient] = {}
+        self._clients: dict[str, A2AClient] = dict(local_clients or {})
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
 
     def _get_client(self, agent_config: dict) -> A2AClient:
         agent_id = agent_config.get("id", "")
         if agent_id not in self._clients:
             card = _registry_to_agent_card(agent_config)
             url = agent_config.get("url", "")
-            httpx_client = httpx.AsyncClient(timeout=60.0)
+            httpx_client = self._http_clients[agent_id] = httpx.AsyncClient(timeout=60.0)
             self._clients[agent_id] = A2AClient(httpx_client, card, url=url)
         return self._clients[agent_id]
 
+    async def warm_up(self) -> None:
+        """
+        Startup warm-up step: create the clients of the registry's agents and open a pooled
+        connection to each remote one (GET of its agent card). Raises if any of them is unreachable.
+        """
+        agents = agent_discovery.get_agents(self._registry_path)
+        for agent_config in agents:
+            self._get_client(agent_config)
+        remote = [a for a in agents if a.get("id") in self._http_clients]
+
+        async def fetch_card(agent_config: dict) -> None:
+            url = agent_config.get("url", "").rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH
+            response = await self._http_clients[agent_config["id"]].get(url, timeout=10.0)
+            response.raise_for_status()
+
+        results = await asyncio.gather(*(fetch_card(a) for a in remote), return_exceptions=True)
+        failed = [f"{a.get('id')} ({r!r})" for a, r in zip(remote, results) if isinstance(r, Exception)]
+        if failed:
+            raise RuntimeError("unreachable agents: " + ", ".join(failed))
+
+    async def aclose(self) -> None:
+        """Close the HTTP clients to the agents (on shutdown; see utilities.shutdown)."""
+        clients, self._http_clients = self._http_clients, {}
+        for agent_id in clients:
+            self._clients.pop(agent_id, None)
+        await asyncio.gather(*(c.aclose() for c in clients.values()), return_exceptions=True)
+
     async def execute(
         self,
         context: RequestContext,
         event_queue: EventQueue,
     ) -> None:
+        remote = extract(context.metadata, context.message.metadata if context.message else None)
+        with span("host.execute", remote_parent=remote, context_id=context.context_id):
+            await self._route(context, event_queue)
+
+    async def _route(self, context: RequestContext, event_queue: EventQueue) -> None:
         agent_id = context.metadata.get("agent_id") if context.metadata else None
         skill_tag = context.metadata.get("skill_tag") if context.metadata else None
         user_message = context.get_user_input() if hasattr(context, "get_user_input") else None
 
-        agent_config = resolve_agent_for_request(
-            agent_id=agent_id,
-            skill_tag=skill_tag,
-            user_message=user_message,
-            registry_path=self._registry_path,
-        )
+        with phase("routing"):
+            agent_config = resolve_agent_for_request(
+                agent_id=agent_id,
+                skill_tag=skill_tag,
+                user_message=user_message,
+                registry_path=self._registry_path,
+            )
         if not agent_config:
             from a2a.utils.message import new_agent_text_message
             await event_queue.enqueue_event(
@@ -90,7 +156,9 @@ class HostAgentExecutor(AgentExecutor):
             return
 
         client = self._get_client(agent_config)
-        # Forward a new user message without host task/context ids so the backend creates a new task
+        # Forward a new user message without the host task id so the backend creates a new task, but
+        # with a context id that is stable per host context and agent, so the backend's conversation
+        # memory (keyed by context id) follows the conversation
         inbound = context.message
         forward_message = Message(
             kind="message",
@@ -98,7 +166,7 @@ class HostAgentExecutor(AgentExecutor):
             role=inbound.role,
             parts=inbound.parts,
             taskId=None,
-            contextId=None,
+            contextId=_downstream_context_id(context.context_id, agent_config),
             referenceTaskIds=None,
             extensions=inbound.extensions,
             metadata=inbound.metadata,
@@ -111,9 +179,19 @@ class HostAgentExecutor(AgentExecutor):
         request = SendMessageRequest(id="host-1", method="message/send", params=params)
 
         try:
-            response = await client.send_message(request)
+            with phase("downstream_call"):
+                # Trace context of this call for the agent: in the metadata and as an HTTP header
+                forward_message.metadata = inject(inbound.metadata)
+                params.metadata = inject(context.metadata)
+                response = await client.send_message(request, http_kwargs={"headers": inject()})
             root = response.root
-            if hasattr(root, "result"):
+            if isinstance(getattr(root, "result", None), Task):
+                # Streaming agents answer with a Task; relay its (chunked) artifact as one message
+                from a2a.utils.message import new_agent_text_message
+                await event_queue.enqueue_event(
+                    new_agent_text_message(_task_to_text(root.result), context.context_id, context.task_id)
+                )
+            elif hasattr(root, "result"):
                 await event_queue.enqueue_event(root.result)
             else:
                 from a2a.utils.message import new_agent_text_message
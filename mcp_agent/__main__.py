@@ -2,6 +2,7 @@
 Run the MCP-backed A2A agent (reads mcp_registry, uses mcp_connector for tools).
 Default port 8002. Set OPENAI_API_KEY. MCP server URL from mcp_registry/server.json or MCP_SERVER_URL.
 """
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -9,21 +10,30 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-import uvicorn
-from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from dotenv import load_dotenv
 load_dotenv()
 
 from mcp_agent.mcp_agent_executor import MCPAgentExecutor
+from utilities.a2a_app import A2AApplication
+from utilities.llm_simulator import is_simulated
+from utilities.push_notifications import PUSH_ENABLED, push_handler_kwargs
+from utilities.shutdown import serve
+from utilities.task_store import add_task_store_argument, create_task_store
 
 MCP_REGISTRY = ROOT / "mcp_registry"
 
 
-def main(host: str = "0.0.0.0", port: int = 8002, registry_path: str | Path | None = None):
-    if not os.getenv("OPENAI_API_KEY"):
+def build_app(
+    host: str = "0.0.0.0",
+    port: int = 8002,
+    registry_path: str | Path | None = None,
+    task_store: str | None = None,
+    url: str | None = None,
+) -> A2AApplication:
+    """The MCP agent's A2A application (card URL: url, else MCP_AGENT_URL, else http://host:port)."""
+    if not os.getenv("OPENAI_API_KEY") and not is_simulated():
         raise ValueError("OPENAI_API_KEY environment variable is required")
 
     path = registry_path or MCP_REGISTRY
@@ -35,7 +45,7 @@ def main(host: str = "0.0.0.0", port: int = 8002, registry_path: str | Path | No
         examples=["Add 3 and 5", "Greet Alice", "Echo hello world" , "generate random number"],
     )
 
-    app_url = os.environ.get("MCP_AGENT_URL", f"http://{host}:{port}")
+    app_url = url or os.environ.get("MCP_AGENT_URL", f"http://{host}:{port}")
     agent_card = AgentCard(
         name="MCP Tool Agent",
         description="LangGraph agent that uses tools from the MCP server (mcp_registry).",
@@ -43,22 +53,30 @@ def main(host: str = "0.0.0.0", port: int = 8002, registry_path: str | Path | No
         version="1.0.0",
         default_input_modes=["text"],
         default_output_modes=["text"],
-        capabilities=AgentCapabilities(streaming=True),
+        capabilities=AgentCapabilities(streaming=True, push_notifications=PUSH_ENABLED),
         skills=[skill],
     )
 
+    executor = MCPAgentExecutor(registry_path=path)
     request_handler = DefaultRequestHandler(
-        agent_executor=MCPAgentExecutor(registry_path=path),
-        task_store=InMemoryTaskStore(),
+        agent_executor=executor,
+        task_store=create_task_store(task_store, name="mcp_agent"),
+        **push_handler_kwargs(),
     )
 
-    app = A2AStarletteApplication(
+    return A2AApplication(
         agent_card=agent_card,
         http_handler=request_handler,
+        warmup=[("mcp_agent", executor.warm_up)],
     )
 
-    uvicorn.run(app.build(), host=host, port=port)
+
+def main(host: str = "0.0.0.0", port: int = 8002, registry_path: str | Path | None = None, task_store: str | None = None):
+    app = build_app(host, port, registry_path, task_store)
+    serve(app.build(), host, port, [app])
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(prog="mcp_agent", description=__doc__.strip().splitlines()[0])
+    add_task_store_argument(parser)
+    main(task_store=parser.parse_args().task_store)
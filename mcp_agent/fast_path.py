@@ -0,0 +1,258 @@
+"""
+Deterministic fast path for simple MCP tool intents.
+
+Messages like "Add 3 and 5", "Greet Alice" or "Echo hello world" name one tool and spell out
+its arguments, so the ReAct loop's two LLM round trips add latency without adding anything.
+parse_intent() matches a message against anchored templates (hand-written ones for the known
+tools, plus "<tool name> 1 and 2" for other tools whose parameters are all numbers) and returns
+the tool call only when exactly one template matches the whole message and the arguments pass
+the tool's schema. Free text (echo's message) must look like the registry examples: a short
+phrase with no question mark and no second clause or sentence, or a "double-quoted" string; a
+name to greet must be capitalised words ("Greet Alice", not "Greet my boss"). Anything else goes
+to the LLM, as does a failure to connect to the MCP server. Once the call is sent, its outcome
+(an error included) is the answer: the LLM would only call a possibly non-idempotent tool again.
+"""
+import os
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from mcp_connector import call_tool, manifest_hash
+from mcp_connector.validation import ArgumentValidationError, get_validator
+
+# Set MCP_FAST_PATH=0 to always go through the LLM.
+FAST_PATH_ENABLED = os.getenv("MCP_FAST_PATH", "1").lower() not in ("0", "false", "no")
+
+_NUM = r"(-?\d+(?:\.\d+)?)"
+_POLITE = r"(?:(?:please|can you|could you|kindly)\s+)?"
+_NUMERIC_TYPES = ("number", "integer")
+
+
+@dataclass
+class IntentMatch:
+    """One tool call parsed from a message, and how to phrase its result."""
+
+    tool: str
+    arguments: dict
+    template: str
+    format_result: Callable[[dict, str], str] | None = field(default=None, compare=False)
+
+    def answer(self, result_text: str) -> str:
+        return self.format_result(self.arguments, result_text) if self.format_result else result_text
+
+
+@dataclass
+class _Template:
+    tool: str
+    name: str
+    pattern: re.Pattern
+    build_args: Callable[[re.Match], dict]
+    format_result: Callable[[dict, str], str] | None = None
+
+
+def _num(s: str) -> int | float:
+    return float(s) if "." in s else int(s)
+
+
+def _fmt_num(v) -> str:
+    return str(int(v)) if isinstance(v, float) and v.is_integer() else str(v)
+
+
+# Words that mean a "name" is really a longer request ("Greet Alice and then add 3") or not a
+# person's name ("Greet the team", "Greet my boss").
+_NOT_NAME_WORDS = {
+    "and", "then", "also", "tell", "me", "what", "how", "please", "with", "in",
+    "the", "a", "an", "this", "that", "these", "those", "every", "everyone", "everybody", "all",
+    "my", "your", "our", "his", "her", "their", "its",
+}
+
+
+# Words that make free text a question or a second clause ("Echo is a nymph ..., tell me more").
+_CLAUSE_WORDS = {
+    "is", "are", "was", "were", "am", "do", "does", "did", "can", "could", "would", "should", "will",
+    "what", "why", "how", "who", "whom", "when", "where", "which", "tell", "explain", "then", "also",
+    "now", "next", "after", "before", "once", "twice", "thrice", "times", "again",
+}
+_FREE_TEXT_MAX_WORDS = 8
+
+
+def _free_text(value: str) -> str:
+    """The text argument of an imperative like "Echo hello world"; ValueError if it reads like a request."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    words = value.lower().split()
+    if (
+        re.search(r"[,;:?]", value)
+        or re.search(r"[.!]\s+\S", value)  # a second sentence ("Echo hello. Now add 3 and 5")
+        or len(words) > _FREE_TEXT_MAX_WORDS
+        or _CLAUSE_WORDS & {w.strip("'\".!") for w in words}
+    ):
+        raise ValueError(f"not a plain phrase: {value!r}")
+    return value.strip("'")
+
+
+def _greet_args(m: re.Match) -> dict:
+    name = m[1].strip()
+    words = name.split()
+    if (
+        _NOT_NAME_WORDS & {w.lower() for w in words}
+        or not all(w[0].isupper() for w in words)
+        or any(w.lower().endswith(("'s", "s'")) for w in words)
+    ):
+        raise ValueError(f"not a name: {name!r}")
+    return {"name": name}
+
+
+def _known_templates() -> list[_Template]:
+    """Templates for the tools the agent registry advertises (add, greet, echo, just_fun_random)."""
+    def compile_(p: str) -> re.Pattern:
+        return re.compile(rf"^{_POLITE}{p}$", re.IGNORECASE)
+
+    return [
+        _Template(
+            "add", "add",
+            compile_(rf"(?:add|sum)\s+{_NUM}\s*(?:and|\+|,|to|with)\s*{_NUM}"),
+            lambda m: {"a": _num(m[1]), "b": _num(m[2])},
+            lambda a, r: f"{_fmt_num(a['a'])} + {_fmt_num(a['b'])} = {r}",
+        ),
+        _Template(
+            "add", "plus",
+            compile_(rf"(?:what\s+is\s+|what's\s+)?{_NUM}\s*(?:\+|plus)\s*{_NUM}"),
+            lambda m: {"a": _num(m[1]), "b": _num(m[2])},
+            lambda a, r: f"{_fmt_num(a['a'])} + {_fmt_num(a['b'])} = {r}",
+        ),
+        _Template(
+            "greet", "greet",
+            compile_(r"(?:greet|say\s+(?:hello|hi)\s+to)\s+([A-Za-z][A-Za-z.'-]*(?:\s+[A-Za-z][A-Za-z.'-]*){0,2})"),
+            _greet_args,
+        ),
+        _Template(
+            "echo", "echo",
+            compile_(r"(?:echo|repeat)\s+(.+?)\s+(\d+)\s+times"),
+            lambda m: {"message": _free_text(m[1]), "repeat": int(m[2])},
+        ),
+        _Template(
+            "echo", "echo",
+            compile_(r"echo\s+(?!.*\s\d+\s+times$)(.+)"),
+            lambda m: {"message": _free_text(m[1])},
+        ),
+        _Template(
+            "just_fun_random", "random_between",
+            compile_(
+                rf"(?:generate|give\s+me|pick|get)\s+(?:a\s+)?random\s+number\s+(?:between|from)\s+{_NUM}\s*(?:and|to|-)\s*{_NUM}"
+            ),
+            lambda m: {"a": _num(m[1]), "b": _num(m[2])},
+            lambda a, r: f"Random number between {_fmt_num(a['a'])} and {_fmt_num(a['b'])}: {r}",
+        ),
+    ]
+
+
+def _schema_templates(tool: dict) -> list[_Template]:
+    """
+    Templates derived from a tool's input schema, for tools without hand-written ones:
+    "<tool name> 1 and 2" for tools whose required parameters are all numbers. There is no
+    "<tool name> <text>" template: which words of free text are the argument ("Search for cheap
+    flights") is the LLM's call.
+    """
+    name = tool.get("name") or ""
+    schema = tool.get("input_schema") or {}
+    props = schema.get("properties") or {}
+    required = [r for r in schema.get("required") or [] if r in props]
+    if not name or not required:
+        return []
+    phrase = r"\s+".join(re.escape(w) for w in re.split(r"[_\-\s]+", name) if w)
+    types = [props[r].get("type") for r in required]
+    if all(t in _NUMERIC_TYPES for t in types):
+        nums = r"\s*(?:,|and)\s*".join([_NUM] * len(required))
+        return [_Template(name, "schema_numbers", re.compile(rf"^{_POLITE}{phrase}\s+{nums}$", re.IGNORECASE),
+                          lambda m, ps=tuple(required): {p: _num(m[i + 1]) for i, p in enumerate(ps)})]
+    return []
+
+
+class IntentParser:
+    """Templates for the tools in one manifest; built once per manifest."""
+
+    def __init__(self, mcp_tools_list: list[dict]):
+        tools = {t["name"]: t for t in mcp_tools_list if t.get("name")}
+        self.templates = [t for t in _known_templates() if t.tool in tools]
+        covered = {t.tool for t in self.templates}
+        for tool in tools.values():
+            if tool["name"] not in covered:
+                self.templates.extend(_schema_templates(tool))
+        self._schemas = {name: t.get("input_schema") or {} for name, t in tools.items()}
+
+    def parse(self, message: str) -> IntentMatch | None:
+        """The single tool call the whole message asks for, or None when nothing or several things match."""
+        text = " ".join(message.split()).rstrip(".!")
+        # A question is never a plain tool call ("echo what did I just say?"), unless it is quoted
+        if not text or len(text) > 200 or "?" in re.sub(r'"[^"]*"', "", text):
+            return None
+        matches: list[IntentMatch] = []
+        for template in self.templates:
+            m = template.pattern.match(text)
+            if not m:
+                continue
+            try:
+                args = template.build_args(m)
+                schema = self._schemas.get(template.tool)
+                if schema and schema.get("properties"):
+                    args = get_validator(template.tool, schema)(args)
+            except (ArgumentValidationError, ValueError):
+                continue
+            match = IntentMatch(template.tool, args, template.name, template.format_result)
+            if match not in matches:
+                matches.append(match)
+        return matches[0] if len(matches) == 1 else None
+
+
+# Parser for the most recent manifest per hash; manifests rarely change.
+_parsers: dict[str, IntentParser] = {}
+_last: tuple[list, IntentParser] | None = None
+
+
+def get_intent_parser(mcp_tools_list: list[dict]) -> IntentParser:
+    global _last
+    if _last is not None and _last[0] is mcp_tools_list:
+        return _last[1]
+    key = manifest_hash(mcp_tools_list)
+    parser = _parsers.get(key)
+    if parser is None:
+        _parsers.clear()
+        parser = _parsers[key] = IntentParser(mcp_tools_list)
+    _last = (mcp_tools_list, parser)
+    return parser
+
+
+def parse_intent(message: str, mcp_tools_list: list[dict]) -> IntentMatch | None:
+    """Fast-path tool call for a message, or None to use the LLM."""
+    if not FAST_PATH_ENABLED:
+        return None
+    return get_intent_parser(mcp_tools_list).parse(message)
+
+
+async def run_fast_path(client, match: IntentMatch) -> str | None:
+    """
+    Call the matched tool and phrase the answer. None (fall through to the LLM) only when the
+    MCP server cannot be reached; a tool error or a failure after the call was sent (the tool
+    may have run) is the answer.
+    """
+    from mcp_agent.mcp_langgraph_agent import _content_to_bounded_str
+
+    connect = getattr(client, "client", None)  # PooledSession: connect before sending anything
+    if connect is not None:
+        try:
+            await connect()
+        except Exception:
+            return None
+    try:
+        result = await call_tool(client, match.tool, match.arguments)
+    except Exception as e:
+        from fastmcp.exceptions import ToolError  # loaded by the call already
+
+        if isinstance(e, ToolError):  # fastmcp raises isError results
+            return f"Error: {e}"
+        return f"Error: calling {match.tool} failed ({type(e).__name__}: {e}); it may have run."
+    if result.get("isError"):
+        return f"Error: {await _content_to_bounded_str(result.get('content', result))}"
+    return match.answer(await _content_to_bounded_str(result.get("content")))
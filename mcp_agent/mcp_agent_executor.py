@@ -1,6 +1,8 @@
 """
 A2A AgentExecutor for the MCP-backed LangGraph agent.
 """
+import asyncio
+import sys
 from pathlib import Path
 
 from a2a.server.agent_execution import AgentExecutor
@@ -8,15 +10,43 @@ from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events import EventQueue
 from a2a.utils.message import new_agent_text_message
 
-from mcp_agent.mcp_langgraph_agent import run_mcp_agent
+from utilities.graph_streaming import stream_to_queue
+from utilities.tracing import extract, span
 
 
 class MCPAgentExecutor(AgentExecutor):
-    """Executor that runs the MCP tool-backed LangGraph agent."""
+    """Executor that runs the MCP tool-backed LangGraph agent, streaming tokens and tool calls."""
 
     def __init__(self, registry_path: str | Path | None = None):
         self._registry_path = registry_path
 
+    async def warm_up(self) -> None:
+        """
+        Startup warm-up step: import the agent module, connect the pooled MCP session and fetch the
+        manifest, then build the tools, tool index and compiled graph for it.
+        """
+        import importlib
+
+        # The import (langgraph, langchain, fastmcp) runs off the event loop
+        await asyncio.to_thread(importlib.import_module, "mcp_agent.mcp_langgraph_agent")
+        from mcp_agent.mcp_langgraph_agent import get_agent_graph, get_pooled_session, get_tool_index
+
+        session = get_pooled_session(registry_path=self._registry_path)
+        mcp_tools_list = await session.manifest()
+        if mcp_tools_list:
+            get_tool_index(mcp_tools_list)
+            get_agent_graph(session, mcp_tools_list)
+
+    async def aclose(self) -> None:
+        """
+        Stop the deployment health probes and close the pooled MCP sessions, if any were started
+        (on shutdown; see utilities.shutdown). Probes go first, so they open no new clients.
+        """
+        if "mcp_connector.failover" in sys.modules:
+            await sys.modules["mcp_connector.failover"].stop_deployment_pools()
+        if "mcp_connector.pool" in sys.modules:
+            await sys.modules["mcp_connector.pool"].close_pooled_sessions()
+
     async def execute(
         self,
         context: RequestContext,
@@ -28,15 +58,15 @@ class MCPAgentExecutor(AgentExecutor):
                 new_agent_text_message("Please provide a message.")
             )
             return
-        try:
-            result = await run_mcp_agent(
-                user_input.strip(),
-                registry_path=self._registry_path,
-            )
-            await event_queue.enqueue_event(new_agent_text_message(result))
-        except Exception as e:
-            await event_queue.enqueue_event(
-                new_agent_text_message(f"Error: {e!s}")
+        # Imported on first use: langgraph, langchain and fastmcp take most of the server's startup time
+        from mcp_agent.mcp_langgraph_agent import stream_mcp_agent
+
+        remote = extract(context.metadata, context.message.metadata)
+        with span("mcp_agent.execute", remote_parent=remote, context_id=context.context_id):
+            await stream_to_queue(
+                context,
+                event_queue,
+                stream_mcp_agent(user_input.strip(), registry_path=self._registry_path, context_id=context.context_id),
             )
 
     async def cancel(
@@ -4,6 +4,7 @@ Connects to the server from mcp_registry, lists tools, and runs a ReAct agent wi
 """
 import os
 import sys
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -11,11 +12,28 @@ from typing import Any
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from langchain_core.tools import StructuredTool
-from langchain_openai import ChatOpenAI
+from langgraph.config import get_config
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel, Field, create_model
 
-from mcp_connector import call_tool, create_client, get_server_url, list_tools
+from mcp_connector import call_tool, get_pooled_session, manifest_hash
+from mcp_connector.streaming import iter_content_chunks, spool
+from mcp_connector.validation import ArgumentValidationError, get_validator, schema_hash, validate_arguments
+from utilities.agent_budget import answer_text, run_budgeted
+from utilities.conversation_memory import memory_config, memory_graph_kwargs, remember_turn
+from utilities.graph_streaming import GraphEvent
+from utilities.llm_simulator import get_chat_model
+
+from mcp_agent.fast_path import parse_intent, run_fast_path
+from mcp_agent.tool_index import get_tool_index
+
+# Largest tool result (bytes) passed to the model as-is; bigger results are truncated to head + tail.
+TOOL_RESULT_MAX_BYTES = int(os.getenv("MCP_TOOL_RESULT_MAX_BYTES", "16000"))
+
+MCP_AGENT_PROMPT = (
+    "You are a helpful assistant with access to tools from an MCP server (add, greet, echo, etc.). "
+    "Use the tools when they help answer the user. Reply concisely."
+)
 
 # Fallback input schemas for known MCP tools when the server does not return inputSchema.
 # Ensures add, greet, echo always have correct required/optional params.
@@ -60,18 +78,18 @@ def _content_to_str(content) -> str:
         return ""
     if isinstance(content, str):
         return content
-    if isinstance(content, list):
-        parts = []
-        for block in content:
-            if isinstance(block, dict):
-                if "text" in block:
-                    parts.append(block["text"])
-                else:
-                    parts.append(str(block))
-            else:
-                parts.append(str(block))
-        return "\n".join(parts)
-    return str(content)
+    # Binary blocks (images, audio, blobs) become "[image/png, 48213 bytes]": their bytes mean nothing to the LLM
+    return "".join(iter_content_chunks(content, binary=False))
+
+
+async def _content_to_bounded_str(content, max_bytes: int = TOOL_RESULT_MAX_BYTES) -> str:
+    """
+    Like _content_to_str, but spools the content (spilling large results to a temp file)
+    and returns head and tail with a truncation note when it exceeds max_bytes, so an
+    oversized tool result does not go wholesale into the LLM context.
+    """
+    with await spool(iter_content_chunks(content, binary=False)) as spooled:
+        return spooled.preview(max_bytes)
 
 
 def _json_schema_type_to_python(prop_schema: dict) -> type:
@@ -126,18 +144,38 @@ def _get_effective_schema(tool_name: str, input_schema: dict | None) -> dict:
     return FALLBACK_INPUT_SCHEMAS.get(tool_name, {})
 
 
+# Generated args models keyed by (tool name, schema hash); create_model is the expensive part.
+_args_models: dict[tuple[str, str], type[BaseModel] | None] = {}
+
+
+def _cached_args_model(tool_name: str, input_schema: dict) -> type[BaseModel] | None:
+    key = (tool_name, schema_hash(input_schema))
+    if key not in _args_models:
+        _args_models[key] = _input_schema_to_pydantic(tool_name, input_schema)
+    return _args_models[key]
+
+
 def _make_mcp_tool(client, name: str, description: str, input_schema: dict | None = None):
     """Build one LangChain tool that calls the MCP server for a given tool name."""
     effective_schema = _get_effective_schema(name, input_schema)
-    args_schema = _input_schema_to_pydantic(name, effective_schema)
+    args_schema = _cached_args_model(name, effective_schema)
+    if effective_schema:
+        get_validator(name, effective_schema)  # compiled now, not on the first call
 
     async def _invoke(**kwargs) -> str:
         # Omit None values so optional params use server defaults (e.g. echo repeat)
         args = {k: v for k, v in kwargs.items() if v is not None}
+        # Validated locally against the schema: bad arguments come back as an error the model can fix
+        # (counted in the "rejected" validation stat: an MCP round trip avoided)
+        if effective_schema:
+            try:
+                args = validate_arguments(name, effective_schema, args)
+            except ArgumentValidationError as e:
+                return f"Error: {e}"
         result = await call_tool(client, name, args)
         if result.get("isError"):
-            return f"Error: {_content_to_str(result.get('content', result))}"
-        return _content_to_str(result.get("content"))
+            return f"Error: {await _content_to_bounded_str(result.get('content', result))}"
+        return await _content_to_bounded_str(result.get("content"))
 
     kwargs: dict[str, Any] = dict(
         coroutine=_invoke,
@@ -165,42 +203,201 @@ def _build_langchain_tools(client, mcp_tools_list: list) -> list:
     ]
 
 
-async def run_mcp_agent(user_message: str, registry_path: str | Path | None = None) -> str:
-    """
-    Run the LangGraph agent with MCP tools. Uses mcp_registry to get server URL,
-    connects, lists tools, and runs the agent. Returns the final text response.
-    """
-    url = get_server_url(registry_path)
-    client = create_client(url=url, registry_path=registry_path)
+# Per pooled session: (manifest list, manifest hash, LangChain tools bound to that session).
+_tool_cache: dict[Any, tuple[list, str, list]] = {}
 
-    async with client:
-        mcp_tools_list = await list_tools(client)
-        if not mcp_tools_list:
-            return "No tools available from the MCP server. Ask the operator to start the MCP server or check mcp_registry."
 
-        lc_tools = _build_langchain_tools(client, mcp_tools_list)
-        model = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+def get_langchain_tools(session, mcp_tools_list: list) -> list:
+    """LangChain tools for a manifest, bound to the pooled session; rebuilt only when the manifest changes."""
+    cached = _tool_cache.get(session)
+    if cached is not None and cached[0] is mcp_tools_list:
+        # Same cached manifest object from session.manifest(): skip rehashing
+        return cached[2]
+    key = manifest_hash(mcp_tools_list)
+    if cached is not None and cached[1] == key:
+        _tool_cache[session] = (mcp_tools_list, key, cached[2])
+        return cached[2]
+    tools = _build_langchain_tools(session, mcp_tools_list)
+    _tool_cache[session] = (mcp_tools_list, key, tools)
+    return tools
+
+
+# Shared chat model clients per model name, so the LLM HTTP connection pool is reused across requests.
+_models: dict[str, Any] = {}
+
+# Warm compiled ReAct graphs per (pooled session, model name), least recently used first: (tool list
+# the graph was built from, graph); a new manifest means a new tool list and a rebuild. A compiled
+# graph keeps no per-request state, so one instance serves concurrent ainvoke calls. Lookups and
+# rebuilds are synchronous (no await), so concurrent requests on the event loop cannot interleave them.
+GRAPH_CACHE_SIZE = int(os.getenv("MCP_GRAPH_CACHE_SIZE", "64"))
+_graphs: OrderedDict[tuple[Any, str], tuple[list, Any]] = OrderedDict()
+
+# The request's selected tool names travel in the run config; the graph's model node binds them
+TOOLS_CONFIG_KEY = "mcp_tools"
+
+# Chat models with a tool subset bound, per (model name, tool list, selected names), least recently
+# used first. bind_tools only converts the tools' schemas, so a miss costs far less than a compile.
+BOUND_MODEL_CACHE_SIZE = int(os.getenv("MCP_BOUND_MODEL_CACHE_SIZE", "256"))
+_bound_models: OrderedDict[tuple[str, int, tuple[str, ...] | None], tuple[list, Any]] = OrderedDict()
+
+
+def _get_model(model_name: str):
+    model = _models.get(model_name)
+    if model is None:
+        model = _models[model_name] = get_chat_model(
+            model_name,
             temperature=0,
             api_key=os.getenv("OPENAI_API_KEY"),
         )
-        agent = create_react_agent(
-            model=model,
-            tools=lc_tools,
-            prompt=(
-                "You are a helpful assistant with access to tools from an MCP server (add, greet, echo, etc.). "
-                "Use the tools when they help answer the user. Reply concisely."
-            ),
-        )
-        result = await agent.ainvoke({
-            "messages": [{"role": "user", "content": user_message}],
-        })
-        messages = result.get("messages", [])
-        if not messages:
-            return "No response generated."
-        last = messages[-1]
-        if hasattr(last, "content"):
-            return (last.content or "").strip() or "No response generated."
-        if isinstance(last, dict):
-            return (last.get("content") or "").strip() or "No response generated."
-        return str(last).strip() or "No response generated."
+    return model
+
+
+def select_tools(mcp_tools_list: list, user_message: str) -> tuple[str, ...] | None:
+    """
+    Names of the tools to bind for a message (see tool_index), or None when every tool is bound
+    (catalog no larger than MCP_TOOL_TOP_K).
+    """
+    names = get_tool_index(mcp_tools_list).select(user_message)
+    return tuple(names) if len(names) < len(mcp_tools_list) else None
+
+
+def tools_config(config: dict | None, names: tuple[str, ...] | None) -> dict | None:
+    """Run config carrying the request's selected tool names (select_tools) to the graph's model node."""
+    if names is None:
+        return config
+    config = dict(config or {})
+    config["configurable"] = {**config.get("configurable", {}), TOOLS_CONFIG_KEY: names}
+    return config
+
+
+def _bound_model(model_name: str, tools: list, names: tuple[str, ...] | None):
+    key = (model_name, id(tools), names)
+    cached = _bound_models.get(key)
+    if cached is not None and cached[0] is tools:
+        _bound_models.move_to_end(key)
+        return cached[1]
+    if names is not None:
+        wanted = set(names)
+        tools_ = [t for t in tools if t.name in wanted]
+    else:
+        tools_ = tools
+    model = _get_model(model_name).bind_tools(tools_)
+    _bound_models[key] = (tools, model)
+    _bound_models.move_to_end(key)
+    while len(_bound_models) > BOUND_MODEL_CACHE_SIZE:
+        _bound_models.popitem(last=False)
+    return model
+
+
+def get_agent_graph(session, mcp_tools_list: list):
+    """
+    Compiled ReAct graph for the current model and tool manifest, rebuilt only when either changes.
+    Every tool can run, but the model is bound per call to the tools named in the run config
+    (tools_config; all of them when there is none), so top-k selection never recompiles the graph.
+    """
+    tools = get_langchain_tools(session, mcp_tools_list)
+    model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    key = (session, model_name)
+    cached = _graphs.get(key)
+    if cached is not None and cached[0] is tools:
+        _graphs.move_to_end(key)
+        return cached[1]
+
+    def model_for_request(state, runtime):
+        names = (get_config().get("configurable") or {}).get(TOOLS_CONFIG_KEY)
+        return _bound_model(model_name, tools, names)
+
+    model = _get_model(model_name)
+    graph = create_react_agent(
+        model=model_for_request, tools=tools, prompt=MCP_AGENT_PROMPT, **memory_graph_kwargs(model)
+    )
+    _graphs[key] = (tools, graph)
+    _graphs.move_to_end(key)
+    while len(_graphs) > GRAPH_CACHE_SIZE:
+        _graphs.popitem(last=False)
+    return graph
+
+
+NO_TOOLS_MESSAGE = "No tools available from the MCP server. Ask the operator to start the MCP server or check mcp_registry."
+
+
+async def _answer_fast(session, mcp_tools_list: list, user_message: str, config: dict | None):
+    """(match, answer) from the fast path for a simple tool intent, recorded in the context's memory; None for the LLM."""
+    match = parse_intent(user_message, mcp_tools_list)
+    if match is None:
+        return None
+    answer = await run_fast_path(session, match)
+    if answer is None:
+        return None
+    if config is not None:
+        await remember_turn(get_agent_graph(session, mcp_tools_list), config, user_message, answer)
+    return match, answer
+
+
+async def stream_mcp_agent(
+    user_message: str,
+    registry_path: str | Path | None = None,
+    context_id: str | None = None,
+):
+    """Like run_mcp_agent, but yields GraphEvents (tokens, tool start/end, final answer) as they happen."""
+    session = get_pooled_session(registry_path=registry_path)
+    mcp_tools_list = await session.manifest()
+    if not mcp_tools_list:
+        yield GraphEvent("final", text=NO_TOOLS_MESSAGE)
+        return
+    config = memory_config(context_id)
+    fast = await _answer_fast(session, mcp_tools_list, user_message, config)
+    if fast is not None:
+        match, answer = fast
+        yield GraphEvent("tool_start", tool=match.tool, data=match.arguments)
+        yield GraphEvent("tool_end", tool=match.tool)
+        yield GraphEvent("final", text=answer)
+        return
+    agent = get_agent_graph(session, mcp_tools_list)
+    config = tools_config(config, select_tools(mcp_tools_list, user_message))
+    async for event in run_budgeted(
+        "mcp_agent",
+        agent,
+        {"messages": [{"role": "user", "content": user_message}]},
+        config,
+        prompt=user_message,
+    ):
+        yield event
+
+
+async def run_mcp_agent(
+    user_message: str,
+    registry_path: str | Path | None = None,
+    context_id: str | None = None,
+) -> str:
+    """
+    Run the LangGraph agent with MCP tools. Uses the pooled MCP session for the mcp_registry
+    deployments (failing over between them), the cached tool manifest and the warm compiled
+    graph for it, and runs the agent (with AGENT_MEMORY, in the context's thread) within its
+    step/tool-call/time budget. Returns the final text response, followed by the budget status
+    when the budget ran out.
+    """
+    session = get_pooled_session(registry_path=registry_path)
+    mcp_tools_list = await session.manifest()
+    if not mcp_tools_list:
+        return NO_TOOLS_MESSAGE
+
+    # Simple tool intents ("Add 3 and 5") skip the LLM when they parse unambiguously
+    config = memory_config(context_id)
+    fast = await _answer_fast(session, mcp_tools_list, user_message, config)
+    if fast is not None:
+        return fast[1]
+
+    agent = get_agent_graph(session, mcp_tools_list)
+    config = tools_config(config, select_tools(mcp_tools_list, user_message))
+    answer = ""
+    async for event in run_budgeted(
+        "mcp_agent",
+        agent,
+        {"messages": [{"role": "user", "content": user_message}]},
+        config,
+        prompt=user_message,
+    ):
+        if event.kind == "final":
+            answer = answer_text(event).strip()
+    return answer or "No response generated."
@@ -0,0 +1,147 @@
+"""
+Local retrieval index over an MCP tool manifest.
+
+Binding every tool to the model makes prompt tokens, LLM latency and cost grow with the catalog.
+ToolIndex scores tools against the user message with BM25 over their names (weighted up),
+descriptions and parameter names/descriptions, with light stemming and a small verb synonym
+table, so only the top-k relevant tools (plus an always-include list) are bound per request. Slots
+left when fewer than k tools match (e.g. "now do it for 7", a follow-up sharing no word with any
+tool) are filled in manifest order, so the model always has k tools to choose from.
+The index is built once per manifest; small catalogs (<= k tools) are bound whole.
+"""
+import math
+import os
+import re
+from collections import Counter
+
+from mcp_connector import manifest_hash
+
+# Tools bound per request when the catalog is larger than this; MCP_TOOL_TOP_K=0 binds every tool.
+TOOL_TOP_K = int(os.getenv("MCP_TOOL_TOP_K", "8"))
+# Comma-separated tool names bound on every request regardless of score.
+ALWAYS_INCLUDE = [t.strip() for t in os.getenv("MCP_TOOLS_ALWAYS", "").split(",") if t.strip()]
+
+_NAME_WEIGHT = 3
+_BM25_K1, _BM25_B = 1.2, 0.75
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "from", "by", "at", "as",
+    "is", "are", "be", "it", "its", "this", "that", "me", "my", "i", "you", "your", "please", "can",
+    "could", "would", "will", "do", "does", "what", "which", "how", "some", "any", "all", "tool",
+}
+
+# Canonical verb for common synonyms, so "remove" finds a tool described as "delete".
+_SYNONYMS = {
+    "make": "create", "new": "create", "schedule": "create",
+    "remove": "delete", "cancel": "delete", "drop": "delete", "erase": "delete",
+    "show": "list", "enumerate": "list",
+    "fetch": "get", "retrieve": "get", "look": "get", "read": "get", "check": "get", "lookup": "get",
+    "change": "update", "modify": "update", "edit": "update", "rename": "update",
+    "find": "search", "query": "search",
+    "mail": "email",
+}
+
+
+def _stem(word: str) -> str:
+    if len(word) <= 4:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "ches", "shes", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("ing") and len(word) > 5:
+        return word[:-3]
+    if word.endswith("ed") and len(word) > 5:
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, stemmed, synonym-folded terms; splits snake_case, kebab-case and camelCase."""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text or "")
+    terms = []
+    for word in re.findall(r"[a-z0-9]+", text.lower().replace("_", " ")):
+        if word in _STOPWORDS:
+            continue
+        word = _SYNONYMS.get(word, word)
+        terms.append(_SYNONYMS.get(_stem(word), _stem(word)))
+    return terms
+
+
+def _tool_terms(tool: dict) -> list[str]:
+    terms = tokenize(tool.get("name", "")) * _NAME_WEIGHT + tokenize(tool.get("description") or "")
+    props = (tool.get("input_schema") or {}).get("properties") or {}
+    for name, prop in props.items():
+        terms += tokenize(name)
+        if isinstance(prop, dict):
+            terms += tokenize(prop.get("description") or "")
+    return terms
+
+
+class ToolIndex:
+    """BM25 index over one manifest's tools."""
+
+    def __init__(self, mcp_tools_list: list[dict]):
+        self.names = [t["name"] for t in mcp_tools_list if t.get("name")]
+        docs = [_tool_terms(t) for t in mcp_tools_list if t.get("name")]
+        self._tf = [Counter(d) for d in docs]
+        self._len = [len(d) for d in docs]
+        self._avg_len = (sum(self._len) / len(docs)) if docs else 0.0
+        df = Counter(term for tf in self._tf for term in tf)
+        n = len(docs)
+        self._idf = {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()}
+
+    def scores(self, query: str) -> list[float]:
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        out = []
+        for tf, length in zip(self._tf, self._len):
+            s = 0.0
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / (self._avg_len or 1))
+            for term in terms:
+                f = tf.get(term)
+                if f:
+                    s += self._idf[term] * f * (_BM25_K1 + 1) / (f + norm)
+            out.append(s)
+        return out
+
+    def search(self, query: str, k: int) -> list[str]:
+        """Names of the k best-scoring tools (ties keep manifest order; zero scores excluded)."""
+        ranked = sorted(
+            ((s, i) for i, s in enumerate(self.scores(query)) if s > 0),
+            key=lambda x: (-x[0], x[1]),
+        )
+        return [self.names[i] for _, i in ranked[:k]]
+
+    def select(self, query: str, k: int = TOOL_TOP_K, always: list[str] | None = None) -> list[str]:
+        """Tools to bind for a query: every tool if the catalog has <= k, else always-include + top-k, in manifest order.
+
+        The top-k are the matching tools by score, then the first unmatched tools of the manifest.
+        """
+        if k <= 0 or len(self.names) <= k:
+            return list(self.names)
+        always = ALWAYS_INCLUDE if always is None else always
+        chosen = {n for n in always if n in self.names}
+        matched = self.search(query, k)
+        chosen.update(matched)
+        chosen.update([n for n in self.names if n not in matched][: k - len(matched)])
+        return [n for n in self.names if n in chosen]
+
+
+_indexes: dict[str, ToolIndex] = {}
+_last: tuple[list, ToolIndex] | None = None
+
+
+def get_tool_index(mcp_tools_list: list[dict]) -> ToolIndex:
+    """Index for a manifest, built once and reused until the manifest changes."""
+    global _last
+    if _last is not None and _last[0] is mcp_tools_list:
+        return _last[1]
+    key = manifest_hash(mcp_tools_list)
+    index = _indexes.get(key)
+    if index is None:
+        _indexes.clear()
+        index = _indexes[key] = ToolIndex(mcp_tools_list)
+    _last = (mcp_tools_list, index)
+    return index
@@ -1,25 +1,62 @@
 """MCP Connector: connect remote agents to the MCP server."""
 
+from .failover import DeploymentPool, FailoverClient, get_deployment_pool, stop_deployment_pools
 from .mcp_connector import (
     call_tool,
+    client_for_url,
     create_client,
     get_server_url,
+    get_server_urls,
     list_resources,
     list_tools,
     list_tools_from_registry,
     load_registry,
+    manifest_hash,
     read_resource,
     run_connector,
 )
+from .pool import PooledSession, close_pooled_sessions, get_pooled_session
+from .streaming import (
+    SpooledContent,
+    iter_content_chunks,
+    spool_resource,
+    stream_resource,
+    stream_tool_result,
+)
+from .validation import (
+    ArgumentValidationError,
+    get_validation_stats,
+    get_validator,
+    validate_arguments,
+)
 
 __all__ = [
+    "ArgumentValidationError",
+    "DeploymentPool",
+    "FailoverClient",
+    "PooledSession",
+    "SpooledContent",
     "call_tool",
+    "close_pooled_sessions",
+    "client_for_url",
     "create_client",
+    "get_deployment_pool",
+    "get_pooled_session",
     "get_server_url",
+    "get_server_urls",
+    "get_validation_stats",
+    "get_validator",
+    "iter_content_chunks",
     "list_tools",
     "list_resources",
     "list_tools_from_registry",
     "load_registry",
+    "manifest_hash",
     "read_resource",
     "run_connector",
+    "spool_resource",
+    "stop_deployment_pools",
+    "stream_resource",
+    "stream_tool_result",
+    "validate_arguments",
 ]
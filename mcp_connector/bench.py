@@ -0,0 +1,223 @@
+"""
+Load test for MCP tools: `mcp_connector bench`.
+
+Drives one tool, or a weighted mix of tools, from N concurrent workers for a fixed
+duration (or request count) and reports throughput, error rate and latency percentiles
+per tool and overall, as a table or JSON.
+
+    python -m mcp_connector.mcp_connector bench add '{"a": 1, "b": 2}' --concurrency 32 --duration 30
+    python -m mcp_connector.mcp_connector bench add:3,greet:1 '{"add": {"a": 1, "b": 2}, "greet": {"name": "Al"}}' --json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+
+
+def parse_mix(spec: str) -> list[tuple[str, float]]:
+    """Parse 'add:3,greet:1' (weight defaults to 1) into [(name, weight), ...]."""
+    mix = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, weight = item.partition(":")
+        try:
+            w = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Weight for {name!r} must be a number, got {weight!r}") from None
+        if not name:
+            raise ValueError(f"Missing tool name in {item!r}")
+        if not w > 0 or math.isinf(w):
+            raise ValueError(f"Weight for {name!r} must be a positive number")
+        mix.append((name, w))
+    if not mix:
+        raise ValueError("Empty tool mix")
+    return mix
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class ToolStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed_s: float) -> dict:
+        lat = sorted(self.latencies_ms)
+        total = len(lat)
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "throughput_rps": round(total / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            "mean_ms": round(sum(lat) / total, 2) if total else 0.0,
+            "p50_ms": round(percentile(lat, 50), 2),
+            "p95_ms": round(percentile(lat, 95), 2),
+            "p99_ms": round(percentile(lat, 99), 2),
+            "max_ms": round(lat[-1], 2) if lat else 0.0,
+        }
+
+
+def _arguments_for(mix: list[tuple[str, float]], arguments: dict) -> dict[str, dict]:
+    """Arguments may be one dict for every tool, or a dict keyed by tool name."""
+    names = [n for n, _ in mix]
+    if arguments and all(k in names and isinstance(v, dict) for k, v in arguments.items()):
+        return {n: arguments.get(n, {}) for n in names}
+    return {n: arguments for n in names}
+
+
+async def run_bench(
+    clients: list,
+    mix: list[tuple[str, float]],
+    arguments: dict | None = None,
+    concurrency: int = 10,
+    duration: float = 10.0,
+    requests: int | None = None,
+    seed: int | None = None,
+) -> dict:
+    """
+    Run the load test on already-connected clients (workers are spread round-robin over them)
+    and return {"config": ..., "total": {...}, "tools": {name: {...}}}.
+    Stops after `duration` seconds, or after `requests` calls when given.
+    """
+    args_by_tool = _arguments_for(mix, arguments or {})
+    names = [n for n, _ in mix]
+    weights = [w for _, w in mix]
+    rng = random.Random(seed)
+    stats = {n: ToolStats() for n in names}
+    deadline = time.perf_counter() + duration
+    remaining = [requests] if requests is not None else None
+
+    def take() -> bool:
+        if remaining is not None:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+        return time.perf_counter() < deadline
+
+    async def worker(client) -> None:
+        while take():
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                result = await client.call_tool(name, args_by_tool[name])
+                failed = bool(getattr(result, "is_error", getattr(result, "isError", False)))
+            except Exception:
+                failed = True
+            s = stats[name]
+            s.latencies_ms.append((time.perf_counter() - start) * 1000)
+            if failed:
+                s.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(clients[i % len(clients)]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total = ToolStats()
+    for s in stats.values():
+        total.latencies_ms.extend(s.latencies_ms)
+        total.errors += s.errors
+    return {
+        "config": {
+            "mix": dict(mix),
+            "concurrency": concurrency,
+            "clients": len(clients),
+            "duration_s": duration if requests is None else None,
+            "requests": requests,
+            "elapsed_s": round(elapsed, 3),
+        },
+        "total": total.summary(elapsed),
+        "tools": {n: s.summary(elapsed) for n, s in stats.items()},
+    }
+
+
+def format_table(report: dict) -> str:
+    """Render a bench report as a fixed-width table."""
+    cols = ["requests", "errors", "error_rate", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    rows = [(name, s) for name, s in report["tools"].items()]
+    if len(rows) > 1:
+        rows.append(("TOTAL", report["total"]))
+    width = max(len("tool"), *(len(name) for name, _ in rows))
+    header = "tool".ljust(width) + "".join(c.rjust(16) for c in cols)
+    lines = [header, "-" * len(header)]
+    for name, s in rows:
+        lines.append(name.ljust(width) + "".join(str(s[c]).rjust(16) for c in cols))
+    cfg = report["config"]
+    lines.append(
+        f"\nconcurrency={cfg['concurrency']} clients={cfg['clients']} elapsed={cfg['elapsed_s']}s"
+    )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mcp_connector bench", description="Load-test MCP tools.")
+    parser.add_argument("tools", help="Tool name or weighted mix, e.g. add or add:3,greet:1")
+    parser.add_argument("arguments", nargs="?", default="{}", help="JSON args (for all tools, or keyed by tool name)")
+    parser.add_argument("--concurrency", "-c", type=int, default=10, help="Concurrent workers (default 10)")
+    parser.add_argument("--duration", "-d", type=float, default=10.0, help="Seconds to run (default 10)")
+    parser.add_argument("--requests", "-n", type=int, default=None, help="Stop after N calls instead of a duration")
+    parser.add_argument("--clients", type=int, default=1, help="MCP sessions to spread workers over (default 1)")
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed calls per tool before measuring")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the weighted tool choice")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON only")
+    return parser
+
+
+async def bench_command(url: str, argv: list[str]) -> dict:
+    """Entry point for the `bench` CLI command; prints and returns the report."""
+    from .mcp_connector import create_client
+
+    opts = build_parser().parse_args(argv)
+    # Bad input is reported like the `call` command does, before connecting
+    try:
+        mix = parse_mix(opts.tools)
+    except ValueError as e:
+        print(json.dumps({"error": f"Invalid tool mix: {e}"}), file=sys.stderr)
+        sys.exit(1)
+    try:
+        arguments = json.loads(opts.arguments)
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON arguments"}), file=sys.stderr)
+        sys.exit(1)
+    if not isinstance(arguments, dict):
+        print(json.dumps({"error": "Invalid JSON arguments: expected an object"}), file=sys.stderr)
+        sys.exit(1)
+    async with AsyncExitStack() as stack:
+        # Clients already entered are closed even if a later one fails to connect
+        clients = [await stack.enter_async_context(create_client(url=url)) for _ in range(max(1, opts.clients))]
+        if opts.warmup:
+            args_by_tool = _arguments_for(mix, arguments)
+            for name, _ in mix:
+                for _ in range(opts.warmup):
+                    try:
+                        await clients[0].call_tool(name, args_by_tool[name])
+                    except Exception:
+                        pass
+        report = await run_bench(
+            clients,
+            mix,
+            arguments,
+            concurrency=max(1, opts.concurrency),
+            duration=opts.duration,
+            requests=opts.requests,
+            seed=opts.seed,
+        )
+    if opts.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(report))
+        print(json.dumps(report))
+    return report
@@ -0,0 +1,281 @@
+"""
+Deployment failover for the MCP connector.
+
+mcp_registry server.json may list several deployments of the same server. A DeploymentPool
+probes them in the background (MCP ping), ranks them fastest-healthy first, and a
+FailoverClient uses that ranking to connect and to retry calls on another deployment
+when the failure is a transport error and the call is safe to repeat.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background health probes, and the timeout for one probe.
+PROBE_INTERVAL = float(os.environ.get("MCP_PROBE_INTERVAL", "15"))
+PROBE_TIMEOUT = float(os.environ.get("MCP_PROBE_TIMEOUT", "3"))
+
+# Weight of the newest latency sample in the moving average.
+_LATENCY_ALPHA = 0.3
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """True for transport-level failures (connection refused/reset, timeouts, closed session)."""
+    import httpx
+
+    if isinstance(exc, (httpx.TransportError, OSError)):
+        return True
+    if isinstance(exc, RuntimeError) and exc.__cause__ is not None:
+        return is_retryable_error(exc.__cause__)
+    try:
+        from mcp.shared.exceptions import McpError
+        from mcp.types import CONNECTION_CLOSED
+    except ImportError:
+        return False
+    if isinstance(exc, McpError):
+        code = getattr(exc.error, "code", None)
+        return code in (CONNECTION_CLOSED, 408)
+    return False
+
+
+@dataclass
+class DeploymentHealth:
+    """Health record for one deployment URL."""
+
+    url: str
+    healthy: bool | None = None  # None until the first probe or call
+    latency_ms: float | None = None
+    failures: int = 0
+    last_checked: float = 0.0
+    last_error: str = ""
+
+    def record_success(self, latency_ms: float) -> None:
+        self.healthy = True
+        self.failures = 0
+        self.last_error = ""
+        self.last_checked = time.monotonic()
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms = _LATENCY_ALPHA * latency_ms + (1 - _LATENCY_ALPHA) * self.latency_ms
+
+    def record_failure(self, exc: BaseException) -> None:
+        self.healthy = False
+        self.failures += 1
+        self.last_error = f"{type(exc).__name__}: {exc}"
+        self.last_checked = time.monotonic()
+
+
+class DeploymentPool:
+    """Tracks the health of every deployment of one MCP server and ranks them."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        probe_interval: float = PROBE_INTERVAL,
+        probe_timeout: float = PROBE_TIMEOUT,
+    ):
+        if not urls:
+            raise ValueError("DeploymentPool needs at least one URL")
+        self.urls = list(urls)
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.health = {url: DeploymentHealth(url) for url in self.urls}
+        self._probe_task: asyncio.Task | None = None
+
+    def ranked_urls(self) -> list[str]:
+        """Healthy deployments by latency, then unprobed ones in registry order, then unhealthy ones."""
+        order = {url: i for i, url in enumerate(self.urls)}
+
+        def key(url: str):
+            h = self.health[url]
+            if h.healthy:
+                return (0, h.latency_ms or 0.0, order[url])
+            if h.healthy is None:
+                return (1, 0.0, order[url])
+            return (2, h.last_checked, order[url])
+
+        return sorted(self.urls, key=key)
+
+    def record_success(self, url: str, latency_ms: float) -> None:
+        self.health[url].record_success(latency_ms)
+
+    def record_failure(self, url: str, exc: BaseException) -> None:
+        h = self.health[url]
+        if h.healthy is not False:
+            logger.warning("MCP deployment %s marked unhealthy: %s", url, exc)
+        h.record_failure(exc)
+
+    async def probe(self, url: str) -> bool:
+        """Ping one deployment and update its health record."""
+        from .mcp_connector import client_for_url
+
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.probe_timeout):
+                async with client_for_url(url) as client:
+                    await client.ping()
+        except Exception as e:
+            self.record_failure(url, e)
+            return False
+        self.record_success(url, (time.perf_counter() - start) * 1000)
+        return True
+
+    async def probe_all(self) -> None:
+        await asyncio.gather(*(self.probe(url) for url in self.urls))
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.probe_interval)
+
+    def ensure_probing(self) -> None:
+        """Start the background probe task on the running event loop (no-op if already running)."""
+        if len(self.urls) < 2:
+            return
+        loop = asyncio.get_running_loop()
+        task = self._probe_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._probe_task = loop.create_task(self._probe_loop(), name="mcp-deployment-probe")
+
+    async def stop(self) -> None:
+        task, self._probe_task = self._probe_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                "url": h.url,
+                "healthy": h.healthy,
+                "latency_ms": None if h.latency_ms is None else round(h.latency_ms, 2),
+                "failures": h.failures,
+                "last_error": h.last_error,
+            }
+            for h in (self.health[u] for u in self.ranked_urls())
+        ]
+
+
+_pools: dict[tuple[str, ...], DeploymentPool] = {}
+
+
+def get_deployment_pool(urls: list[str]) -> DeploymentPool:
+    """Shared pool per set of deployment URLs, so health data survives across clients."""
+    key = tuple(urls)
+    if key not in _pools:
+        _pools[key] = DeploymentPool(list(urls))
+    return _pools[key]
+
+
+async def stop_deployment_pools() -> None:
+    """Stop every pool's background probe task (call on shutdown, before closing the sessions)."""
+    await asyncio.gather(*(pool.stop() for pool in list(_pools.values())), return_exceptions=True)
+
+
+class FailoverClient:
+    """
+    Drop-in for fastmcp.Client (async with, list_tools, call_tool, list_resources,
+    read_resource, ping) backed by a DeploymentPool.
+
+    Connects to the best-ranked deployment that accepts a connection. Listing, reading and
+    pinging are retried on the next deployment after a transport error; tool calls are only
+    retried when the tool is idempotent (MCP readOnlyHint/idempotentHint annotations, or
+    listed in idempotent_tools), since the failed attempt may already have run on the server.
+    """
+
+    def __init__(self, pool: DeploymentPool, idempotent_tools: set[str] | None = None):
+        self.pool = pool
+        self.idempotent_tools = set(idempotent_tools or ())
+        self.url: str | None = None
+        self._client = None
+        self._depth = 0
+
+    async def __aenter__(self):
+        if self._depth == 0:
+            self.pool.ensure_probing()
+            await self._connect()
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._depth -= 1
+        if self._depth == 0:
+            await self._disconnect()
+
+    async def _connect(self, exclude: set[str] | None = None) -> None:
+        from .mcp_connector import client_for_url
+
+        last_error: BaseException | None = None
+        for url in self.pool.ranked_urls():
+            if exclude and url in exclude:
+                continue
+            client = client_for_url(url)
+            start = time.perf_counter()
+            try:
+                await client.__aenter__()
+            except Exception as e:
+                self.pool.record_failure(url, e)
+                last_error = e
+                continue
+            self.pool.record_success(url, (time.perf_counter() - start) * 1000)
+            self._client, self.url = client, url
+            return
+        raise ConnectionError(f"No MCP deployment reachable (tried {self.pool.urls})") from last_error
+
+    async def _disconnect(self) -> None:
+        client, self._client, self.url = self._client, None, None
+        if client is not None:
+            with contextlib.suppress(Exception):
+                await client.__aexit__(None, None, None)
+
+    async def _run(self, op: str, *args, retryable: bool = True, **kwargs):
+        if self._client is None:
+            raise RuntimeError("FailoverClient is not connected; use 'async with client'")
+        tried: set[str] = set()
+        while True:
+            url = self.url
+            try:
+                return await getattr(self._client, op)(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable_error(e):
+                    raise
+                self.pool.record_failure(url, e)
+                tried.add(url)
+                if not retryable or len(tried) >= len(self.pool.urls):
+                    raise
+                logger.warning("MCP %s failed on %s, failing over: %s", op, url, e)
+                await self._disconnect()
+                await self._connect(exclude=tried)
+
+    def _is_idempotent(self, name: str) -> bool:
+        return name in self.idempotent_tools
+
+    async def list_tools(self):
+        tools = await self._run("list_tools")
+        for t in tools:
+            ann = getattr(t, "annotations", None)
+            if ann is not None and (getattr(ann, "readOnlyHint", None) or getattr(ann, "idempotentHint", None)):
+                self.idempotent_tools.add(t.name)
+        return tools
+
+    async def call_tool(self, name: str, arguments: dict | None = None, **kwargs):
+        return await self._run("call_tool", name, arguments, retryable=self._is_idempotent(name), **kwargs)
+
+    async def list_resources(self):
+        return await self._run("list_resources")
+
+    async def read_resource(self, uri, **kwargs):
+        return await self._run("read_resource", uri, **kwargs)
+
+    async def ping(self) -> bool:
+        return await self._run("ping")
+
+    def is_connected(self) -> bool:
+        return self._client is not None and self._client.is_connected()
@@ -5,12 +5,16 @@ Connects to a remotely hosted MCP server (via URL from mcp_registry or env),
 lists tools/resources, and calls tools so a remote agent can use the server.
 """
 import asyncio
+import hashlib
 import json
 import os
 import sys
 from pathlib import Path
 from typing import Any
 
+from utilities.metrics import phase
+from utilities.tracing import current_traceparent
+
 # Default: mcp_registry/server.json next to the project root (parent of mcp_connector)
 MCP_REGISTRY_DIR = Path(__file__).resolve().parent.parent / "mcp_registry"
 DEFAULT_REGISTRY_FILE = MCP_REGISTRY_DIR / "server.json"
@@ -21,14 +25,15 @@ def load_registry(registry_path: str | Path | None = None) -> dict:
     path = Path(registry_path) if registry_path else DEFAULT_REGISTRY_FILE
     if path.is_dir():
         path = path / "server.json"
-    if not path.exists():
-        return {}
-    return json.loads(path.read_text(encoding="utf-8"))
+    with phase("registry_load"):
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
 
 
 def get_server_url(registry_path: str | Path | None = None) -> str:
     """Server URL: MCP_SERVER_URL env, or from mcp_registry server.json."""
-    url = os.environ.get("MCP_SERVER_URL", "").strip()
+    url = os.environ.get("MCP_SERVER_URL", "").split(",")[0].strip()
     if url:
         return url.rstrip("/") if url.endswith("/") else url
     data = load_registry(registry_path)
@@ -39,6 +44,25 @@ def get_server_url(registry_path: str | Path | None = None) -> str:
     return "http://localhost:8092/mcp"
 
 
+def get_server_urls(registry_path: str | Path | None = None) -> list[str]:
+    """
+    All deployment URLs of the server, in registry order.
+    MCP_SERVER_URL may hold several comma-separated URLs; otherwise every remote
+    deployment in mcp_registry server.json is returned.
+    """
+    env = os.environ.get("MCP_SERVER_URL", "").strip()
+    if env:
+        return [u.strip().rstrip("/") for u in env.split(",") if u.strip()]
+    data = load_registry(registry_path)
+    urls = []
+    for d in data.get("deployments") or []:
+        if d.get("kind") == "remote" and d.get("url"):
+            url = d["url"].rstrip("/")
+            if url not in urls:
+                urls.append(url)
+    return urls or ["http://localhost:8092/mcp"]
+
+
 def _get_server_url() -> str:
     """Backward-compat: same as get_server_url()."""
     return get_server_url()
@@ -65,15 +89,25 @@ async def list_tools(client) -> list:
             "name": t.name,
             "description": (t.description or ""),
             "input_schema": _normalize_input_schema(getattr(t, "inputSchema", None) or getattr(t, "input_schema", None)),
+            "annotations": {
+                k: v for k, v in _normalize_input_schema(getattr(t, "annotations", None)).items() if v is not None
+            },
         }
         for t in tools
     ]
 
 
+def manifest_hash(tools: list) -> str:
+    """Stable hash of a list_tools() manifest (names, descriptions, schemas, annotations)."""
+    canonical = sorted(tools, key=lambda t: t.get("name", ""))
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode()).hexdigest()
+
+
 async def list_tools_from_registry(registry_path: str | Path | None = None) -> list:
     """
     Connect to the MCP server from mcp_registry, list tools, and return them.
-    Returns [] if the server is unavailable or on error.
+    Deployments are tried fastest-healthy first (see failover.py).
+    Returns [] if no deployment is available or on error.
     """
     try:
         client = create_client(registry_path=registry_path)
@@ -89,9 +123,23 @@ async def list_resources(client) -> list:
     return [{"uri": r.uri, "name": getattr(r, "name", r.uri), "description": getattr(r, "description", "")} for r in resources]
 
 
-async def call_tool(client, name: str, arguments: dict) -> dict:
-    """Call a tool by name with the given arguments."""
-    result = await client.call_tool(name, arguments)
+async def call_tool(client, name: str, arguments: dict, input_schema: dict | None = None) -> dict:
+    """
+    Call a tool by name with the given arguments.
+    With input_schema, arguments are validated and coerced locally first (see validation.py);
+    invalid arguments return an isError result without a round trip to the server.
+    """
+    if input_schema:
+        from .validation import ArgumentValidationError, validate_arguments
+        try:
+            arguments = validate_arguments(name, input_schema, arguments)
+        except ArgumentValidationError as e:
+            return {"content": [{"type": "text", "text": str(e)}], "isError": True, "validationError": True}
+    with phase("tool_call"):
+        # Trace context for the MCP server, in the request's _meta
+        traceparent = current_traceparent()
+        kwargs = {"meta": {"traceparent": traceparent}} if traceparent else {}
+        result = await client.call_tool(name, arguments, **kwargs)
     content = getattr(result, "content", result)
     is_error = getattr(result, "is_error", getattr(result, "isError", False))
     return {"content": content, "isError": is_error}
@@ -103,26 +151,55 @@ async def read_resource(client, uri: str) -> dict:
     return {"contents": result.contents if hasattr(result, "contents") else result, "uri": uri}
 
 
+def client_for_url(url: str):
+    """
+    fastmcp Client for one URL. memory://standin connects in-process to the bundled
+    stand-in server (mcp_standin) through fastmcp's in-memory transport.
+    """
+    from fastmcp import Client
+
+    if url.startswith("memory://"):
+        from mcp_standin.server import get_standin_server
+        return Client(get_standin_server())
+    return Client(url)
+
+
 def create_client(url: str | None = None, registry_path: str | Path | None = None):
-    """Create an MCP Client for the given URL (or from registry). Caller must use async with client."""
+    """
+    Create an MCP Client for the given URL (or from registry). Caller must use async with client.
+    Without an explicit URL and with several deployments configured, returns a FailoverClient
+    that routes to the fastest healthy deployment.
+    """
     try:
-        from fastmcp import Client
+        import fastmcp  # noqa: F401
     except ImportError:
         raise ImportError("Install fastmcp: pip install fastmcp") from None
-    url = url or get_server_url(registry_path)
-    return Client(url)
+    if url:
+        return client_for_url(url)
+    urls = get_server_urls(registry_path)
+    if len(urls) > 1:
+        from .failover import FailoverClient, get_deployment_pool
+        return FailoverClient(get_deployment_pool(urls))
+    return client_for_url(urls[0])
 
 
 async def run_connector(url: str, command: str, *args) -> None:
-    """Run connector: list-tools | list-resources | call <name> <json_args> | read-resource <uri>."""
+    """
+    Run connector: list-tools | list-resources | call <name> <json_args> | read-resource <uri>
+    | stream-resource <uri> | bench <tool[:weight],...> [json_args] [options] (see bench.py).
+    """
     try:
-        from fastmcp import Client
+        import fastmcp  # noqa: F401
     except ImportError:
         print("Install fastmcp: pip install fastmcp", file=sys.stderr)
         sys.exit(1)
 
     url = url or get_server_url()
-    client = Client(url)
+    if command == "bench":
+        from .bench import bench_command
+        await bench_command(url, list(args))
+        return
+    client = client_for_url(url)
 
     async with client:
         if command == "list-tools":
@@ -149,9 +226,20 @@ async def run_connector(url: str, command: str, *args) -> None:
             result = await read_resource(client, uri)
             print(json.dumps(result, indent=2))
 
+        elif command == "stream-resource" and len(args) >= 1:
+            from .streaming import stream_resource
+            async for chunk in stream_resource(client, args[0]):
+                if isinstance(chunk, bytes):
+                    sys.stdout.flush()
+                    sys.stdout.buffer.write(chunk)
+                else:
+                    sys.stdout.write(chunk)
+            sys.stdout.flush()
+
         else:
             print(
-                "Usage: mcp_connector list-tools | list-resources | call <tool_name> [json_args] | read-resource <uri>",
+                "Usage: mcp_connector list-tools | list-resources | call <tool_name> [json_args] | read-resource <uri>"
+                " | stream-resource <uri> | bench <tool[:weight],...> [json_args] [--concurrency N] [--duration S]",
                 file=sys.stderr,
             )
             sys.exit(1)
@@ -162,7 +250,11 @@ def main() -> None:
     argv = sys.argv[1:]
     if not argv:
         print(f"Server URL: {url}", file=sys.stderr)
-        print("Usage: mcp_connector list-tools | list-resources | call <name> [json_args] | read-resource <uri>", file=sys.stderr)
+        print(
+            "Usage: mcp_connector list-tools | list-resources | call <name> [json_args] | read-resource <uri>"
+            " | stream-resource <uri> | bench <tool[:weight],...> [json_args] [--concurrency N] [--duration S]",
+            file=sys.stderr,
+        )
         sys.exit(1)
     asyncio.run(run_connector(url, argv[0], *argv[1:]))
 
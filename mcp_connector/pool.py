@@ -0,0 +1,139 @@
+"""
+Pooled MCP sessions.
+
+A PooledSession keeps one connected MCP client open for the life of the process (per
+server / set of deployments) instead of connecting and initializing per request. It
+duck-types the client methods the connector helpers use, so list_tools(session) and
+call_tool(session, ...) work unchanged, reconnects after transport errors, and caches
+the tool manifest for a short TTL.
+"""
+import asyncio
+import contextlib
+import os
+import time
+from pathlib import Path
+
+from .failover import is_retryable_error
+
+# Seconds a cached list_tools() manifest stays fresh.
+MANIFEST_TTL = float(os.environ.get("MCP_MANIFEST_TTL", "30"))
+
+
+class PooledSession:
+    """One long-lived MCP client, connected lazily on the running event loop."""
+
+    def __init__(self, client_factory, manifest_ttl: float = MANIFEST_TTL):
+        self._client_factory = client_factory
+        self.manifest_ttl = manifest_ttl
+        self._client = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._manifest: list | None = None
+        self._manifest_at = 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            # asyncio.Lock binds to the first loop that waits on it; make a fresh one per loop
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    def _is_live(self) -> bool:
+        return (
+            self._client is not None
+            and self._loop is asyncio.get_running_loop()
+            and self._client.is_connected()
+        )
+
+    async def client(self):
+        """The connected client, connecting (or reconnecting) if needed."""
+        if self._is_live():
+            return self._client
+        async with self._get_lock():
+            if self._is_live():
+                return self._client
+            await self._drop()
+            client = self._client_factory()
+            await client.__aenter__()
+            self._client, self._loop = client, asyncio.get_running_loop()
+            return client
+
+    async def _drop(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._loop is asyncio.get_running_loop():
+            with contextlib.suppress(Exception):
+                await client.__aexit__(None, None, None)
+
+    async def _call(self, op: str, *args, **kwargs):
+        client = await self.client()
+        try:
+            return await getattr(client, op)(*args, **kwargs)
+        except Exception as e:
+            if is_retryable_error(e):
+                async with self._get_lock():
+                    if self._client is client:
+                        await self._drop()
+            raise
+
+    async def list_tools(self):
+        return await self._call("list_tools")
+
+    async def call_tool(self, name: str, arguments: dict | None = None, **kwargs):
+        return await self._call("call_tool", name, arguments, **kwargs)
+
+    async def list_resources(self):
+        return await self._call("list_resources")
+
+    async def read_resource(self, uri, **kwargs):
+        return await self._call("read_resource", uri, **kwargs)
+
+    async def ping(self) -> bool:
+        return await self._call("ping")
+
+    def is_connected(self) -> bool:
+        return self._client is not None and self._client.is_connected()
+
+    async def manifest(self, refresh: bool = False) -> list[dict]:
+        """list_tools() as dicts, cached for manifest_ttl seconds."""
+        from .mcp_connector import list_tools
+
+        now = time.monotonic()
+        if refresh or self._manifest is None or now - self._manifest_at > self.manifest_ttl:
+            self._manifest = await list_tools(self)
+            self._manifest_at = now
+        return self._manifest
+
+    async def close(self) -> None:
+        async with self._get_lock():
+            await self._drop()
+        self._manifest = None
+
+    # Entering a pooled session is a no-op: the connection outlives the caller's block.
+    async def __aenter__(self):
+        await self.client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+_sessions: dict[tuple, PooledSession] = {}
+
+
+def get_pooled_session(url: str | None = None, registry_path: str | Path | None = None) -> PooledSession:
+    """Process-wide pooled session for a URL, or for the deployments in mcp_registry."""
+    from .mcp_connector import create_client, get_server_urls
+
+    key = (url,) if url else tuple(get_server_urls(registry_path))
+    session = _sessions.get(key)
+    if session is None:
+        session = _sessions[key] = PooledSession(lambda: create_client(url=url, registry_path=registry_path))
+    return session
+
+
+async def close_pooled_sessions() -> None:
+    """Close every pooled session (call on shutdown)."""
+    for session in list(_sessions.values()):
+        with contextlib.suppress(Exception):
+            await session.close()
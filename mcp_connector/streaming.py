@@ -0,0 +1,190 @@
+"""
+Streaming and spooling of large MCP resources and tool results.
+
+MCP returns a resource or tool result as one JSON-RPC message, so the transport still
+delivers it whole; these helpers avoid the extra copies made after that. Content blocks
+are yielded as bounded chunks instead of being joined into one string, and SpooledContent
+keeps small payloads in memory but spills past a size threshold to a temporary file that
+is read back through mmap. Consumers that only want text (an LLM prompt) get a placeholder
+such as "[image/png, 48213 bytes]" for binary blocks instead of undecodable bytes.
+"""
+import base64
+import io
+import mmap
+import os
+import tempfile
+from collections.abc import AsyncIterator, Iterable, Iterator
+
+# Chunk size for streamed content, and the size past which SpooledContent spills to disk.
+DEFAULT_CHUNK_SIZE = int(os.environ.get("MCP_STREAM_CHUNK_SIZE", str(64 * 1024)))
+SPOOL_THRESHOLD = int(os.environ.get("MCP_SPOOL_THRESHOLD", str(1024 * 1024)))
+
+
+def _binary_placeholder(mime_type: str | None, size: int) -> str:
+    return f"[{mime_type or 'binary'}, {size} bytes]"
+
+
+def _block_payload(block, binary: bool = True) -> str | bytes:
+    """
+    Text (str) or binary (bytes) payload of one MCP content block (object or dict); with
+    binary=False, a placeholder naming the MIME type and size instead of the bytes.
+    """
+    get = block.get if isinstance(block, dict) else lambda k, d=None: getattr(block, k, d)
+    text = get("text")
+    if text is not None:
+        return text
+    blob = get("blob") or get("data")
+    if blob is not None:
+        if binary:
+            return base64.b64decode(blob) if isinstance(blob, str) else blob
+        # Decoded size, without decoding
+        size = len(blob) * 3 // 4 - blob[-2:].count("=") if isinstance(blob, str) else len(blob)
+        return _binary_placeholder(get("mimeType") or get("mime_type"), size)
+    resource = get("resource")
+    if resource is not None:  # embedded resource block: its text or blob
+        return _block_payload(resource, binary)
+    return str(block)
+
+
+def iter_content_chunks(
+    content, chunk_size: int = DEFAULT_CHUNK_SIZE, binary: bool = True
+) -> Iterator[str | bytes]:
+    """
+    Yield a tool result's content or a resource's contents as chunks of at most chunk_size
+    characters (text) or bytes (binary). Consecutive blocks are separated by a newline chunk.
+    binary=False replaces binary blocks (image, audio, blob) with a placeholder text chunk.
+    """
+    if content is None:
+        return
+    blocks: Iterable = [content] if isinstance(content, (str, bytes)) or not isinstance(content, list) else content
+    first = True
+    for block in blocks:
+        if isinstance(block, str):
+            payload = block
+        elif isinstance(block, bytes):
+            payload = block if binary else _binary_placeholder(None, len(block))
+        else:
+            payload = _block_payload(block, binary)
+        if not first:
+            yield "\n"
+        first = False
+        for i in range(0, len(payload), chunk_size):
+            yield payload[i:i + chunk_size]
+
+
+async def stream_resource(client, uri: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[str | bytes]:
+    """Read a resource and yield its contents chunk by chunk."""
+    result = await client.read_resource(uri)
+    contents = result.contents if hasattr(result, "contents") else result
+    del result
+    for chunk in iter_content_chunks(contents, chunk_size):
+        yield chunk
+
+
+async def stream_tool_result(
+    client, name: str, arguments: dict, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[str | bytes]:
+    """Call a tool and yield its result content chunk by chunk."""
+    result = await client.call_tool(name, arguments)
+    content = getattr(result, "content", result)
+    del result
+    for chunk in iter_content_chunks(content, chunk_size):
+        yield chunk
+
+
+class SpooledContent:
+    """
+    Byte buffer that stays in memory up to `threshold` bytes, then moves to a temporary
+    file. Reads of a spilled buffer go through mmap, so slicing head/tail of a large
+    payload does not load the whole file.
+    """
+
+    def __init__(self, threshold: int = SPOOL_THRESHOLD):
+        self.threshold = threshold
+        self.size = 0
+        self._buffer: io.BytesIO | None = io.BytesIO()
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def write(self, chunk: str | bytes) -> None:
+        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        if not data:
+            return
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is None and self.size + len(data) > self.threshold:
+            self._file = tempfile.TemporaryFile(prefix="mcp-spool-")
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+        (self._file or self._buffer).write(data)
+        self.size += len(data)
+
+    def _view(self):
+        if self._file is None:
+            return self._buffer.getbuffer()
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def read(self, start: int = 0, length: int | None = None) -> bytes:
+        """Return bytes [start, start+length) (to the end when length is None)."""
+        if self.size == 0:
+            return b""
+        end = self.size if length is None else min(self.size, start + length)
+        view = self._view()
+        try:
+            return bytes(view[start:end])
+        finally:
+            if isinstance(view, memoryview):
+                view.release()
+
+    def text(self, start: int = 0, length: int | None = None) -> str:
+        return self.read(start, length).decode("utf-8", errors="ignore")
+
+    def preview(self, max_bytes: int) -> str:
+        """Whole text if it fits in max_bytes, else head and tail around a truncation note."""
+        if self.size <= max_bytes:
+            return self.text()
+        half = max_bytes // 2
+        head = self.text(0, half)
+        tail = self.text(self.size - half)
+        omitted = self.size - 2 * half
+        return f"{head}\n...[truncated {omitted} of {self.size} bytes]...\n{tail}"
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+async def spool(chunks: AsyncIterator[str | bytes] | Iterable[str | bytes], threshold: int = SPOOL_THRESHOLD) -> SpooledContent:
+    """Drain a chunk stream into a SpooledContent."""
+    spooled = SpooledContent(threshold)
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            spooled.write(chunk)
+    else:
+        for chunk in chunks:
+            spooled.write(chunk)
+    return spooled
+
+
+async def spool_resource(client, uri: str, threshold: int = SPOOL_THRESHOLD) -> SpooledContent:
+    """Read a resource into a SpooledContent (in memory below threshold, temp file above)."""
+    return await spool(stream_resource(client, uri), threshold)
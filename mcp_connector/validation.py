@@ -0,0 +1,280 @@
+"""
+Local validation of tool arguments against the tool's input_schema.
+
+Each JSON Schema is compiled once into a tree of small checker functions and cached by
+schema hash, so a malformed call from the LLM is rejected (and mildly coerced, e.g. "3"
+to 3 for an integer) before any round trip to the MCP server. Covers the JSON Schema
+subset MCP tools use: type (incl. type lists), properties/required/additionalProperties,
+items, enum/const, numeric and length bounds, pattern, anyOf/oneOf/allOf and local $ref.
+"""
+import hashlib
+import json
+import math
+import re
+from collections.abc import Callable
+from typing import Any
+
+_MISSING = object()
+
+
+class ArgumentValidationError(ValueError):
+    """Arguments do not match the tool's input_schema."""
+
+    def __init__(self, tool: str, errors: list[str]):
+        self.tool = tool
+        self.errors = errors
+        super().__init__(f"Invalid arguments for tool {tool!r}: " + "; ".join(errors))
+
+
+# Counters since process start; "rejected" is the number of MCP round trips avoided, so it only
+# counts validate_arguments() (the check before a tool call: call_tool's and the MCP agent's
+# tools), not other callers such as the fast path.
+_stats = {"validated": 0, "rejected": 0, "coerced": 0}
+
+
+def get_validation_stats() -> dict:
+    return dict(_stats)
+
+
+def schema_hash(schema: dict) -> str:
+    return hashlib.sha256(json.dumps(schema or {}, sort_keys=True, default=str).encode()).hexdigest()
+
+
+Checker = Callable[[Any, str, list], Any]
+
+
+def _coerce(value: Any, t: str) -> Any:
+    """Value converted to JSON type t, or _MISSING if it does not fit (bool is never a number)."""
+    if t == "string":
+        return value if isinstance(value, str) else _MISSING
+    if t == "integer":
+        if isinstance(value, bool):
+            return _MISSING
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                return _MISSING
+        return _MISSING
+    if t == "number":
+        if isinstance(value, bool):
+            return _MISSING
+        if isinstance(value, (int, float)):
+            return value
+        if isinstance(value, str):
+            try:
+                f = float(value.strip())
+            except ValueError:
+                return _MISSING
+            return f if math.isfinite(f) else _MISSING
+        return _MISSING
+    if t == "boolean":
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        return _MISSING
+    if t == "array":
+        return value if isinstance(value, list) else _MISSING
+    if t == "object":
+        return value if isinstance(value, dict) else _MISSING
+    if t == "null":
+        return None if value is None else _MISSING
+    return value
+
+
+def _compile(schema: Any, root: dict) -> Checker:
+    if schema is True or not isinstance(schema, dict) or not schema:
+        return lambda v, path, errors: v
+    if schema is False:
+        def never(v, path, errors):
+            errors.append(f"{path or 'value'}: not allowed")
+            return v
+        return never
+
+    ref = schema.get("$ref")
+    if isinstance(ref, str) and ref.startswith("#/"):
+        target: Any = root
+        for part in ref[2:].split("/"):
+            target = target.get(part, {}) if isinstance(target, dict) else {}
+        merged = {**target, **{k: v for k, v in schema.items() if k != "$ref"}}
+        return _compile(merged, root)
+
+    checks: list[Checker] = []
+
+    types = schema.get("type")
+    if types is not None:
+        type_list = types if isinstance(types, list) else [types]
+
+        def check_type(v, path, errors, type_list=type_list):
+            for t in type_list:
+                out = _coerce(v, t)
+                if out is not _MISSING:
+                    if out is not v and type(out) is not type(v):
+                        _stats["coerced"] += 1
+                    return out
+            errors.append(f"{path or 'value'}: expected {' or '.join(type_list)}, got {type(v).__name__}")
+            return v
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(v, path, errors):
+            if v not in allowed:
+                errors.append(f"{path or 'value'}: must be one of {allowed}")
+            return v
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(v, path, errors):
+            if v != const:
+                errors.append(f"{path or 'value'}: must be {const!r}")
+            return v
+        checks.append(check_const)
+
+    bounds = [(k, schema[k]) for k in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum") if k in schema]
+    if bounds:
+        def check_bounds(v, path, errors):
+            if isinstance(v, bool) or not isinstance(v, (int, float)):
+                return v
+            for k, b in bounds:
+                if (
+                    (k == "minimum" and v < b) or (k == "maximum" and v > b)
+                    or (k == "exclusiveMinimum" and v <= b) or (k == "exclusiveMaximum" and v >= b)
+                ):
+                    errors.append(f"{path or 'value'}: violates {k} {b}")
+            return v
+        checks.append(check_bounds)
+
+    min_len, max_len = schema.get("minLength"), schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if isinstance(schema.get("pattern"), str) else None
+    if min_len is not None or max_len is not None or pattern is not None:
+        def check_string(v, path, errors):
+            if not isinstance(v, str):
+                return v
+            if min_len is not None and len(v) < min_len:
+                errors.append(f"{path or 'value'}: shorter than {min_len}")
+            if max_len is not None and len(v) > max_len:
+                errors.append(f"{path or 'value'}: longer than {max_len}")
+            if pattern is not None and not pattern.search(v):
+                errors.append(f"{path or 'value'}: does not match {pattern.pattern!r}")
+            return v
+        checks.append(check_string)
+
+    if "items" in schema or "minItems" in schema or "maxItems" in schema:
+        item_check = _compile(schema.get("items", {}), root)
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+
+        def check_array(v, path, errors):
+            if not isinstance(v, list):
+                return v
+            if min_items is not None and len(v) < min_items:
+                errors.append(f"{path or 'value'}: fewer than {min_items} items")
+            if max_items is not None and len(v) > max_items:
+                errors.append(f"{path or 'value'}: more than {max_items} items")
+            return [item_check(item, f"{path}[{i}]", errors) for i, item in enumerate(v)]
+        checks.append(check_array)
+
+    if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+        props = {name: _compile(sub, root) for name, sub in (schema.get("properties") or {}).items()}
+        required = list(schema.get("required") or [])
+        additional = schema.get("additionalProperties", True)
+        extra_check = _compile(additional, root) if isinstance(additional, dict) else None
+
+        def check_object(v, path, errors):
+            if not isinstance(v, dict):
+                return v
+            out = {}
+            for name in required:
+                if name not in v:
+                    errors.append(f"{path + '.' if path else ''}{name}: required")
+            for name, value in v.items():
+                sub_path = f"{path}.{name}" if path else name
+                if name in props:
+                    out[name] = props[name](value, sub_path, errors)
+                elif additional is False:
+                    errors.append(f"{sub_path}: unexpected property")
+                else:
+                    out[name] = extra_check(value, sub_path, errors) if extra_check else value
+            return out
+        checks.append(check_object)
+
+    for key in ("anyOf", "oneOf"):
+        if isinstance(schema.get(key), list):
+            options = [_compile(sub, root) for sub in schema[key]]
+
+            def check_any(v, path, errors, options=options, key=key):
+                first_errors = None
+                for option in options:
+                    option_errors: list[str] = []
+                    out = option(v, path, option_errors)
+                    if not option_errors:
+                        return out
+                    first_errors = first_errors or option_errors
+                errors.append(f"{path or 'value'}: matches none of {key} ({'; '.join(first_errors or [])})")
+                return v
+            checks.append(check_any)
+
+    if isinstance(schema.get("allOf"), list):
+        all_checks = [_compile(sub, root) for sub in schema["allOf"]]
+
+        def check_all(v, path, errors):
+            for c in all_checks:
+                v = c(v, path, errors)
+            return v
+        checks.append(check_all)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def run_all(v, path, errors):
+        for c in checks:
+            v = c(v, path, errors)
+        return v
+    return run_all
+
+
+class CompiledValidator:
+    """Validates and coerces one tool's arguments; compiled once from its input_schema."""
+
+    def __init__(self, tool: str, schema: dict):
+        self.tool = tool
+        self.schema = schema or {}
+        self._check = _compile(self.schema, self.schema)
+
+    def __call__(self, arguments: dict | None) -> dict:
+        """Return the coerced arguments, or raise ArgumentValidationError."""
+        _stats["validated"] += 1
+        errors: list[str] = []
+        out = self._check(arguments if arguments is not None else {}, "", errors)
+        if errors:
+            raise ArgumentValidationError(self.tool, errors)
+        return out
+
+
+_validators: dict[tuple[str, str], CompiledValidator] = {}
+
+
+def get_validator(tool: str, schema: dict | None) -> CompiledValidator:
+    """Compiled validator for (tool, schema), cached by schema hash."""
+    key = (tool, schema_hash(schema or {}))
+    validator = _validators.get(key)
+    if validator is None:
+        validator = _validators[key] = CompiledValidator(tool, schema or {})
+    return validator
+
+
+def validate_arguments(tool: str, schema: dict | None, arguments: dict | None) -> dict:
+    """Check and coerce arguments against schema before a tool call; raise ArgumentValidationError on mismatch."""
+    try:
+        return get_validator(tool, schema)(arguments)
+    except ArgumentValidationError:
+        _stats["rejected"] += 1
+        raise
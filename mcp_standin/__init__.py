@@ -0,0 +1 @@
+# In-process MCP stand-in server (FastMCP) for tests, CI and benchmarks
@@ -0,0 +1,25 @@
+"""
+Run the MCP stand-in server over HTTP (streamable-http at /mcp). Default port 8092,
+matching mcp_registry/server.json.
+"""
+import argparse
+
+from mcp_standin.server import StandinConfig, build_server
+
+
+def main() -> None:
+    env = StandinConfig.from_env()
+    parser = argparse.ArgumentParser(prog="mcp_standin", description="Stand-in MCP server for tests and benchmarks.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--latency-ms", type=float, default=env.latency_ms, help="Injected latency per tool call")
+    parser.add_argument("--jitter-ms", type=float, default=env.jitter_ms, help="Extra uniform random latency")
+    parser.add_argument("--error-rate", type=float, default=env.error_rate, help="Fraction of tool calls that fail")
+    parser.add_argument("--seed", type=int, default=env.seed)
+    opts = parser.parse_args()
+    config = StandinConfig(opts.latency_ms, opts.jitter_ms, opts.error_rate, opts.seed)
+    build_server(config).run(transport="http", host=opts.host, port=opts.port, path="/mcp", show_banner=False)
+
+
+if __name__ == "__main__":
+    main()
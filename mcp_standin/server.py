@@ -0,0 +1,125 @@
+"""
+FastMCP stand-in for the Step-by-Step MCP server.
+
+Implements the same tools (add, greet, echo, just_fun_random) and an info resource, with
+optional injected latency and error rate, so the connector, the MCP agent, the host and
+the portfolio agent can run without an external MCP server:
+
+- over HTTP:   python -m mcp_standin --port 8092 --latency-ms 20 --error-rate 0.01
+- in memory:   MCP_SERVER_URL=memory://standin (mcp_connector.create_client hands the
+               FastMCP instance straight to fastmcp.Client, no network involved)
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+from dataclasses import dataclass
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware
+
+from utilities.tracing import extract, span
+
+MEMORY_URL = "memory://standin"
+
+# Tools are pure, so retries (see mcp_connector.failover) are safe.
+_READ_ONLY = {"readOnlyHint": True, "idempotentHint": True}
+
+
+class TracingMiddleware(Middleware):
+    """Runs each tool call as an mcp.tool span continuing the caller's trace (traceparent in _meta)."""
+
+    async def on_call_tool(self, context, call_next):
+        request = context.fastmcp_context.request_context if context.fastmcp_context else None
+        meta = request.meta if request is not None else None
+        # Over memory:// the server shares the client's context; parent on _meta only
+        with span("mcp.tool", remote_parent=extract(meta), inherit=False, tool=context.message.name):
+            return await call_next(context)
+
+
+@dataclass
+class StandinConfig:
+    """Injected behaviour: per-call latency (uniform in [latency_ms, latency_ms + jitter_ms]) and error rate."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "StandinConfig":
+        seed = os.getenv("MCP_STANDIN_SEED")
+        return cls(
+            latency_ms=float(os.getenv("MCP_STANDIN_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("MCP_STANDIN_JITTER_MS", "0")),
+            error_rate=float(os.getenv("MCP_STANDIN_ERROR_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+
+def build_server(config: StandinConfig | None = None) -> FastMCP:
+    """Create a stand-in FastMCP server with the given injected latency and errors."""
+    config = config or StandinConfig.from_env()
+    rng = random.Random(config.seed)
+    mcp = FastMCP("step-by-step-mcp-standin", middleware=[TracingMiddleware()])
+
+    async def _inject() -> None:
+        delay = config.latency_ms + (rng.uniform(0, config.jitter_ms) if config.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            raise ToolError("Injected stand-in failure")
+
+    @mcp.tool(annotations=_READ_ONLY)
+    async def add(a: int, b: int) -> int:
+        """Add two integers."""
+        await _inject()
+        return a + b
+
+    @mcp.tool(annotations=_READ_ONLY)
+    async def greet(name: str, title: str | None = None) -> str:
+        """Greeting with optional title."""
+        await _inject()
+        return f"Hello, {title} {name}!" if title else f"Hello, {name}!"
+
+    @mcp.tool(annotations=_READ_ONLY)
+    async def echo(message: str, repeat: int = 1) -> str:
+        """Echo a message (optional repeat)."""
+        await _inject()
+        return " ".join([message] * max(1, repeat))
+
+    @mcp.tool(annotations=_READ_ONLY)
+    async def just_fun_random(a: int, b: int) -> int:
+        """Generate a random number between a and b (inclusive)."""
+        await _inject()
+        lo, hi = sorted((a, b))
+        return rng.randint(lo, hi)
+
+    @mcp.resource("resource://server/info", mime_type="application/json")
+    def server_info() -> str:
+        """Information about this server."""
+        return json.dumps({
+            "name": "step-by-step-mcp-standin",
+            "tools": ["add", "greet", "echo", "just_fun_random"],
+            "latency_ms": config.latency_ms,
+            "jitter_ms": config.jitter_ms,
+            "error_rate": config.error_rate,
+        })
+
+    if config.error_rate:
+        # FastMCP logs a full traceback for every failed tool call; injected failures are expected.
+        logging.getLogger("fastmcp.server.server").setLevel(logging.CRITICAL)
+    return mcp
+
+
+_server: FastMCP | None = None
+
+
+def get_standin_server() -> FastMCP:
+    """Process-wide stand-in used by the memory:// transport (configured from MCP_STANDIN_* env)."""
+    global _server
+    if _server is None:
+        _server = build_server()
+    return _server
@@ -0,0 +1 @@
+# Local webhook receiver stand-in for A2A push notifications (tests and benchmarks)
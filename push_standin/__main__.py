@@ -0,0 +1,26 @@
+"""
+Run the push-notification receiver stand-in over HTTP. Default port 9000.
+"""
+import argparse
+
+import uvicorn
+
+from push_standin.server import ReceiverConfig, build_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="push_standin", description="Stand-in webhook receiver for A2A push notifications.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--secret", default=None, help="Reject POSTs without a valid X-A2A-Signature")
+    parser.add_argument("--token", default=None, help="Reject POSTs without this X-A2A-Notification-Token")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per POST")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of POSTs answered with 503")
+    parser.add_argument("--seed", type=int, default=None)
+    opts = parser.parse_args()
+    config = ReceiverConfig(opts.secret, opts.token, opts.latency_ms, opts.error_rate, opts.seed)
+    uvicorn.run(build_app(config), host=opts.host, port=opts.port)
+
+
+if __name__ == "__main__":
+    main()
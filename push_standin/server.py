@@ -0,0 +1,98 @@
+"""
+Stand-in webhook receiver for A2A push notifications.
+
+Accepts POSTs on any path, checks the signature (utilities.push_notifications.verify_signature)
+when given a secret and the token when given one, and records each notification. Injected latency
+and error rate (503 responses) exercise the sender's retries:
+
+- over HTTP:   python -m push_standin --port 9000 [--secret s3cret] [--error-rate 0.2]
+- in process:  httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app(...))) as the
+               QueuedPushNotificationSender's httpx_client
+
+GET /notifications lists what was received (?task_id= filters), DELETE /notifications clears it.
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from utilities.push_notifications import SIGNATURE_HEADER, TOKEN_HEADER, verify_signature
+
+
+@dataclass
+class ReceiverConfig:
+    secret: str | None = None
+    token: str | None = None
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class Receiver:
+    """Notifications received so far, plus counts of rejected and failed POSTs."""
+
+    config: ReceiverConfig
+    notifications: list[dict] = field(default_factory=list)
+    rejected: int = 0
+    injected_failures: int = 0
+
+    def for_task(self, task_id: str) -> list[dict]:
+        return [n for n in self.notifications if n["task_id"] == task_id]
+
+
+def build_app(config: ReceiverConfig | None = None) -> Starlette:
+    """Starlette app of the receiver; the Receiver is on app.state.receiver."""
+    config = config or ReceiverConfig()
+    receiver = Receiver(config)
+    rng = random.Random(config.seed)
+
+    async def webhook(request: Request) -> Response:
+        body = await request.body()
+        if config.latency_ms:
+            await asyncio.sleep(config.latency_ms / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            receiver.injected_failures += 1
+            return Response("Injected stand-in failure", status_code=503)
+        if config.secret and not verify_signature(config.secret, body, request.headers.get(SIGNATURE_HEADER)):
+            receiver.rejected += 1
+            return Response("Bad signature", status_code=401)
+        if config.token and request.headers.get(TOKEN_HEADER) != config.token:
+            receiver.rejected += 1
+            return Response("Bad token", status_code=401)
+        task = json.loads(body)
+        receiver.notifications.append({
+            "received": time.time(),
+            "path": request.url.path,
+            "task_id": task.get("id"),
+            "state": task.get("status", {}).get("state"),
+            "task": task,
+        })
+        return Response(status_code=204)
+
+    async def list_notifications(request: Request) -> Response:
+        task_id = request.query_params.get("task_id")
+        items = receiver.for_task(task_id) if task_id else receiver.notifications
+        return JSONResponse({
+            "notifications": items,
+            "rejected": receiver.rejected,
+            "injected_failures": receiver.injected_failures,
+        })
+
+    async def clear_notifications(request: Request) -> Response:
+        receiver.notifications.clear()
+        return Response(status_code=204)
+
+    app = Starlette(routes=[
+        Route("/notifications", list_notifications, methods=["GET"]),
+        Route("/notifications", clear_notifications, methods=["DELETE"]),
+        Route("/{path:path}", webhook, methods=["POST"]),
+    ])
+    app.state.receiver = receiver
+    return app
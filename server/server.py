@@ -16,14 +16,14 @@
 
 # 🌐 Starlette is a lightweight web framework for building ASGI applications
 from starlette.applications import Starlette            # To create our web app
-from starlette.responses import JSONResponse            # To send responses as JSON
+from starlette.responses import JSONResponse, Response  # To send responses as JSON (or raw bytes)
 from starlette.requests import Request                  # Represents incoming HTTP requests
 
 # 📦 Importing our custom models and logic
 from models.agent import AgentCard                      # Describes the agent's identity and skills
 from models.request import A2ARequest, SendTaskRequest  # Request models for tasks
 from models.json_rpc import JSONRPCResponse, InternalError  # JSON-RPC utilities for structured messaging
-from agents.portfolio import task_manager              # Our actual task handling logic (Gemini agent)
+from server.task_manager import TaskManager             # Interface of the task handling logic (the agent)
 
 # 🛠️ General utilities
 import json                                              # Used for printing the request payloads (for debugging)
@@ -33,8 +33,12 @@ logger = logging.getLogger(__name__)                     # Setup logger for this
 # 🕒 datetime import for serialization
 from datetime import datetime
 
-# 📦 Encoder to help convert complex data like datetime into JSON
-from fastapi.encoders import jsonable_encoder
+# 🪪 Precomputed agent card bytes with ETag / 304 support
+from utilities.card_cache import CardCache
+# 📊 Per-phase latency metrics, served at /metrics
+from utilities.metrics import metrics_endpoint, phase
+# 🧵 Distributed tracing: continue the caller's trace from the traceparent header
+from utilities.tracing import extract, span
 
 
 # -----------------------------------------------------------------------------
@@ -54,7 +58,7 @@ def json_serializer(obj):
 # 🚀 A2AServer Class: The Core Server Logic
 # -----------------------------------------------------------------------------
 class A2AServer:
-    def __init__(self, host="0.0.0.0", port=5000, agent_card: AgentCard = None, task_manager: task_manager = None):
+    def __init__(self, host="0.0.0.0", port=5000, agent_card: AgentCard = None, task_manager: TaskManager = None):
         """
         🔧 Constructor for our A2AServer
 
@@ -68,6 +72,7 @@ class A2AServer:
         self.port = port
         self.agent_card = agent_card
         self.task_manager = task_manager
+        self.card_cache = CardCache(exclude_none=True)  # 🪪 Card JSON is built once, not per GET
 
         # 🌐 Starlette app initialization
         self.app = Starlette()
@@ -78,6 +83,9 @@ class A2AServer:
         # 🔎 Register a route for agent discovery (metadata as JSON)
         self.app.add_route("/.well-known/agent.json", self._get_agent_card, methods=["GET"])
 
+        # 📊 Register a route for Prometheus metrics (per-phase latency histograms)
+        self.app.add_route("/metrics", metrics_endpoint, methods=["GET"])
+
     # -----------------------------------------------------------------------------
     # ▶️ start(): Launch the web server using uvicorn
     # -----------------------------------------------------------------------------
@@ -96,14 +104,17 @@ class A2AServer:
     # -----------------------------------------------------------------------------
     # 🔎 _get_agent_card(): Return the agent’s metadata (GET request)
     # -----------------------------------------------------------------------------
-    def _get_agent_card(self, request: Request) -> JSONResponse:
+    async def _get_agent_card(self, request: Request) -> Response:
         """
         Endpoint for agent discovery (GET /.well-known/agent.json)
 
+        The card JSON is serialized once (again only if agent_card is replaced) and sent with an
+        ETag and Cache-Control; a conditional GET with a matching If-None-Match gets a 304.
+
         Returns:
-            JSONResponse: Agent metadata as a dictionary
+            Response: Agent metadata as JSON
         """
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+        return self.card_cache.response(self.agent_card, request)
 
     # -----------------------------------------------------------------------------
     # 📥 _handle_request(): Handle incoming POST requests for tasks
@@ -116,6 +127,19 @@ class A2AServer:
         - Validates the JSON-RPC message
         - For supported task types, delegates to the task manager
         - Returns a response or error
+
+        The whole request is timed as the "request" phase (see utilities.metrics), which is also
+        the span continuing the caller's trace when tracing is on.
+        """
+        with phase("request", remote_parent=extract(request.headers)):
+            return await self._process_request(request)
+
+    # -----------------------------------------------------------------------------
+    # ⚙️ _process_request(): Parse, validate and dispatch one JSON-RPC request
+    # -----------------------------------------------------------------------------
+    async def _process_request(self, request: Request):
+        """
+        Body of _handle_request(): returns the JSON-RPC response or error response.
         """
         try:
             # Step 1: Parse incoming JSON body
@@ -127,7 +151,10 @@ class A2AServer:
 
             # Step 3: If it’s a send-task request, call the task manager to handle it
             if isinstance(json_rpc, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc)
+                # 🧵 Task manager span (the task metadata carries the traceparent too)
+                name = f"{type(self.task_manager).__name__}.on_send_task"
+                with span(name, remote_parent=extract(json_rpc.params.metadata), task_id=json_rpc.params.id):
+                    result = await self.task_manager.on_send_task(json_rpc)
             else:
                 raise ValueError(f"Unsupported A2A method: {type(json_rpc)}")
 
@@ -156,7 +183,8 @@ class A2AServer:
             JSONResponse: Starlette-compatible HTTP response with JSON body
         """
         if isinstance(result, JSONRPCResponse):
-            # jsonable_encoder automatically handles datetime and UUID
-            return JSONResponse(content=jsonable_encoder(result.model_dump(exclude_none=True)))
+            # mode="json" turns datetime and UUID into strings (no fastapi import needed for that)
+            with phase("serialization"):
+                return JSONResponse(content=result.model_dump(mode="json", exclude_none=True))
         else:
             raise ValueError("Invalid response type")
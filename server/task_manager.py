@@ -38,6 +38,9 @@ from models.task import (
     TaskStatus, TaskState, Message          # Task metadata and history objects
 )
 
+# 🧹 Bounded task dict: evicts finished tasks by LRU / TTL (limits from A2A_TASK_* env vars)
+from utilities.task_store import BoundedTaskMap
+
 
 # -----------------------------------------------------------------------------
 # 🧩 TaskManager (Abstract Base Class)
@@ -79,10 +82,15 @@ class InMemoryTaskManager(TaskManager):
     - Single-session interactions
 
     ❗ Not for production: Data is lost when the app stops or restarts.
+
+    🧹 Memory stays bounded: finished tasks are evicted (least recently used first, or once
+    unused for A2A_TASK_TTL seconds) when there are more than A2A_TASK_MAX_TASKS of them or they
+    take more than A2A_TASK_MAX_BYTES. Tasks still in progress are never evicted.
     """
 
     def __init__(self):
-        self.tasks: Dict[str, Task] = {}   # 🗃️ Dictionary where key = task ID, value = Task object
+        # 🗃️ Bounded dictionary where key = task ID, value = Task object
+        self.tasks: Dict[str, Task] = BoundedTaskMap(type(self).__name__)
         self.lock = asyncio.Lock()         # 🔐 Async lock to ensure two requests don't modify data at the same time
 
     # -------------------------------------------------------------------------
@@ -112,6 +120,7 @@ class InMemoryTaskManager(TaskManager):
             else:
                 # If task exists, add the new message to its history
                 task.history.append(params.message)
+                self.tasks[params.id] = task  # Store again so its size is re-measured
 
             return task
 
@@ -0,0 +1,28 @@
+"""Startup import-time budgets (benchmarks/startup.py --check)."""
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.startup import ENTRY_POINTS, _missing_optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_only_missing_optional_packages_are_skipped():
+    entry = next(e for e in ENTRY_POINTS if e.module == "agents.host_agent.entry")
+    assert _missing_optional(entry, "ModuleNotFoundError: No module named 'google.adk'") == "google.adk"
+    assert _missing_optional(entry, "ModuleNotFoundError: No module named 'google'") == "google"
+    assert _missing_optional(entry, "ModuleNotFoundError: No module named 'langgraph'") is None
+    assert _missing_optional(entry, "ImportError: cannot import name 'Runner' from 'google.adk.runners'") is None
+    agent = next(e for e in ENTRY_POINTS if e.module == "agent.__main__")
+    assert _missing_optional(agent, "ModuleNotFoundError: No module named 'google.adk'") is None
+
+
+def test_entry_points_within_startup_budget():
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--runs", "3", "--check"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
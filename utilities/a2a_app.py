@@ -0,0 +1,94 @@
+"""
+A2AStarletteApplication with the shared server extras of this repo: GET /metrics (see
+utilities.metrics), request / serialization phase timings, traceparent propagation (see
+utilities.tracing), a precomputed agent card with ETag / 304 support (see
+utilities.card_cache), a warm-up run at startup with GET /ready (see utilities.warmup) and a
+drain on shutdown (see utilities.shutdown). Used by the host, agent and mcp_agent servers in
+place of A2AStarletteApplication.
+"""
+import contextlib
+import logging
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH
+from a2a.utils.helpers import maybe_await
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from utilities.card_cache import CardCache
+from utilities.metrics import metrics_endpoint, phase
+from utilities.shutdown import Drain
+from utilities.tracing import extract
+from utilities.warmup import WARMUP_PROMPT, Step, Warmup, synthetic_request_step
+
+logger = logging.getLogger(__name__)
+
+
+class A2AApplication(A2AStarletteApplication):
+    def __init__(self, *args, warmup: list[Step] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.card_cache = CardCache()
+        steps = list(warmup or [])
+        if WARMUP_PROMPT:
+            steps.append(synthetic_request_step(self.handler, WARMUP_PROMPT))
+        self.warmup = Warmup(steps)
+        self.drain = Drain(self.handler.request_handler)
+
+    def routes(self, *args, **kwargs) -> list[Route]:
+        return [
+            *super().routes(*args, **kwargs),
+            Route("/metrics", metrics_endpoint, methods=["GET"], name="metrics"),
+            Route("/ready", self._handle_ready, methods=["GET"], name="ready"),
+        ]
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        # Serve (with /ready at 503) while warming up, so health checks see the instance
+        self.warmup.start()
+        try:
+            yield
+        finally:
+            await self.warmup.stop()
+            await self.drain.shutdown()
+
+    async def _handle_ready(self, request):
+        if self.drain.draining:
+            return JSONResponse({"status": "draining"}, status_code=503)
+        return await self.warmup.endpoint(request)
+
+    def build(self, *args, **kwargs):
+        kwargs.setdefault("lifespan", self.lifespan)
+        return super().build(*args, **kwargs)
+
+    async def _handle_requests(self, request):
+        if self.drain.draining:
+            # New tasks go to another instance; the rest (tasks/get, cancel, ...) is still served
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict) and body.get("method") in ("message/send", "message/stream"):
+                error = {"code": -32603, "message": "Server is shutting down"}
+                return JSONResponse({"jsonrpc": "2.0", "id": body.get("id"), "error": error}, status_code=503)
+        # For message/stream this covers the request up to the start of the event stream. The span
+        # continues the caller's trace (traceparent header); the executor's spans nest under it.
+        with phase("request", remote_parent=extract(request.headers)):
+            return await super()._handle_requests(request)
+
+    async def _handle_get_agent_card(self, request):
+        if request.url.path == PREV_AGENT_CARD_WELL_KNOWN_PATH:
+            logger.warning(
+                "Deprecated agent card endpoint '%s' accessed. Please use '%s' instead. "
+                "This endpoint will be removed in a future version.",
+                PREV_AGENT_CARD_WELL_KNOWN_PATH,
+                AGENT_CARD_WELL_KNOWN_PATH,
+            )
+        # Serialized once per card object; a card_modifier returning the same object stays cached
+        card = self.agent_card
+        if self.card_modifier:
+            card = await maybe_await(self.card_modifier(card))
+        return self.card_cache.response(card, request)
+
+    def _create_response(self, context, handler_result):
+        with phase("serialization"):
+            return super()._create_response(context, handler_result)
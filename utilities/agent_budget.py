@@ -0,0 +1,195 @@
+"""
+Step, tool-call and wall-clock budgets for the LangGraph ReAct loops.
+
+run_budgeted() wraps stream_graph() for one request. It counts model calls (steps) and the tool
+calls they ask for, and stops the run before the tools of a step run when that step is the
+AGENT_MAX_STEPS-th one or brings the request over AGENT_MAX_TOOL_CALLS, or as soon as
+AGENT_MAX_SECONDS have passed (0 disables a limit). The final event then carries the best partial
+answer (the last text the model wrote, else the last tool result) and a BudgetReport naming the
+budget that ran out; stream_to_queue completes the task with that status.
+
+Every graph run is recorded: step_stats() returns totals and the AGENT_BUDGET_TOP_N most expensive
+prompts, the totals are also on /metrics, and each run is logged (at WARNING when it ran out
+of budget).
+"""
+import asyncio
+import heapq
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from utilities.graph_streaming import GraphEvent, _message_text, stream_graph
+from utilities.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+MAX_STEPS = int(os.getenv("AGENT_MAX_STEPS", "10"))
+MAX_TOOL_CALLS = int(os.getenv("AGENT_MAX_TOOL_CALLS", "20"))
+MAX_SECONDS = float(os.getenv("AGENT_MAX_SECONDS", "60"))
+TOP_N = int(os.getenv("AGENT_BUDGET_TOP_N", "20"))
+
+_REASONS = {
+    "steps": "step budget ({limit} model calls)",
+    "tool_calls": "tool-call budget ({limit} calls)",
+    "time": "time budget ({limit:g}s)",
+}
+
+
+@dataclass
+class Budget:
+    max_steps: int = MAX_STEPS
+    max_tool_calls: int = MAX_TOOL_CALLS
+    max_seconds: float = MAX_SECONDS
+
+    def limit(self, reason: str):
+        return {"steps": self.max_steps, "tool_calls": self.max_tool_calls, "time": self.max_seconds}[reason]
+
+
+@dataclass
+class BudgetReport:
+    """Model calls and executed tool calls of one request; exhausted names the budget that ran out."""
+
+    agent: str
+    steps: int = 0
+    tool_calls: int = 0
+    seconds: float = 0.0
+    exhausted: str | None = None
+    limit: float = 0
+
+    def status_text(self) -> str:
+        reason = _REASONS[self.exhausted].format(limit=self.limit)
+        return f"Stopped early: the {reason} ran out after {self.steps} model calls and {self.tool_calls} tool calls."
+
+    def metadata(self) -> dict:
+        return {
+            "budget_exhausted": self.exhausted,
+            "steps": self.steps,
+            "tool_calls": self.tool_calls,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def answer_text(event: GraphEvent) -> str:
+    """Final answer of a budgeted run, followed by the budget status when it was cut short."""
+    report = event.data
+    if not isinstance(report, BudgetReport) or not report.exhausted:
+        return event.text
+    return f"{event.text}\n\n{report.status_text()}" if event.text else report.status_text()
+
+
+# -----------------------------------------------------------------------------
+# Per-request step counts
+# -----------------------------------------------------------------------------
+
+_totals = {"runs": 0, "steps": 0, "tool_calls": 0, "exhausted": {reason: 0 for reason in _REASONS}}
+_top: list[tuple[int, int, int, dict]] = []  # min-heap of (steps, tool_calls, seq, entry)
+_seq = 0
+
+
+def record_run(report: BudgetReport, prompt: str) -> None:
+    global _seq
+    _totals["runs"] += 1
+    _totals["steps"] += report.steps
+    _totals["tool_calls"] += report.tool_calls
+    if report.exhausted:
+        _totals["exhausted"][report.exhausted] += 1
+    _seq += 1
+    entry = {"agent": report.agent, "prompt": prompt[:200], **report.metadata()}
+    item = (report.steps, report.tool_calls, _seq, entry)
+    if len(_top) < TOP_N:
+        heapq.heappush(_top, item)
+    elif TOP_N and item[:2] > _top[0][:2]:
+        heapq.heapreplace(_top, item)
+    level = logging.WARNING if report.exhausted else logging.INFO
+    logger.log(
+        level,
+        f"{report.agent}: {report.steps} steps, {report.tool_calls} tool calls, {report.seconds:.2f}s"
+        + (f", {report.exhausted} budget exhausted" if report.exhausted else ""),
+    )
+
+
+def step_stats() -> dict:
+    """Totals over all recorded runs and the most expensive prompts (most steps first)."""
+    runs = _totals["runs"]
+    return {
+        **_totals,
+        "exhausted": dict(_totals["exhausted"]),
+        "mean_steps": round(_totals["steps"] / runs, 2) if runs else 0.0,
+        "top_prompts": [entry for *_, entry in sorted(_top, reverse=True)],
+    }
+
+
+def _collect_metrics():
+    return [
+        ("agent_runs_total", "counter", "Agent graph runs.", [({}, _totals["runs"])]),
+        ("agent_steps_total", "counter", "Model calls made by agent graph runs.", [({}, _totals["steps"])]),
+        ("agent_tool_calls_total", "counter", "Tool calls made by agent graph runs.", [({}, _totals["tool_calls"])]),
+        ("agent_budget_exhausted_total", "counter", "Agent runs stopped by a budget.",
+         [({"budget": reason}, count) for reason, count in _totals["exhausted"].items()]),
+    ]
+
+
+register_collector(_collect_metrics)
+
+
+# -----------------------------------------------------------------------------
+# Budgeted run
+# -----------------------------------------------------------------------------
+
+async def run_budgeted(
+    agent_name: str,
+    graph,
+    inputs: dict,
+    config: dict | None = None,
+    prompt: str = "",
+    budget: Budget | None = None,
+):
+    """stream_graph() under a Budget: same events, the final one with data=BudgetReport."""
+    budget = budget or Budget()
+    report = BudgetReport(agent=agent_name)
+    config = dict(config or {})
+    if budget.max_steps:
+        # Backstop for LangGraph's own limit: (pre-model hook, model, tools) super-steps per model call
+        config.setdefault("recursion_limit", 3 * budget.max_steps + 3)
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    deadline = loop.time() + budget.max_seconds if budget.max_seconds else None
+    partial, last_tool, final = "", "", None
+    events = stream_graph(graph, inputs, config)
+    try:
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    event = await anext(events)
+            except StopAsyncIteration:
+                break
+            except TimeoutError:
+                report.exhausted = "time"
+                break
+            if event.kind == "step":
+                report.steps += 1
+                partial = event.text or partial
+                if event.data:
+                    if budget.max_tool_calls and report.tool_calls + len(event.data) > budget.max_tool_calls:
+                        report.exhausted = "tool_calls"
+                    elif budget.max_steps and report.steps >= budget.max_steps:
+                        report.exhausted = "steps"
+                    if report.exhausted:
+                        break  # before the requested tools run
+                    report.tool_calls += len(event.data)
+            elif event.kind == "tool_end":
+                last_tool = _message_text(event.data).strip()
+            elif event.kind == "final":
+                final = event.text
+                continue
+            yield event
+    finally:
+        await events.aclose()
+        report.seconds = time.monotonic() - started
+        if report.exhausted:
+            report.limit = budget.limit(report.exhausted)
+        record_run(report, prompt)
+    if report.exhausted:
+        final = partial or (f"Last tool result: {last_tool}" if last_tool else "")
+    yield GraphEvent("final", text=final or "", data=report)
@@ -0,0 +1,56 @@
+"""
+Precomputed agent card responses for GET /.well-known/agent.json.
+
+CardCache keeps the serialized card bytes and a strong ETag (hash of the bytes), rebuilt only when
+a different card object is served; after changing a card in place, call invalidate(). Responses
+carry ETag and Cache-Control: public, max-age=A2A_CARD_MAX_AGE (seconds, default 60), and a GET
+whose If-None-Match lists the current ETag gets an empty 304. Used by A2AApplication (host, agent,
+mcp_agent) and the legacy server.A2AServer.
+"""
+import hashlib
+import json
+import os
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+CARD_MAX_AGE = int(os.getenv("A2A_CARD_MAX_AGE", "60"))
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 asks for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class CardCache:
+    def __init__(self, max_age: int = CARD_MAX_AGE, **dump_kwargs):
+        self.dump_kwargs = dump_kwargs or {"exclude_none": True, "by_alias": True}
+        self._card = None
+        self._body = b""
+        self._headers: dict[str, str] = {}
+        self.cache_control = f"public, max-age={max_age}"
+
+    def invalidate(self) -> None:
+        self._card = None
+
+    def _build(self, card) -> None:
+        data = card.model_dump(mode="json", **self.dump_kwargs)
+        self._body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(self._body).hexdigest()[:32] + '"'
+        self._headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        self._card = card
+
+    @property
+    def etag(self) -> str | None:
+        return self._headers.get("ETag")
+
+    def response(self, card, request: Request) -> Response:
+        if card is not self._card:
+            self._build(card)
+        if _etag_matches(request.headers.get("if-none-match"), self._headers["ETag"]):
+            return Response(status_code=304, headers=self._headers)
+        return Response(self._body, media_type="application/json", headers=self._headers)
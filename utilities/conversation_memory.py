@@ -0,0 +1,228 @@
+"""
+Bounded conversation memory for the LangGraph agents, keyed by A2A context_id.
+
+Enabled with AGENT_MEMORY=1. The agents then compile their graphs with a shared BoundedMemorySaver
+and a pre-model hook, and run each request on thread_id = context_id, so follow-up messages in a
+context see the earlier turns without the client resending them.
+
+- Window: before each model call, history over AGENT_MEMORY_MAX_TOKENS (approximate count) is cut
+  at a user-turn boundary; the older turns are folded into a running summary message (one extra
+  LLM call, only on overflow; AGENT_MEMORY_SUMMARIZE=0 just drops them).
+- Storage: only the latest checkpoint of a thread is kept, idle contexts expire after
+  AGENT_MEMORY_IDLE_TTL seconds, and the least recently used contexts are evicted past
+  AGENT_MEMORY_MAX_CONTEXTS contexts or AGENT_MEMORY_MAX_BYTES of serialized state.
+"""
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+MEMORY_ENABLED = os.getenv("AGENT_MEMORY", "0").lower() in ("1", "true", "yes")
+MEMORY_MAX_TOKENS = int(os.getenv("AGENT_MEMORY_MAX_TOKENS", "4000"))
+MEMORY_SUMMARIZE = os.getenv("AGENT_MEMORY_SUMMARIZE", "1").lower() not in ("0", "false", "no")
+MEMORY_MAX_CONTEXTS = int(os.getenv("AGENT_MEMORY_MAX_CONTEXTS", "1000"))
+MEMORY_MAX_BYTES = int(os.getenv("AGENT_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+MEMORY_IDLE_TTL = float(os.getenv("AGENT_MEMORY_IDLE_TTL", "3600"))
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+_SUMMARY_PROMPT = (
+    "Summarize the conversation below in a few sentences for the assistant's own memory. "
+    "Keep names, numbers, facts, user preferences and decisions it may need later."
+)
+# LangGraph's "nostream" tag: keeps the summary call's tokens out of the streamed answer.
+_NOSTREAM_CONFIG = {"tags": ["nostream"]}
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """InMemorySaver that keeps one checkpoint per thread and evicts idle / least recently used threads."""
+
+    def __init__(
+        self,
+        max_contexts: int = MEMORY_MAX_CONTEXTS,
+        max_bytes: int = MEMORY_MAX_BYTES,
+        idle_ttl: float = MEMORY_IDLE_TTL,
+    ):
+        super().__init__()
+        self.max_contexts = max_contexts
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self.evictions = 0
+
+    def _touch(self, thread_id: str) -> None:
+        self._last_used[thread_id] = time.monotonic()
+        self._last_used.move_to_end(thread_id)
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"].get("thread_id")
+        if thread_id in self._last_used:
+            self._touch(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        self._prune(thread_id, ns, checkpoint)
+        self._touch(thread_id)
+        self._evict(keep=thread_id)
+        return result
+
+    def _prune(self, thread_id: str, ns: str, checkpoint) -> None:
+        """Drop older checkpoints, their pending writes and channel versions the latest one does not use."""
+        latest_id = checkpoint["id"]
+        checkpoints = self.storage[thread_id][ns]
+        for cid in [c for c in checkpoints if c != latest_id]:
+            del checkpoints[cid]
+            self.writes.pop((thread_id, ns, cid), None)
+        versions = checkpoint["channel_versions"]
+        size = sum(len(part[1]) for part in checkpoints[latest_id][:2])
+        for key in [k for k in self.blobs if k[0] == thread_id and k[1] == ns]:
+            if versions.get(key[2]) != key[3]:
+                del self.blobs[key]
+            else:
+                size += len(self.blobs[key][1])
+        self._sizes[thread_id] = size
+
+    def _evict(self, keep: str | None = None) -> None:
+        now = time.monotonic()
+        for thread_id, used in list(self._last_used.items()):
+            if now - used <= self.idle_ttl:
+                break
+            if thread_id != keep:
+                self.delete_thread(thread_id)
+                self.evictions += 1
+        while len(self._last_used) > 1 and (
+            len(self._last_used) > self.max_contexts or sum(self._sizes.values()) > self.max_bytes
+        ):
+            oldest = next(iter(self._last_used))
+            if oldest == keep:
+                break
+            self.delete_thread(oldest)
+            self.evictions += 1
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._last_used.pop(thread_id, None)
+        self._sizes.pop(thread_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "contexts": len(self._last_used),
+            "bytes": sum(self._sizes.values()),
+            "evictions": self.evictions,
+        }
+
+
+_saver: BoundedMemorySaver | None = None
+
+
+def get_memory_saver() -> BoundedMemorySaver:
+    """Process-wide checkpointer shared by every graph of the agent."""
+    global _saver
+    if _saver is None:
+        _saver = BoundedMemorySaver()
+    return _saver
+
+
+def memory_config(context_id: str | None) -> dict | None:
+    """Run config for a request: its A2A context is the memory thread (a fresh one if there is none)."""
+    if not MEMORY_ENABLED:
+        return None
+    return {"configurable": {"thread_id": context_id or str(uuid.uuid4())}}
+
+
+def _unanswered_tool_calls(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """AI messages whose tool calls never got a result (a run that failed mid-tool-call)."""
+    answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    return [
+        m for m in messages
+        if isinstance(m, AIMessage) and m.tool_calls and any(tc["id"] not in answered for tc in m.tool_calls)
+    ]
+
+
+def _window_start(messages: list[BaseMessage], max_tokens: int) -> int:
+    """Earliest user-turn boundary from which the rest of the history fits in max_tokens (else the last turn)."""
+    start = len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        if not isinstance(messages[i], HumanMessage):
+            continue
+        if start != len(messages) and count_tokens_approximately(messages[i:]) > max_tokens:
+            break
+        start = i
+    return 0 if start == len(messages) else start
+
+
+def _transcript(messages: list[BaseMessage]) -> str:
+    lines = []
+    for m in messages:
+        if isinstance(m, SystemMessage):
+            lines.append(str(m.content))
+        elif isinstance(m, HumanMessage):
+            lines.append(f"User: {m.content}")
+        elif isinstance(m, ToolMessage):
+            lines.append(f"Tool {m.name or ''} result: {str(m.content)[:500]}")
+        elif isinstance(m, AIMessage):
+            if m.content:
+                lines.append(f"Assistant: {m.content}")
+            for tc in m.tool_calls:
+                lines.append(f"Assistant called {tc['name']}({tc['args']})")
+    return "\n".join(lines)
+
+
+def make_memory_hook(model, max_tokens: int = MEMORY_MAX_TOKENS, summarize: bool = MEMORY_SUMMARIZE):
+    """Pre-model hook keeping the stored history within max_tokens, summarizing what falls out."""
+
+    async def memory_hook(state) -> dict:
+        messages: list[BaseMessage] = state["messages"]
+        dangling = _unanswered_tool_calls(messages)
+        if dangling:
+            return {"messages": [RemoveMessage(id=m.id) for m in dangling]}
+        if count_tokens_approximately(messages) <= max_tokens:
+            return {}
+        # Keep the newest turns in half the budget so the window is not rebuilt on every message
+        start = _window_start(messages, max_tokens // 2)
+        if start == 0:
+            return {}
+        older, recent = messages[:start], messages[start:]
+        kept: list[BaseMessage] = []
+        if summarize:
+            reply = await model.ainvoke(
+                [SystemMessage(content=_SUMMARY_PROMPT), HumanMessage(content=_transcript(older))],
+                config=_NOSTREAM_CONFIG,
+            )
+            kept.append(SystemMessage(content=SUMMARY_PREFIX + str(reply.content).strip()))
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *kept, *recent]}
+
+    return memory_hook
+
+
+def memory_graph_kwargs(model) -> dict:
+    """Extra create_react_agent arguments for memory (none when AGENT_MEMORY is off)."""
+    if not MEMORY_ENABLED:
+        return {}
+    return {"checkpointer": get_memory_saver(), "pre_model_hook": make_memory_hook(model)}
+
+
+async def remember_turn(agent, config: dict | None, user_message: str, answer: str) -> None:
+    """Record a turn answered outside the graph (e.g. the MCP fast path) in the context's memory."""
+    if config is None:
+        return
+    await agent.aupdate_state(
+        config,
+        {"messages": [HumanMessage(content=user_message), AIMessage(content=answer)]},
+        as_node="agent",
+    )
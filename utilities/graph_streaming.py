@@ -0,0 +1,196 @@
+"""
+Streaming LangGraph agent runs into the A2A event queue.
+
+stream_graph() turns a compiled graph's astream_events into a few small events: answer tokens,
+finished model calls, tool call start/end, and the final answer. stream_to_queue() publishes those for one A2A request
+through a TaskUpdater: a working status per tool call and the answer as appended chunks of one
+text artifact, so streaming clients see the first tokens while the ReAct loop is still running.
+
+Only the answer goes into the artifact. In a graph with tools, a model turn's tokens are held until
+the turn ends: a turn without tool calls is the answer, and its tokens are released then; the text
+of a turn that calls tools ("Let me look that up") is published as a working status instead. A
+graph without tools streams its tokens as they arrive.
+"""
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from a2a.server.agent_execution.context import RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, TaskState, TextPart
+from a2a.utils import new_task
+
+from utilities.llm_scheduler import llm_priority, request_priority
+
+# Tokens arriving within this many seconds of the last published chunk are coalesced into the next one.
+STREAM_FLUSH_INTERVAL = float(os.getenv("A2A_STREAM_FLUSH_INTERVAL", "0.05"))
+
+NO_RESPONSE = "No response generated."
+
+
+@dataclass
+class GraphEvent:
+    """
+    One streamed step of an agent run: kind is token, step (a model call finished; data = its
+    tool calls), tool_start, tool_end or final.
+    """
+
+    kind: str
+    text: str = ""
+    tool: str = ""
+    data: Any = None
+
+
+def _message_text(message) -> str:
+    """Text of a message or message chunk whose content is a string or a list of content blocks."""
+    content = message.get("content") if isinstance(message, dict) else getattr(message, "content", message)
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            b if isinstance(b, str) else (b.get("text") or "") if isinstance(b, dict) and b.get("type") == "text" else ""
+            for b in content
+        )
+    return str(content)
+
+
+async def stream_graph(agent, inputs: dict, config: dict | None = None) -> AsyncIterator[GraphEvent]:
+    """
+    Run a compiled LangGraph agent and yield its answer tokens, model turns, tool calls and final
+    answer as they happen (tokens of a turn that may still call tools: when the turn ends).
+    """
+    # A ReAct graph built without tools has no "tools" node, so none of its turns can call one
+    hold_turns = "tools" in getattr(agent, "nodes", ("tools",))
+    turns: dict[str, list[str]] = {}  # held tokens per model run id
+    async for event in agent.astream_events(inputs, config=config, version="v2"):
+        kind = event["event"]
+        data = event.get("data") or {}
+        if kind == "on_chat_model_stream":
+            if "nostream" in (event.get("tags") or ()):
+                continue  # internal model calls (e.g. memory summaries), not part of the answer
+            text = _message_text(data.get("chunk"))
+            if text and hold_turns:
+                turns.setdefault(event.get("run_id", ""), []).append(text)
+            elif text:
+                yield GraphEvent("token", text=text)
+        elif kind == "on_chat_model_end":
+            if "nostream" in (event.get("tags") or ()):
+                continue
+            output = data.get("output")
+            tool_calls = list(getattr(output, "tool_calls", None) or [])
+            held = turns.pop(event.get("run_id", ""), [])
+            if not tool_calls:
+                for text in held:
+                    yield GraphEvent("token", text=text)
+            yield GraphEvent("step", text=_message_text(output).strip(), data=tool_calls)
+        elif kind == "on_tool_start":
+            yield GraphEvent("tool_start", tool=event.get("name", ""), data=data.get("input"))
+        elif kind == "on_tool_end":
+            yield GraphEvent("tool_end", tool=event.get("name", ""), data=data.get("output"))
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            output = data.get("output")
+            messages = output.get("messages", []) if isinstance(output, dict) else []
+            yield GraphEvent("final", text=_message_text(messages[-1]).strip() if messages else "")
+
+
+def _text_parts(text: str) -> list[Part]:
+    return [Part(root=TextPart(text=text))]
+
+
+async def stream_to_queue(
+    context: RequestContext,
+    event_queue: EventQueue,
+    events: AsyncIterator[GraphEvent],
+    artifact_name: str = "response",
+) -> None:
+    """
+    Publish an agent run for one A2A request: the task, working status updates around each
+    tool call (and with the text of a model turn that calls tools), the answer as chunks of one artifact (append=True, last_chunk on the final one),
+    then completed (with a status message when a budgeted run ran out of budget), or failed with
+    the error text if the run raises. The run's LLM calls are scheduled in the lane requested
+    by the message metadata ("priority").
+    """
+    task = context.current_task
+    if task is None:
+        task = new_task(context.message)
+        await event_queue.enqueue_event(task)
+    updater = TaskUpdater(event_queue, task.id, task.context_id)
+    await updater.start_work()
+
+    artifact_id = str(uuid.uuid4())
+    buffer: list[str] = []
+    chunks_sent = 0
+    streamed = False
+    last_flush = 0.0
+    exhausted = None
+
+    async def flush(last_chunk: bool = False) -> None:
+        nonlocal chunks_sent, last_flush
+        if not buffer and not last_chunk:
+            return
+        text = "".join(buffer)
+        buffer.clear()
+        if last_chunk and chunks_sent == 0 and not text.strip():
+            text = NO_RESPONSE
+        await updater.add_artifact(
+            _text_parts(text),
+            artifact_id=artifact_id,
+            name=artifact_name,
+            append=chunks_sent > 0,
+            last_chunk=last_chunk,
+        )
+        chunks_sent += 1
+        last_flush = time.monotonic()
+
+    lane = llm_priority.set(request_priority(context))
+    try:
+        async for event in events:
+            if event.kind == "token":
+                streamed = True
+                buffer.append(event.text)
+                if chunks_sent == 0 or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL:
+                    await flush()
+            elif event.kind == "step" and event.data and event.text:
+                # Text of a turn that goes on to call tools: progress, not part of the answer
+                await updater.update_status(
+                    TaskState.working,
+                    message=updater.new_agent_message(_text_parts(event.text), metadata={"event": "thought"}),
+                )
+            elif event.kind in ("tool_start", "tool_end"):
+                await flush()
+                started = event.kind == "tool_start"
+                await updater.update_status(
+                    TaskState.working,
+                    message=updater.new_agent_message(
+                        _text_parts(f"Calling tool {event.tool}..." if started else f"Tool {event.tool} finished."),
+                        metadata={"tool": event.tool, "event": event.kind},
+                    ),
+                )
+            elif event.kind == "final":
+                exhausted = getattr(event.data, "exhausted", None)
+                if exhausted:
+                    # Budgeted run cut short (see agent_budget): partial answer, then why it stopped
+                    status = event.data.status_text()
+                    if not streamed and event.text:
+                        buffer.append(event.text)
+                    buffer.append(f"\n\n{status}" if streamed or event.text else status)
+                elif not streamed:
+                    # The model did not stream tokens; publish the whole answer as one chunk.
+                    buffer.append(event.text)
+        await flush(last_chunk=True)
+        if exhausted:
+            await updater.complete(
+                updater.new_agent_message(_text_parts(status), metadata=event.data.metadata())
+            )
+        else:
+            await updater.complete()
+    except Exception as e:
+        await updater.failed(updater.new_agent_message(_text_parts(f"Error: {e!s}")))
+    finally:
+        llm_priority.reset(lane)
@@ -0,0 +1,292 @@
+"""
+Shared scheduler for LLM calls: token-bucket rate limits, priority lanes, bounded queueing.
+
+Every chat model call of the LangGraph agents passes through LLMScheduler before it is sent
+(via LLMSchedulerCallback, attached by utilities.llm_simulator.get_chat_model):
+
+- Budgets: LLM_RPM requests/min and LLM_TPM tokens/min, each a token bucket that refills
+  continuously (0 = unlimited). A call reserves its estimated tokens (prompt plus
+  LLM_EST_OUTPUT_TOKENS) and is settled against the provider-reported usage afterwards.
+- Lanes: "interactive" calls are always granted before queued "batch" calls. The lane comes
+  from the A2A request metadata {"priority": "batch"} (see request_priority).
+- Queueing: at most LLM_MAX_QUEUE calls wait. Further calls, calls the budget cannot serve within
+  LLM_QUEUE_TIMEOUT seconds, and calls still waiting after that long fail fast with
+  SchedulerRejected instead of piling up retries.
+- Metrics: stats() reports queue depth per lane, grants, rejections and queue-wait percentiles
+  (also on /metrics).
+
+The scheduler is off unless LLM_RPM or LLM_TPM is set.
+"""
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from typing import Any
+
+from utilities.metrics import register_collector
+
+LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "100"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))
+LLM_EST_OUTPUT_TOKENS = int(os.getenv("LLM_EST_OUTPUT_TOKENS", "256"))
+
+LANES = {"interactive": 0, "batch": 1}
+DEFAULT_LANE = "interactive"
+
+# Lane of the LLM calls made while handling the current request.
+llm_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default=DEFAULT_LANE)
+
+
+class SchedulerRejected(RuntimeError):
+    """The LLM call was not admitted: the queue is full or the budget cannot serve it in time."""
+
+
+class TokenBucket:
+    """Continuously refilling bucket; the balance may go negative when actual usage exceeds a reservation."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self._at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._at) * self.rate)
+        self._at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at capacity) is available; 0 if it is now."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def give(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+class LLMScheduler:
+    """Admits LLM calls within request/token budgets, interactive lane first."""
+
+    def __init__(
+        self,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_queue: int = LLM_MAX_QUEUE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT,
+    ):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._heap: list[tuple[int, int, float, asyncio.Future, str]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._waits: dict[str, deque[float]] = {lane: deque(maxlen=1000) for lane in LANES}
+        self._counts = {lane: {"granted": 0, "rejected": 0} for lane in LANES}
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.wait_time(1, now)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def _take(self, tokens: float) -> None:
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+
+    def _grant(self, lane: str, waited: float) -> None:
+        self._counts[lane]["granted"] += 1
+        self._waits[lane].append(waited)
+
+    def _reject(self, lane: str, reason: str) -> SchedulerRejected:
+        self._counts[lane]["rejected"] += 1
+        return SchedulerRejected(f"LLM call rejected ({lane} lane): {reason}")
+
+    def queued(self) -> int:
+        return sum(1 for entry in self._heap if not entry[3].done())
+
+    async def acquire(self, tokens: float, lane: str = DEFAULT_LANE) -> float:
+        """Wait until the call fits the budgets; returns the queue wait in seconds."""
+        lane = lane if lane in LANES else DEFAULT_LANE
+        now = time.monotonic()
+        if not self.queued() and self._wait_time(tokens, now) == 0:
+            self._take(tokens)
+            self._grant(lane, 0.0)
+            return 0.0
+        if self.queued() >= self.max_queue:
+            raise self._reject(lane, f"queue full ({self.max_queue} waiting)")
+        if self._wait_time(tokens, now) > self.queue_timeout:
+            raise self._reject(lane, f"budget refills in over {self.queue_timeout:g}s")
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (LANES[lane], next(self._seq), tokens, future, lane))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done():
+                # Granted in the same instant the timeout fired: give the reservation back
+                self.settle(tokens, 0, requests=1)
+            future.cancel()
+            self._dispatch()
+            raise self._reject(lane, f"waited over {self.queue_timeout:g}s") from None
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            self._dispatch()
+            raise
+        waited = time.monotonic() - now
+        self._grant(lane, waited)
+        return waited
+
+    def _dispatch(self) -> None:
+        """Grant queued calls in lane order while the budgets allow; re-arm a timer for the next one."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._heap:
+            _, _, tokens, future, _ = self._heap[0]
+            if future.done():
+                heapq.heappop(self._heap)
+                continue
+            wait = self._wait_time(tokens, time.monotonic())
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._heap)
+            self._take(tokens)
+            future.set_result(None)
+
+    def settle(self, reserved: float, actual: float, requests: int = 0) -> None:
+        """Correct the token bucket once the real usage of a call is known (and return unused requests)."""
+        if self.tokens is not None and actual >= 0:
+            diff = reserved - actual
+            if diff > 0:
+                self.tokens.give(diff)
+            elif diff < 0:
+                self.tokens.take(-diff)
+        if self.requests is not None and requests:
+            self.requests.give(requests)
+        with contextlib.suppress(RuntimeError):
+            self._dispatch()
+
+    def stats(self) -> dict:
+        out: dict[str, Any] = {"queued": self.queued(), "lanes": {}}
+        for lane in LANES:
+            waits = sorted(self._waits[lane])
+            out["lanes"][lane] = {
+                **self._counts[lane],
+                "queued": sum(1 for e in self._heap if e[4] == lane and not e[3].done()),
+                "wait_p50_ms": round(_percentile(waits, 50) * 1000, 2),
+                "wait_p95_ms": round(_percentile(waits, 95) * 1000, 2),
+                "wait_max_ms": round((waits[-1] if waits else 0.0) * 1000, 2),
+            }
+        if self.requests is not None:
+            out["requests_available"] = round(self.requests.tokens, 2)
+        if self.tokens is not None:
+            out["tokens_available"] = round(self.tokens.tokens, 2)
+        return out
+
+
+_scheduler: LLMScheduler | None = None
+
+
+def scheduler_enabled() -> bool:
+    return LLM_RPM > 0 or LLM_TPM > 0
+
+
+def get_scheduler() -> LLMScheduler | None:
+    """Process-wide scheduler, or None when no budget is configured."""
+    global _scheduler
+    if not scheduler_enabled():
+        return None
+    if _scheduler is None:
+        _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def _collect_metrics():
+    if _scheduler is None:
+        return []
+    stats = _scheduler.stats()
+    lanes = stats["lanes"]
+    return [
+        ("llm_scheduler_queued", "gauge", "LLM calls waiting for a rate budget.",
+         [({"lane": lane}, s["queued"]) for lane, s in lanes.items()]),
+        ("llm_scheduler_granted_total", "counter", "LLM calls admitted.",
+         [({"lane": lane}, s["granted"]) for lane, s in lanes.items()]),
+        ("llm_scheduler_rejected_total", "counter", "LLM calls rejected (queue full or wait too long).",
+         [({"lane": lane}, s["rejected"]) for lane, s in lanes.items()]),
+        ("llm_scheduler_wait_p95_seconds", "gauge", "95th percentile queue wait of recent LLM calls.",
+         [({"lane": lane}, s["wait_p95_ms"] / 1000) for lane, s in lanes.items()]),
+    ]
+
+
+register_collector(_collect_metrics)
+
+
+def request_priority(context) -> str:
+    """Lane for an A2A request: metadata {"priority": "batch"} on the request or its message, else interactive."""
+    for metadata in (getattr(context, "metadata", None), getattr(getattr(context, "message", None), "metadata", None)):
+        lane = (metadata or {}).get("priority")
+        if lane in LANES:
+            return lane
+    return DEFAULT_LANE
+
+
+def _estimate_prompt_tokens(messages) -> int:
+    return sum(len(str(getattr(m, "content", m))) for m in messages) // 4
+
+
+def scheduler_callback():
+    """LangChain callback handler that admits each chat model call through the scheduler (None when off)."""
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return None
+    from langchain_core.callbacks import AsyncCallbackHandler
+
+    class LLMSchedulerCallback(AsyncCallbackHandler):
+        # Awaited before the model request is sent, and its SchedulerRejected propagates to the caller
+        run_inline = True
+        raise_error = True
+
+        def __init__(self):
+            self._reserved: dict[Any, float] = {}
+
+        async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+            tokens = _estimate_prompt_tokens(messages[0]) + LLM_EST_OUTPUT_TOKENS
+            await scheduler.acquire(tokens, llm_priority.get())
+            self._reserved[run_id] = tokens
+
+        async def on_llm_end(self, response, *, run_id, **kwargs):
+            reserved = self._reserved.pop(run_id, None)
+            if reserved is None:
+                return
+            usage = None
+            with contextlib.suppress(AttributeError, IndexError, TypeError):
+                usage = response.generations[0][0].message.usage_metadata
+            scheduler.settle(reserved, usage["total_tokens"] if usage else reserved)
+
+        async def on_llm_error(self, error, *, run_id, **kwargs):
+            reserved = self._reserved.pop(run_id, None)
+            if reserved is not None:
+                scheduler.settle(reserved, 0)
+
+    return LLMSchedulerCallback()
@@ -0,0 +1,393 @@
+"""
+Pluggable LLM backend with an offline record/replay simulator.
+
+LLM_BACKEND selects what the agents talk to:
+
+- openai (default): ChatOpenAI for the LangGraph agents; the ADK orchestrator keeps its Gemini model.
+  With LLM_RECORD=<file.jsonl>, every chat model call is appended to that file (prompt signature,
+  answer or tool calls, observed time-to-first-token and duration) for later replay.
+- simulated: no network. Each call is answered, in this order, from recordings (LLM_SIM_RECORDINGS,
+  JSONL written by LLM_RECORD), from scripted rules (LLM_SIM_SCRIPT, JSON list of
+  {"match": regex, "tool_calls": [{"name", "args"}], "response": text}), or with a generic
+  answer. Latency follows recorded timings when available, else a model: log-normal
+  time-to-first-token around LLM_SIM_TTFT_MS (sigma LLM_SIM_TTFT_SIGMA) plus LLM_SIM_PREFILL_MS
+  per 1K prompt tokens, then LLM_SIM_TPOT_MS per output token; LLM_SIM_SPEED scales all of it.
+
+Scripted rules: "$1".."$9" in tool args are regex groups of the user message; "{tool_result}" in
+"response" is the last tool result. A rule's tool calls are made once per user turn, then its
+response is given.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai").lower()
+LLM_RECORD = os.getenv("LLM_RECORD") or None
+SIM_RECORDINGS = os.getenv("LLM_SIM_RECORDINGS") or None
+SIM_SCRIPT = os.getenv("LLM_SIM_SCRIPT") or None
+SIM_TTFT_MS = float(os.getenv("LLM_SIM_TTFT_MS", "350"))
+SIM_TTFT_SIGMA = float(os.getenv("LLM_SIM_TTFT_SIGMA", "0.35"))
+SIM_PREFILL_MS = float(os.getenv("LLM_SIM_PREFILL_MS", "40"))
+SIM_TPOT_MS = float(os.getenv("LLM_SIM_TPOT_MS", "15"))
+SIM_RESPONSE_TOKENS = int(os.getenv("LLM_SIM_RESPONSE_TOKENS", "40"))
+SIM_SPEED = float(os.getenv("LLM_SIM_SPEED", "1"))
+SIM_SEED = os.getenv("LLM_SIM_SEED")
+
+SIMULATED = ("simulated", "sim", "replay")
+
+
+def is_simulated() -> bool:
+    return LLM_BACKEND in SIMULATED
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4) if text else 0
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def prompt_signature(user_text: str, steps: list[tuple[str, str]], tool_names: list[str]) -> str:
+    """
+    Replay key for one model call: the last user message, the tool calls/results since then (names
+    only, since results such as random numbers vary) and the tools bound to the model.
+    """
+    raw = json.dumps([_normalize(user_text), steps, sorted(tool_names)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class SimTurn:
+    """What the model says for one call: text and/or tool calls, plus optional recorded timings."""
+
+    text: str = ""
+    tool_calls: list[dict] = field(default_factory=list)
+    ttft_ms: float | None = None
+    duration_ms: float | None = None
+
+
+@dataclass
+class _Rule:
+    pattern: re.Pattern
+    tool_calls: list[dict]
+    response: str | None
+
+
+def _substitute(value: Any, m: re.Match) -> Any:
+    if isinstance(value, str):
+        return re.sub(r"\$(\d)", lambda g: m.group(int(g[1])) or "", value)
+    if isinstance(value, dict):
+        return {k: _substitute(v, m) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, m) for v in value]
+    return value
+
+
+class LLMSimulator:
+    """Chooses simulated answers and their latency; shared by the LangChain and ADK adapters."""
+
+    def __init__(
+        self,
+        recordings_path: str | None = SIM_RECORDINGS,
+        script_path: str | None = SIM_SCRIPT,
+        seed: int | None = int(SIM_SEED) if SIM_SEED else None,
+    ):
+        self.rng = random.Random(seed)
+        self.recordings: dict[str, SimTurn] = {}
+        self.rules: list[_Rule] = []
+        if recordings_path and Path(recordings_path).exists():
+            for line in Path(recordings_path).read_text().splitlines():
+                if line.strip():
+                    r = json.loads(line)
+                    self.recordings[r["key"]] = SimTurn(
+                        r.get("response", ""), r.get("tool_calls", []), r.get("ttft_ms"), r.get("duration_ms")
+                    )
+        if script_path:
+            for r in json.loads(Path(script_path).read_text()):
+                self.rules.append(_Rule(re.compile(r["match"], re.IGNORECASE), r.get("tool_calls", []), r.get("response")))
+
+    def respond(self, user_text: str, steps: list[tuple[str, str]], tool_names: list[str], last_tool_result: str = "") -> SimTurn:
+        recorded = self.recordings.get(prompt_signature(user_text, steps, tool_names))
+        if recorded is not None:
+            return recorded
+        called = any(kind == "tool" for kind, _ in steps)
+        for rule in self.rules:
+            m = rule.pattern.search(user_text)
+            if not m:
+                continue
+            calls = [c for c in rule.tool_calls if c.get("name") in tool_names]
+            if calls and not called:
+                return SimTurn(tool_calls=[
+                    {"name": c["name"], "args": _substitute(c.get("args", {}), m), "id": f"call_{uuid.uuid4().hex[:12]}"}
+                    for c in calls
+                ])
+            if rule.response is not None:
+                return SimTurn(text=_substitute(rule.response, m).replace("{tool_result}", last_tool_result))
+        if called:
+            return SimTurn(text=f"Result: {last_tool_result}")
+        words = ["simulated"] + re.findall(r"\w+", user_text)[:8]
+        filler = (words * (SIM_RESPONSE_TOKENS // max(1, len(words)) + 1))[:SIM_RESPONSE_TOKENS]
+        return SimTurn(text="Simulated answer: " + " ".join(filler))
+
+    def timings(self, turn: SimTurn, prompt_tokens: int, output_tokens: int) -> tuple[float, float]:
+        """(time to first token, time per further token) in seconds."""
+        if turn.ttft_ms is not None:
+            ttft = turn.ttft_ms
+            rest = max(0.0, (turn.duration_ms or ttft) - ttft)
+            tpot = rest / max(1, output_tokens - 1)
+        else:
+            ttft = SIM_TTFT_MS * math.exp(self.rng.gauss(0, SIM_TTFT_SIGMA)) + SIM_PREFILL_MS * prompt_tokens / 1000
+            tpot = SIM_TPOT_MS * math.exp(self.rng.gauss(0, 0.2))
+        speed = SIM_SPEED or 1.0
+        return ttft / 1000 / speed, tpot / 1000 / speed
+
+
+_simulator: LLMSimulator | None = None
+
+
+def get_simulator() -> LLMSimulator:
+    global _simulator
+    if _simulator is None:
+        _simulator = LLMSimulator()
+    return _simulator
+
+
+def _split_tokens(text: str) -> list[str]:
+    return re.findall(r"\s*\S+", text) or ([text] if text else [])
+
+
+# -----------------------------------------------------------------------------
+# LangChain adapter (LangGraph agents)
+# -----------------------------------------------------------------------------
+
+def _langchain_prompt(messages) -> tuple[str, list[tuple[str, str]], str, int]:
+    """(last user text, tool steps since it, last tool result, approx prompt tokens) of a chat history."""
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    user_text, steps, last_result = "", [], ""
+    for m in messages:
+        if isinstance(m, HumanMessage):
+            user_text, steps, last_result = str(m.content), [], ""
+        elif isinstance(m, AIMessage) and m.tool_calls:
+            steps.append(("call", ",".join(tc["name"] for tc in m.tool_calls)))
+        elif isinstance(m, ToolMessage):
+            steps.append(("tool", m.name or ""))
+            last_result = str(m.content)
+    prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+    return user_text, steps, last_result, prompt_tokens
+
+
+def _tool_names(kwargs: dict) -> list[str]:
+    names = []
+    for t in kwargs.get("tools") or []:
+        fn = t.get("function", t) if isinstance(t, dict) else {}
+        if fn.get("name"):
+            names.append(fn["name"])
+    return names
+
+
+def _simulated_chat_model_class():
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+
+    class SimulatedChatModel(BaseChatModel):
+        """Offline chat model answering from the LLMSimulator with simulated latency."""
+
+        model_name: str = "simulated"
+
+        @property
+        def _llm_type(self) -> str:
+            return "simulated"
+
+        def bind_tools(self, tools, **kwargs):
+            return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+        def _turn(self, messages, kwargs) -> tuple[SimTurn, int, int]:
+            user_text, steps, last_result, prompt_tokens = _langchain_prompt(messages)
+            turn = get_simulator().respond(user_text, steps, _tool_names(kwargs), last_result)
+            output_tokens = estimate_tokens(turn.text) + 10 * len(turn.tool_calls)
+            return turn, prompt_tokens, output_tokens
+
+        def _message(self, turn: SimTurn, prompt_tokens: int, output_tokens: int):
+            return AIMessage(
+                content=turn.text,
+                tool_calls=[{"name": c["name"], "args": c["args"], "id": c["id"]} for c in turn.tool_calls],
+                usage_metadata={
+                    "input_tokens": prompt_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": prompt_tokens + output_tokens,
+                },
+                response_metadata={"model_name": self.model_name},
+            )
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            turn, prompt_tokens, output_tokens = self._turn(messages, kwargs)
+            ttft, tpot = get_simulator().timings(turn, prompt_tokens, output_tokens)
+            time.sleep(ttft + tpot * max(0, output_tokens - 1))
+            return ChatResult(generations=[ChatGeneration(message=self._message(turn, prompt_tokens, output_tokens))])
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            turn, prompt_tokens, output_tokens = self._turn(messages, kwargs)
+            ttft, tpot = get_simulator().timings(turn, prompt_tokens, output_tokens)
+            await asyncio.sleep(ttft + tpot * max(0, output_tokens - 1))
+            return ChatResult(generations=[ChatGeneration(message=self._message(turn, prompt_tokens, output_tokens))])
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            turn, prompt_tokens, output_tokens = self._turn(messages, kwargs)
+            ttft, tpot = get_simulator().timings(turn, prompt_tokens, output_tokens)
+            await asyncio.sleep(ttft)
+            for i, token in enumerate(_split_tokens(turn.text)):
+                if i:
+                    await asyncio.sleep(tpot)
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+                if run_manager:
+                    await run_manager.on_llm_new_token(token, chunk=chunk)
+                yield chunk
+            full = self._message(turn, prompt_tokens, output_tokens)
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                    for i, c in enumerate(turn.tool_calls)
+                ],
+                usage_metadata=full.usage_metadata,
+                response_metadata=full.response_metadata,
+            ))
+
+    return SimulatedChatModel
+
+
+def _recording_handler_class():
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class RecordingHandler(BaseCallbackHandler):
+        """Appends every chat model call (signature, answer, timings) to a JSONL file for replay."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._pending: dict[Any, dict] = {}
+            self._lock = threading.Lock()
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, invocation_params=None, **kwargs):
+            user_text, steps, _, _ = _langchain_prompt(messages[0])
+            tools = _tool_names(invocation_params or {})
+            self._pending[run_id] = {
+                "key": prompt_signature(user_text, steps, tools),
+                "prompt": user_text,
+                "started": time.perf_counter(),
+                "first": None,
+            }
+
+        def on_llm_new_token(self, token, *, run_id, **kwargs):
+            pending = self._pending.get(run_id)
+            if pending is not None and pending["first"] is None and token:
+                pending["first"] = time.perf_counter()
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            pending = self._pending.pop(run_id, None)
+            if pending is None:
+                return
+            message = response.generations[0][0].message
+            end = time.perf_counter()
+            record = {
+                "key": pending["key"],
+                "prompt": pending["prompt"],
+                "response": str(message.content or ""),
+                "tool_calls": [{"name": tc["name"], "args": tc["args"], "id": tc["id"]} for tc in getattr(message, "tool_calls", [])],
+                "ttft_ms": round(((pending["first"] or end) - pending["started"]) * 1000, 1),
+                "duration_ms": round((end - pending["started"]) * 1000, 1),
+            }
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            self._pending.pop(run_id, None)
+
+    return RecordingHandler
+
+
+def get_chat_model(model_name: str, **kwargs):
+    """LangChain chat model for the configured backend (ChatOpenAI, recording if LLM_RECORD is set, or simulated)."""
+    from utilities.llm_scheduler import scheduler_callback
+    from utilities.metrics import llm_metrics_callback
+
+    # The scheduler goes first so llm timings and recordings exclude the time spent queued for a rate budget
+    callbacks = [cb for cb in (scheduler_callback(), llm_metrics_callback()) if cb is not None]
+    if is_simulated():
+        return _simulated_chat_model_class()(model_name=f"simulated:{model_name}", callbacks=callbacks or None)
+    from langchain_openai import ChatOpenAI
+
+    if LLM_RECORD:
+        callbacks.append(_recording_handler_class()(LLM_RECORD))
+    if callbacks:
+        kwargs.setdefault("callbacks", callbacks)
+    return ChatOpenAI(model=model_name, **kwargs)
+
+
+# -----------------------------------------------------------------------------
+# Google ADK adapter (orchestrator)
+# -----------------------------------------------------------------------------
+
+def _adk_prompt(llm_request) -> tuple[str, list[tuple[str, str]], str, int]:
+    user_text, steps, last_result, chars = "", [], "", 0
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+                if content.role == "user":
+                    user_text, steps, last_result = part.text, [], ""
+            elif part.function_call:
+                steps.append(("call", part.function_call.name))
+            elif part.function_response:
+                steps.append(("tool", part.function_response.name))
+                last_result = json.dumps(part.function_response.response, default=str)
+                chars += len(last_result)
+    return user_text, steps, last_result, chars // 4
+
+
+def get_adk_model(model_name: str):
+    """Model for an ADK LlmAgent: the Gemini model name, or a simulated BaseLlm when LLM_BACKEND=simulated."""
+    if not is_simulated():
+        return model_name
+    from google.adk.models.base_llm import BaseLlm
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+
+    class SimulatedAdkLlm(BaseLlm):
+        """Offline ADK model answering from the LLMSimulator with simulated latency."""
+
+        async def generate_content_async(self, llm_request, stream: bool = False):
+            user_text, steps, last_result, prompt_tokens = _adk_prompt(llm_request)
+            tools = list(getattr(llm_request, "tools_dict", {}) or {})
+            turn = get_simulator().respond(user_text, steps, tools, last_result)
+            output_tokens = estimate_tokens(turn.text) + 10 * len(turn.tool_calls)
+            ttft, tpot = get_simulator().timings(turn, prompt_tokens, output_tokens)
+            await asyncio.sleep(ttft)
+            if stream and turn.text:
+                for i, token in enumerate(_split_tokens(turn.text)):
+                    if i:
+                        await asyncio.sleep(tpot)
+                    yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=token)]), partial=True)
+            else:
+                await asyncio.sleep(tpot * max(0, output_tokens - 1))
+            parts = [types.Part(text=turn.text)] if turn.text else []
+            parts += [
+                types.Part(function_call=types.FunctionCall(name=c["name"], args=c["args"], id=c["id"]))
+                for c in turn.tool_calls
+            ]
+            yield LlmResponse(content=types.Content(role="model", parts=parts))
+
+    return SimulatedAdkLlm(model=f"simulated:{model_name}")
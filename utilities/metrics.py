@@ -0,0 +1,223 @@
+"""
+Per-phase latency metrics for the A2A servers, served at /metrics in Prometheus text format.
+
+Phases: registry_load, routing, downstream_call, llm, tool_call, serialization, plus request (a
+whole JSON-RPC request). Code times a phase with `with phase("routing"): ...`; each observation
+lands in the a2a_phase_seconds histogram, and exceptions also count in a2a_phase_errors_total.
+Other modules can add their own gauges/counters to the page with register_collector(). With
+tracing on (utilities.tracing), every phase is also a span.
+
+Recording is a perf_counter pair, a bisect and two increments (no locks: the servers record from
+one event loop). See benchmarks/metrics_overhead.py. A2A_METRICS=0 turns recording off.
+"""
+import bisect
+import os
+import time
+from collections.abc import Callable, Iterable
+
+from utilities import tracing
+
+METRICS_ENABLED = os.getenv("A2A_METRICS", "1").lower() not in ("0", "false", "no")
+
+PHASES = ("registry_load", "routing", "downstream_call", "llm", "tool_call", "serialization", "request")
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (name, type, help, [(labels, value), ...]) produced by a collector at scrape time
+Sample = tuple[dict[str, str], float]
+Family = tuple[str, str, str, list[Sample]]
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_format(value)}")
+        return lines
+
+
+class _Series:
+    """One labelled histogram series: count per bucket (non-cumulative, last = +Inf) and sum."""
+
+    __slots__ = ("labels", "buckets", "counts", "total")
+
+    def __init__(self, labels: tuple, buckets: tuple[float, ...]):
+        self.labels = labels
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self.buckets = buckets
+        self._series: dict[tuple, _Series] = {}
+
+    def labels(self, *values) -> _Series:
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = _Series(values, self.buckets)
+        return series
+
+    def observe(self, value: float, *labels) -> None:
+        self.labels(*labels).observe(value)
+
+    def snapshot(self, *labels) -> tuple[int, float]:
+        """(count, sum) of one series."""
+        series = self._series.get(labels)
+        return (sum(series.counts), series.total) if series else (0, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series.counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{_format(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {repr(series.total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+PHASE_SECONDS = Histogram("a2a_phase_seconds", "Time spent per request phase.", ("phase",))
+PHASE_ERRORS = Counter("a2a_phase_errors_total", "Phases that ended with an exception.", ("phase",))
+
+_collectors: list[Callable[[], Iterable[Family]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[Family]]) -> None:
+    """Add a callable returning (name, type, help, samples) families to every scrape."""
+    _collectors.append(collector)
+
+
+class _PhaseTimer:
+    __slots__ = ("series", "scope", "start")
+
+    def __init__(self, series: _Series, scope=None):
+        self.series = series
+        self.scope = scope
+
+    def __enter__(self):
+        if self.scope is not None:
+            self.scope.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.series.observe(time.perf_counter() - self.start)
+        if exc_type is not None:
+            PHASE_ERRORS.inc(*self.series.labels)
+        if self.scope is not None:
+            self.scope.__exit__(exc_type, exc, tb)
+        return False
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+
+def phase(name: str, remote_parent: "tracing.SpanContext | None" = None):
+    """
+    Context manager timing one phase (sync or async code alike); also a trace span when tracing is
+    on, continuing remote_parent (see tracing.span) when given.
+    """
+    scope = tracing.span(name, remote_parent) if tracing.TRACING_ENABLED else None
+    if METRICS_ENABLED:
+        return _PhaseTimer(PHASE_SECONDS.labels(name), scope)
+    return scope or _NO_TIMER
+
+
+def observe_phase(name: str, seconds: float, error: bool = False) -> None:
+    """Record a phase measured elsewhere (e.g. between two callbacks)."""
+    if METRICS_ENABLED:
+        PHASE_SECONDS.observe(seconds, name)
+        if error:
+            PHASE_ERRORS.inc(name)
+
+
+def render() -> str:
+    lines = PHASE_SECONDS.render() + PHASE_ERRORS.render()
+    for collector in _collectors:
+        for name, kind, help, samples in collector():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format(value)}" if label_text else f"{name} {_format(value)}")
+    return "\n".join(lines) + "\n"
+
+
+async def metrics_endpoint(request):
+    """Starlette handler for GET /metrics."""
+    from starlette.responses import Response
+
+    return Response(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def llm_metrics_callback():
+    """LangChain callback handler recording each chat model call as an llm phase and span (None when both are off)."""
+    if not METRICS_ENABLED and not tracing.TRACING_ENABLED:
+        return None
+    from langchain_core.callbacks import AsyncCallbackHandler
+
+    class LLMMetricsCallback(AsyncCallbackHandler):
+        run_inline = True
+
+        def __init__(self):
+            self._started: dict = {}
+
+        async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+            model = (kwargs.get("metadata") or {}).get("ls_model_name")
+            self._started[run_id] = (time.perf_counter(), tracing.start_span("llm", model=model))
+
+        async def on_llm_end(self, response, *, run_id, **kwargs):
+            started = self._started.pop(run_id, None)
+            if started is not None:
+                observe_phase("llm", time.perf_counter() - started[0])
+                tracing.finish_span(started[1])
+
+        async def on_llm_error(self, error, *, run_id, **kwargs):
+            started = self._started.pop(run_id, None)
+            if started is not None:
+                observe_phase("llm", time.perf_counter() - started[0], error=True)
+                tracing.finish_span(started[1], error)
+
+    return LLMMetricsCallback()
@@ -0,0 +1,320 @@
+"""
+Push notifications for the a2a-sdk servers (agent, mcp_agent).
+
+Clients register a webhook per task, either in message/send (configuration.pushNotificationConfig)
+or with tasks/pushNotificationConfig/set. The request handler then calls
+QueuedPushNotificationSender.send_notification() on every task update. That only queues the update;
+delivery happens in background workers, off the request path:
+
+- Coalescing: one queued delivery per (task, webhook). Updates that arrive while it waits or is
+  being retried replace its payload, so a slow webhook gets the latest state, not every chunk.
+- Retries: connection errors, timeouts, 429 and 5xx are retried A2A_PUSH_MAX_ATTEMPTS times in all
+  (default 5) with exponential backoff from A2A_PUSH_BACKOFF seconds (default 0.5, capped at 30).
+  Other 4xx responses are not retried.
+- Signing: with A2A_PUSH_SECRET set, each POST carries X-A2A-Signature: t=<unix time>,v1=<hex
+  HMAC-SHA256 of "<t>.<body>">; receivers check it with verify_signature(). The webhook's token
+  goes in X-A2A-Notification-Token, and Bearer credentials in Authorization.
+- Bounds: at most A2A_PUSH_CONCURRENCY deliveries in flight (default 16) and A2A_PUSH_MAX_QUEUE
+  queued (default 10000; beyond that updates are dropped and counted). Webhook configs of a
+  finished task are removed once its final state is delivered.
+
+- Webhook URLs: only http(s) URLs whose host resolves to public addresses are accepted, so a
+  client cannot make the agent POST into its own network. Hosts listed in A2A_PUSH_ALLOWED_HOSTS
+  (comma-separated names or IPs) are exempt. URLs are checked when a config is set (invalid
+  params error) and again before each POST, in case the name now resolves elsewhere.
+
+Push notifications are off unless A2A_PUSH=1 (otherwise the cards advertise pushNotifications: false).
+push_standin is a local receiver for tests (A2A_PUSH_ALLOWED_HOSTS=localhost).
+"""
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+from a2a.server.tasks import InMemoryPushNotificationConfigStore
+from a2a.server.tasks.push_notification_config_store import PushNotificationConfigStore
+from a2a.server.tasks.push_notification_sender import PushNotificationSender
+from a2a.types import InvalidParamsError, PushNotificationConfig, Task
+from a2a.utils.errors import ServerError
+
+from utilities.metrics import register_collector
+from utilities.task_store import is_finished
+
+logger = logging.getLogger(__name__)
+
+PUSH_ENABLED = os.getenv("A2A_PUSH", "0").lower() in ("1", "true", "yes")
+PUSH_ALLOWED_HOSTS = frozenset(h.strip().lower() for h in os.getenv("A2A_PUSH_ALLOWED_HOSTS", "").split(",") if h.strip())
+PUSH_SECRET = os.getenv("A2A_PUSH_SECRET") or None
+PUSH_MAX_ATTEMPTS = int(os.getenv("A2A_PUSH_MAX_ATTEMPTS", "5"))
+PUSH_BACKOFF = float(os.getenv("A2A_PUSH_BACKOFF", "0.5"))
+PUSH_TIMEOUT = float(os.getenv("A2A_PUSH_TIMEOUT", "10"))
+PUSH_CONCURRENCY = int(os.getenv("A2A_PUSH_CONCURRENCY", "16"))
+PUSH_MAX_QUEUE = int(os.getenv("A2A_PUSH_MAX_QUEUE", "10000"))
+
+SIGNATURE_HEADER = "X-A2A-Signature"
+TOKEN_HEADER = "X-A2A-Notification-Token"
+
+_MAX_BACKOFF = 30.0
+
+
+def sign(secret: str, body: bytes, timestamp: int | None = None) -> str:
+    """Signature header value for a payload: t=<timestamp>,v1=<hex HMAC-SHA256 of "<t>.<body>">."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(secret: str, body: bytes, header: str | None, tolerance: float = 300) -> bool:
+    """True if header is a valid signature of body made within tolerance seconds of now."""
+    if not header:
+        return False
+    try:
+        fields = dict(part.split("=", 1) for part in header.split(","))
+        timestamp = int(fields["t"])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(sign(secret, body, timestamp), f"t={timestamp},v1={fields.get('v1', '')}")
+
+
+def _blocked_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return not ip.is_global or ip.is_multicast
+
+
+async def check_webhook_url(url: str, allowed_hosts: frozenset[str] = PUSH_ALLOWED_HOSTS) -> str | None:
+    """Why url may not receive push notifications, or None if it may."""
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        return f"invalid webhook URL {url!r}"
+    if parts.scheme not in ("http", "https") or not host:
+        return f"webhook URL must be http(s) with a host: {url!r}"
+    if host in allowed_hosts:
+        return None
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as e:
+        return f"cannot resolve webhook host {host!r}: {e}"
+    blocked = sorted({info[4][0] for info in infos if _blocked_address(info[4][0])})
+    if blocked:
+        return f"webhook host {host!r} resolves to non-public address {blocked[0]} (see A2A_PUSH_ALLOWED_HOSTS)"
+    return None
+
+
+class CheckedPushNotificationConfigStore(InMemoryPushNotificationConfigStore):
+    """Config store that rejects webhook URLs check_webhook_url() refuses."""
+
+    def __init__(self, allowed_hosts: frozenset[str] = PUSH_ALLOWED_HOSTS):
+        super().__init__()
+        self.allowed_hosts = allowed_hosts
+
+    async def set_info(self, task_id: str, notification_config: PushNotificationConfig) -> None:
+        reason = await check_webhook_url(notification_config.url, self.allowed_hosts)
+        if reason:
+            raise ServerError(error=InvalidParamsError(message=reason))
+        await super().set_info(task_id, notification_config)
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError) and not isinstance(error, httpx.UnsupportedProtocol)
+
+
+@dataclass
+class _Delivery:
+    task_id: str
+    config: PushNotificationConfig
+    body: bytes
+    final: bool
+    version: int = 0
+    attempts: int = 0
+
+
+class QueuedPushNotificationSender(PushNotificationSender):
+    """PushNotificationSender that queues updates and delivers them from background workers."""
+
+    def __init__(
+        self,
+        config_store: PushNotificationConfigStore,
+        httpx_client: httpx.AsyncClient | None = None,
+        secret: str | None = PUSH_SECRET,
+        max_attempts: int = PUSH_MAX_ATTEMPTS,
+        backoff: float = PUSH_BACKOFF,
+        concurrency: int = PUSH_CONCURRENCY,
+        max_queue: int = PUSH_MAX_QUEUE,
+        allowed_hosts: frozenset[str] = PUSH_ALLOWED_HOSTS,
+    ):
+        self._config_store = config_store
+        self._client = httpx_client
+        self._owns_client = httpx_client is None
+        self.secret = secret
+        self.max_attempts, self.backoff = max_attempts, backoff
+        self.concurrency, self.max_queue = concurrency, max_queue
+        self.allowed_hosts = allowed_hosts
+        self._pending: dict[tuple[str, str], _Delivery] = {}
+        self._queue: asyncio.Queue[tuple[str, str]] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._idle: asyncio.Event | None = None
+        self.stats = {"queued": 0, "coalesced": 0, "delivered": 0, "retried": 0, "failed": 0, "dropped": 0}
+        _senders.append(self)
+
+    async def send_notification(self, task: Task) -> None:
+        configs = await self._config_store.get_info(task.id)
+        if not configs:
+            return
+        body = task.model_dump_json(by_alias=True, exclude_none=True).encode()
+        final = is_finished(task)
+        for config in configs:
+            key = (task.id, config.id or config.url)
+            delivery = self._pending.get(key)
+            if delivery is not None:
+                delivery.body, delivery.final, delivery.config = body, final, config
+                delivery.version += 1
+                self.stats["coalesced"] += 1
+                continue
+            if len(self._pending) >= self.max_queue:
+                self.stats["dropped"] += 1
+                logger.warning("Push queue full (%d); dropped update of task %s for %s", self.max_queue, task.id, config.url)
+                continue
+            self._pending[key] = _Delivery(task.id, config, body, final)
+            self.stats["queued"] += 1
+            self._start()
+            self._queue.put_nowait(key)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every queued update is delivered or given up on; False on timeout."""
+        if not self._pending:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def close(self, timeout: float | None = 5.0) -> None:
+        """Drain for up to timeout seconds, then stop the workers (and the client, if owned)."""
+        if not await self.drain(timeout):
+            logger.warning("Push sender closed with %d undelivered updates", len(self._pending))
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # -- Delivery --------------------------------------------------------------
+
+    def _start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._idle = asyncio.Event()
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=PUSH_TIMEOUT)
+        self._idle.clear()
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def _work(self) -> None:
+        while True:
+            key = await self._queue.get()
+            delivery = self._pending.get(key)
+            if delivery is not None:
+                await self._deliver(key, delivery)
+
+    def _headers(self, delivery: _Delivery) -> dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        config = delivery.config
+        if config.token:
+            headers[TOKEN_HEADER] = config.token
+        auth = config.authentication
+        if auth is not None and auth.credentials and any(s.lower() == "bearer" for s in auth.schemes):
+            headers["Authorization"] = f"Bearer {auth.credentials}"
+        if self.secret:
+            headers[SIGNATURE_HEADER] = sign(self.secret, delivery.body)
+        return headers
+
+    async def _deliver(self, key: tuple[str, str], delivery: _Delivery) -> None:
+        version = delivery.version
+        delivery.attempts += 1
+        reason = await check_webhook_url(delivery.config.url, self.allowed_hosts)
+        if reason:
+            self.stats["failed"] += 1
+            logger.warning("Push for task %s not sent: %s", delivery.task_id, reason)
+            await self._finish(key, delivery)
+            return
+        try:
+            response = await self._client.post(delivery.config.url, content=delivery.body, headers=self._headers(delivery))
+            response.raise_for_status()
+        except Exception as e:
+            if _retryable(e) and delivery.attempts < self.max_attempts:
+                delay = min(_MAX_BACKOFF, self.backoff * 2 ** (delivery.attempts - 1)) * random.uniform(0.8, 1.2)
+                self.stats["retried"] += 1
+                logger.info("Push to %s for task %s failed (%s); retry in %.1fs", delivery.config.url, delivery.task_id, e, delay)
+                asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, key)
+                return
+            self.stats["failed"] += 1
+            logger.warning(
+                "Push to %s for task %s failed after %d attempts: %s", delivery.config.url, delivery.task_id, delivery.attempts, e
+            )
+            await self._finish(key, delivery)
+            return
+        if delivery.version != version:
+            # Updated while in flight: send the newer state as well
+            delivery.attempts = 0
+            self._queue.put_nowait(key)
+            return
+        self.stats["delivered"] += 1
+        await self._finish(key, delivery)
+
+    async def _finish(self, key: tuple[str, str], delivery: _Delivery) -> None:
+        del self._pending[key]
+        if not self._pending:
+            self._idle.set()
+        if delivery.final:
+            # The task will not change again; forget its webhook
+            await self._config_store.delete_info(delivery.task_id, delivery.config.id)
+
+
+_senders: list[QueuedPushNotificationSender] = []
+
+
+def _collect_metrics():
+    if not _senders:
+        return
+    yield "a2a_push_pending", "gauge", "Push notifications queued or being retried.", [
+        ({}, sum(s.pending() for s in _senders))
+    ]
+    yield "a2a_push_total", "counter", "Push notification updates by outcome.", [
+        ({"outcome": outcome}, sum(s.stats[outcome] for s in _senders)) for outcome in _senders[0].stats
+    ]
+
+
+register_collector(_collect_metrics)
+
+
+def push_handler_kwargs() -> dict:
+    """push_config_store / push_sender arguments for DefaultRequestHandler ({} unless A2A_PUSH=1)."""
+    if not PUSH_ENABLED:
+        return {}
+    store = CheckedPushNotificationConfigStore()
+    return {"push_config_store": store, "push_sender": QueuedPushNotificationSender(store)}
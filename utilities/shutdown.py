@@ -0,0 +1,139 @@
+"""
+Graceful drain and shutdown of the A2A servers (host, agent, mcp_agent, host.colocated).
+
+serve() runs an app under uvicorn with a drain deadline of A2A_DRAIN_TIMEOUT seconds (default
+30). On SIGTERM/SIGINT:
+
+1. Every A2AApplication's Drain begins. /ready turns 503 {"status": "draining"}, and message/send
+   and message/stream over HTTP get a 503 JSON-RPC error. In-process calls (host.colocated) still
+   go through, so the host's in-flight requests can finish. uvicorn also stops accepting
+   connections.
+2. uvicorn waits for in-flight HTTP requests until the deadline, then cancels them.
+3. The lifespan shutdown waits, until the same deadline, for agent tasks still running in the
+   background (non-blocking message/send, streams whose client went away). It then cancels the
+   rest and marks those tasks canceled in the task store.
+4. The app's resources are closed: push notifications are delivered, SQLite writes flushed, MCP
+   deployment probes stopped, pooled HTTP and MCP connections and the response cache closed. Each
+   resource's close()/aclose() runs with what is left of the deadline, and at least 5 seconds.
+
+The outcome (tasks finished, tasks cancelled with their ids, resources that failed to close) is
+logged and kept in Drain.report.
+"""
+import asyncio
+import logging
+import os
+import time
+
+import uvicorn
+from a2a.types import TaskState, TaskStatus
+from a2a.utils.helpers import maybe_await
+
+logger = logging.getLogger(__name__)
+
+DRAIN_TIMEOUT = float(os.getenv("A2A_DRAIN_TIMEOUT", "30"))
+
+_MIN_CLOSE_TIMEOUT = 5.0
+
+
+class Drain:
+    """Drain state of one A2AApplication: what to wait for, what to close, and how it went."""
+
+    def __init__(self, request_handler=None, timeout: float = DRAIN_TIMEOUT):
+        self.request_handler = request_handler
+        # Closed in this order: the executor (its HTTP clients / MCP sessions), the push sender
+        # (delivers what is queued, including the cancellations), the task store (flushes writes)
+        resources = [getattr(request_handler, name, None) for name in ("agent_executor", "_push_sender", "task_store")]
+        self.resources = [r for r in resources if r is not None]
+        self.timeout = timeout
+        self.draining = False
+        self.report: dict = {}
+        self._deadline: float | None = None
+
+    def begin(self) -> None:
+        """Stop taking new tasks; the drain deadline starts now."""
+        if not self.draining:
+            self.draining = True
+            self._deadline = time.monotonic() + self.timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self._deadline - time.monotonic()) if self._deadline is not None else self.timeout
+
+    def _running(self) -> dict[str, asyncio.Task]:
+        # DefaultRequestHandler keeps each agent run (producer task) by task id until it ends
+        running = getattr(self.request_handler, "_running_agents", None) or {}
+        return {task_id: t for task_id, t in running.items() if not t.done()}
+
+    async def _mark_canceled(self, task_ids: list[str]) -> None:
+        store = getattr(self.request_handler, "task_store", None)
+        push_sender = getattr(self.request_handler, "_push_sender", None)
+        if store is None:
+            return
+        for task_id in task_ids:
+            try:
+                task = await store.get(task_id)
+                if task is not None:
+                    task = task.model_copy(update={"status": TaskStatus(state=TaskState.canceled)})
+                    await store.save(task)
+                    if push_sender is not None:
+                        await push_sender.send_notification(task)
+            except Exception as e:
+                logger.warning("Could not mark task %s canceled: %s", task_id, e)
+
+    async def shutdown(self) -> dict:
+        """Wait for running tasks until the deadline, cancel the rest, close the resources."""
+        self.begin()
+        running = self._running()
+        waited = len(running)
+        while running and self.remaining() > 0:
+            await asyncio.wait(list(running.values()), timeout=min(self.remaining(), 0.5))
+            running = self._running()
+        for task in running.values():
+            task.cancel()
+        await asyncio.gather(*running.values(), return_exceptions=True)
+        cancelled = sorted(running)
+        await self._mark_canceled(cancelled)
+
+        close_errors = {}
+        for resource in self.resources:
+            close = getattr(resource, "aclose", None) or getattr(resource, "close", None)
+            if close is None:
+                continue
+            name = type(resource).__name__
+            try:
+                await asyncio.wait_for(maybe_await(close()), max(self.remaining(), _MIN_CLOSE_TIMEOUT))
+            except TimeoutError:
+                close_errors[name] = "timed out"
+            except Exception as e:
+                close_errors[name] = f"{type(e).__name__}: {e}"
+
+        self.report = {"finished": waited - len(cancelled), "cancelled": cancelled, "close_errors": close_errors}
+        if cancelled or close_errors:
+            logger.warning(
+                "Drain: %d task(s) finished, %d cancelled %s, close errors: %s",
+                self.report["finished"], len(cancelled), cancelled, close_errors or "none",
+            )
+        else:
+            logger.info("Drain: %d task(s) finished, none cancelled", self.report["finished"])
+        return self.report
+
+    async def aclose(self) -> None:
+        """shutdown(), so that a Drain can be a resource of another one (host.colocated)."""
+        await self.shutdown()
+
+
+class _DrainingServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, drains: list[Drain]):
+        super().__init__(config)
+        self.drains = drains
+
+    def handle_exit(self, sig: int, frame) -> None:
+        for drain in self.drains:
+            drain.begin()
+        super().handle_exit(sig, frame)
+
+
+def serve(app, host: str, port: int, apps: list, drain_timeout: float = DRAIN_TIMEOUT) -> None:
+    """uvicorn.run() with a drain on SIGTERM/SIGINT for apps (the A2AApplications served by app)."""
+    config = uvicorn.Config(app, host=host, port=port, timeout_graceful_shutdown=drain_timeout)
+    _DrainingServer(config, [a.drain for a in apps]).run()
+
@@ -0,0 +1,343 @@
+"""
+Task stores for the a2a-sdk servers (host, agent, mcp_agent).
+
+- memory: BoundedInMemoryTaskStore (tasks are lost on restart). Holds at most A2A_TASK_MAX_TASKS
+  tasks (default 10000) and A2A_TASK_MAX_BYTES bytes of task JSON (default 0 = no byte budget);
+  over either limit, finished tasks (completed, canceled, failed, rejected) are evicted least
+  recently used first, and finished tasks unused for A2A_TASK_TTL seconds are evicted too. Active
+  tasks are never evicted, even over the limits. 0 disables a limit; all three 0 is the SDK's
+  unbounded InMemoryTaskStore behaviour. The same BoundedTaskMap bounds the legacy
+  server.task_manager.InMemoryTaskManager.tasks.
+- sqlite[:<path>]: SqliteTaskStore, a SQLite file in WAL mode. Tasks are indexed by task id and
+  context id and stored as compact JSON (None fields dropped). Concurrent saves are group-committed:
+  while one transaction is being written, later saves queue up (only the newest state per task is
+  kept) and go out together in the next one; save() returns once its task is committed. Tasks not
+  updated for A2A_TASK_TTL seconds (default 7 days, 0 = keep forever) are no longer returned and
+  are purged at most once a minute.
+
+Selected per server with --task-store or A2A_TASK_STORE (default memory). Without a path, the
+SQLite file is <server>_tasks.db in the working directory. See benchmarks/task_store.py.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from pathlib import Path
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks.task_store import TaskStore
+from a2a.types import Task
+
+from utilities.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+TASK_STORE = os.getenv("A2A_TASK_STORE", "memory")
+TASK_TTL = float(os.getenv("A2A_TASK_TTL", str(7 * 24 * 3600)))
+TASK_MAX_TASKS = int(os.getenv("A2A_TASK_MAX_TASKS", "10000"))
+TASK_MAX_BYTES = int(os.getenv("A2A_TASK_MAX_BYTES", "0"))
+
+# TaskState values (a2a-sdk and the legacy models alike) of tasks that will not change any more
+TERMINAL_STATES = frozenset({"completed", "canceled", "failed", "rejected"})
+
+_PURGE_INTERVAL = 60.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS tasks ("
+    "id TEXT PRIMARY KEY, context_id TEXT NOT NULL, state TEXT NOT NULL, updated REAL NOT NULL, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS tasks_context ON tasks (context_id, updated)",
+    "CREATE INDEX IF NOT EXISTS tasks_updated ON tasks (updated)",
+)
+
+# (id, context_id, state, updated, data); None marks a pending delete
+_Row = tuple[str, str, str, float, str]
+
+
+def encode_task(task: Task) -> str:
+    return task.model_dump_json(by_alias=True, exclude_none=True)
+
+
+def decode_task(data: str) -> Task:
+    return Task.model_validate_json(data)
+
+
+def is_finished(task) -> bool:
+    state = task.status.state
+    return getattr(state, "value", state) in TERMINAL_STATES
+
+
+def _json_size(task) -> int:
+    return len(task.model_dump_json(exclude_none=True))
+
+
+class _Slot:
+    __slots__ = ("task", "size", "touched")
+
+    def __init__(self, task, size: int, touched: float):
+        self.task, self.size, self.touched = task, size, touched
+
+
+# Live maps by id() for the metrics collector (mappings are unhashable, so no WeakSet)
+_maps: "weakref.WeakValueDictionary[int, BoundedTaskMap]" = weakref.WeakValueDictionary()
+
+
+class BoundedTaskMap(MutableMapping):
+    """
+    Task id -> task mapping in least-recently-used order (reads and writes both count as use).
+    Every write evicts finished tasks while over max_tasks / max_bytes, and finished tasks unused
+    for ttl seconds; unfinished tasks stay. Sizes are the task's JSON length when written, measured
+    only with a byte budget. Evictions are counted per reason in .evictions (lru, ttl).
+    """
+
+    def __init__(
+        self,
+        name: str = "tasks",
+        max_tasks: int = TASK_MAX_TASKS,
+        max_bytes: int = TASK_MAX_BYTES,
+        ttl: float = TASK_TTL,
+        is_finished: Callable[[object], bool] = is_finished,
+        size_of: Callable[[object], int] = _json_size,
+    ):
+        self.name = name
+        self.max_tasks, self.max_bytes, self.ttl = max_tasks, max_bytes, ttl
+        self._is_finished, self._size_of = is_finished, size_of
+        self._slots: OrderedDict[str, _Slot] = OrderedDict()
+        self.bytes = 0
+        self.evictions = {"lru": 0, "ttl": 0}
+        _maps[id(self)] = self
+
+    def __getitem__(self, task_id: str):
+        slot = self._slots[task_id]
+        self._slots.move_to_end(task_id)
+        slot.touched = time.monotonic()
+        return slot.task
+
+    def __setitem__(self, task_id: str, task) -> None:
+        size = self._size_of(task) if self.max_bytes else 0
+        old = self._slots.pop(task_id, None)
+        if old is not None:
+            self.bytes -= old.size
+        self._slots[task_id] = _Slot(task, size, time.monotonic())
+        self.bytes += size
+        self.evict()
+
+    def __delitem__(self, task_id: str) -> None:
+        self.bytes -= self._slots.pop(task_id).size
+
+    def __contains__(self, task_id) -> bool:
+        return task_id in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def evict(self) -> int:
+        """Evict what the limits and TTL require now; returns how many tasks went."""
+        cutoff = time.monotonic() - self.ttl if self.ttl > 0 else None
+        excess_tasks = len(self._slots) - self.max_tasks if self.max_tasks else 0
+        excess_bytes = self.bytes - self.max_bytes if self.max_bytes else 0
+        victims = []
+        for task_id, slot in self._slots.items():  # least recently used first
+            expired = cutoff is not None and slot.touched < cutoff
+            if not expired and excess_tasks <= 0 and excess_bytes <= 0:
+                break
+            if not self._is_finished(slot.task):
+                continue
+            victims.append((task_id, "ttl" if expired else "lru"))
+            excess_tasks -= 1
+            excess_bytes -= slot.size
+        for task_id, reason in victims:
+            del self[task_id]
+            self.evictions[reason] += 1
+        return len(victims)
+
+    def stats(self) -> dict:
+        return {"tasks": len(self._slots), "bytes": self.bytes, "evictions": dict(self.evictions)}
+
+
+def _collect_metrics():
+    maps = list(_maps.values())
+    if not maps:
+        return
+    yield "a2a_task_store_tasks", "gauge", "Tasks held by in-memory task stores.", [
+        ({"store": m.name}, len(m)) for m in maps
+    ]
+    yield "a2a_task_store_bytes", "gauge", "Task JSON bytes held (with a byte budget only).", [
+        ({"store": m.name}, m.bytes) for m in maps
+    ]
+    yield "a2a_task_store_evictions_total", "counter", "Finished tasks evicted, per reason.", [
+        ({"store": m.name, "reason": reason}, count) for m in maps for reason, count in m.evictions.items()
+    ]
+
+
+register_collector(_collect_metrics)
+
+
+class BoundedInMemoryTaskStore(TaskStore):
+    """In-memory TaskStore bounded by a BoundedTaskMap."""
+
+    def __init__(self, name: str = "a2a", **limits):
+        self.tasks = BoundedTaskMap(name, **limits)
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        self.tasks[task.id] = task
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        return self.tasks.get(task_id)
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        self.tasks.pop(task_id, None)
+
+    def stats(self) -> dict:
+        return self.tasks.stats()
+
+
+class SqliteTaskStore(TaskStore):
+    """TaskStore in a SQLite (WAL) file with group-committed writes and TTL purging."""
+
+    def __init__(self, path: str | Path, ttl: float = TASK_TTL):
+        self.path = str(path)
+        self.ttl = ttl
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        self._pending: dict[str, tuple[Task | None, _Row | None]] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._writer: asyncio.Task | None = None
+        self._last_purge = 0.0
+        self.stats = {"saves": 0, "transactions": 0, "rows_written": 0, "purged": 0}
+
+    # -- TaskStore -------------------------------------------------------------
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        row = (task.id, task.context_id, task.status.state.value, time.time(), encode_task(task))
+        self._pending[task.id] = (task, row)
+        self.stats["saves"] += 1
+        await self._commit()
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        pending = self._pending.get(task_id)
+        if pending is not None:
+            return pending[0]
+        rows = await asyncio.to_thread(self._select, "SELECT data FROM tasks WHERE id = ? AND updated > ?", task_id)
+        return decode_task(rows[0][0]) if rows else None
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        self._pending[task_id] = (None, None)
+        await self._commit()
+
+    # -- Extras ----------------------------------------------------------------
+
+    async def list_by_context(self, context_id: str) -> list[Task]:
+        """Tasks of a conversation (context id), oldest first."""
+        rows = await asyncio.to_thread(
+            self._select, "SELECT data FROM tasks WHERE context_id = ? AND updated > ? ORDER BY updated", context_id
+        )
+        return [decode_task(data) for (data,) in rows]
+
+    async def purge(self) -> int:
+        """Delete tasks older than the TTL now; returns how many."""
+        return await asyncio.to_thread(self._purge, time.time())
+
+    async def close(self) -> None:
+        """Wait for queued writes, then close the database."""
+        if self._writer is not None:
+            await asyncio.shield(self._writer)
+        with self._db_lock:
+            self._db.close()
+
+    # -- Internals -------------------------------------------------------------
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.ttl if self.ttl > 0 else float("-inf")
+
+    def _select(self, sql: str, key: str) -> list[tuple]:
+        # Rows past the TTL are invisible even before the next purge
+        with self._db_lock:
+            return self._db.execute(sql, (key, self._cutoff(time.time()))).fetchall()
+
+    async def _commit(self) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+        await waiter
+
+    async def _write_loop(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            rows = [row for _, row in batch.values() if row is not None]
+            deletes = [task_id for task_id, (_, row) in batch.items() if row is None]
+            try:
+                await asyncio.to_thread(self._write, rows, deletes)
+            except Exception as e:
+                logger.exception("Task store write failed (%d tasks)", len(batch))
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
+    def _write(self, rows: list[_Row], deletes: list[str]) -> None:
+        with self._db_lock:
+            with self._db:
+                if rows:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO tasks (id, context_id, state, updated, data) VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                if deletes:
+                    self._db.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deletes])
+        self.stats["transactions"] += 1
+        self.stats["rows_written"] += len(rows) + len(deletes)
+        now = time.time()
+        if self.ttl > 0 and now - self._last_purge >= _PURGE_INTERVAL:
+            self._purge(now)
+
+    def _purge(self, now: float) -> int:
+        self._last_purge = now
+        with self._db_lock:
+            with self._db:
+                purged = self._db.execute("DELETE FROM tasks WHERE updated <= ?", (self._cutoff(now),)).rowcount
+        self.stats["purged"] += purged
+        if purged:
+            logger.info("Purged %d tasks older than %.0f s from %s", purged, self.ttl, self.path)
+        return purged
+
+
+def create_task_store(spec: str | None = None, name: str = "a2a") -> TaskStore:
+    """
+    Task store from a spec: "memory", "sqlite" (file <name>_tasks.db) or "sqlite:<path>".
+    Defaults to A2A_TASK_STORE.
+    """
+    kind, _, arg = (spec or TASK_STORE).partition(":")
+    if kind == "memory":
+        return BoundedInMemoryTaskStore(name)
+    if kind == "sqlite":
+        path = arg or f"{name}_tasks.db"
+        logger.info("Task store: SQLite %s", path)
+        return SqliteTaskStore(path)
+    raise ValueError(f"Unknown task store {spec!r}; expected memory, sqlite or sqlite:<path>")
+
+
+def add_task_store_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--task-store",
+        default=None,
+        help="memory, sqlite or sqlite:<path> (default: A2A_TASK_STORE, else memory)",
+    )
@@ -0,0 +1,371 @@
+"""
+Cross-hop tracing for the A2A servers: W3C traceparent propagation, spans, local exporters.
+
+Enabled with A2A_TRACE_FILE=<traces.jsonl> (every process appends its finished spans to that file;
+point all servers at the same one) or A2A_TRACING=1 (spans kept in an in-process collector of
+A2A_TRACE_BUFFER spans, see get_collector()). The service name is A2A_SERVICE_NAME, else the
+package run with `python -m`.
+
+- Propagation: the current span's traceparent goes into outgoing A2A message metadata and HTTP
+  headers (host, AgentConnector, legacy A2AClient) and into MCP tool call _meta (mcp_connector);
+  executors, task managers and the MCP stand-in continue the incoming trace with span(name,
+  remote_parent=extract(...)).
+- Spans: every utilities.metrics phase is also a span, so routing, downstream calls, LLM calls
+  and tool calls show up under the request span of each hop.
+- CLI: `python -m utilities.tracing <trace_id> [--file traces.jsonl]` prints a trace's spans and
+  its critical path; `--list` shows the most recent traces.
+"""
+import argparse
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, NamedTuple
+
+TRACE_FILE = os.getenv("A2A_TRACE_FILE") or None
+TRACING_ENABLED = bool(TRACE_FILE) or os.getenv("A2A_TRACING", "0").lower() in ("1", "true", "yes")
+TRACE_BUFFER = int(os.getenv("A2A_TRACE_BUFFER", "10000"))
+
+TRACEPARENT = "traceparent"
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """SpanContext from a W3C traceparent ("00-<32 hex>-<16 hex>-<flags>"), or None if malformed."""
+    if not value or not isinstance(value, str):
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2])
+
+
+def format_traceparent(ctx: SpanContext) -> str:
+    return f"00-{ctx.trace_id}-{ctx.span_id}-01"
+
+
+def _default_service() -> str:
+    spec = getattr(sys.modules.get("__main__"), "__spec__", None)
+    if spec is not None and spec.name:
+        return spec.name.removesuffix(".__main__")
+    return Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "python"
+
+
+SERVICE_NAME = os.getenv("A2A_SERVICE_NAME") or None
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    service: str
+    start: float
+    end: float = 0.0
+    status: str = "ok"
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# -----------------------------------------------------------------------------
+# Exporters
+# -----------------------------------------------------------------------------
+
+class Collector:
+    """In-process ring buffer of finished spans."""
+
+    def __init__(self, max_spans: int = TRACE_BUFFER):
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+
+    def add(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def spans(self, trace_id: str | None = None) -> list[Span]:
+        return [s for s in self._spans if trace_id is None or s.trace_id == trace_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class JsonlExporter:
+    """Appends one JSON line per finished span; several processes can share the file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line)
+
+
+_collector = Collector()
+_exporter = JsonlExporter(TRACE_FILE) if TRACE_FILE else None
+
+
+def get_collector() -> Collector:
+    return _collector
+
+
+def _export(span: Span) -> None:
+    _collector.add(span)
+    if _exporter is not None:
+        _exporter.export(span)
+
+
+# -----------------------------------------------------------------------------
+# Spans
+# -----------------------------------------------------------------------------
+
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar("a2a_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def start_span(
+    name: str, remote_parent: SpanContext | None = None, inherit: bool = True, **attributes
+) -> Span | None:
+    """
+    New span under the current span (else under remote_parent, else a new trace), not made current;
+    finish it with finish_span(). None when tracing is off. inherit=False ignores the current span,
+    for server entry points that can share a context with their caller (in-process transports).
+    """
+    if not TRACING_ENABLED:
+        return None
+    parent = _current.get() if inherit else None
+    parent_ctx = parent.context if parent is not None else remote_parent
+    return Span(
+        trace_id=parent_ctx.trace_id if parent_ctx else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_id=parent_ctx.span_id if parent_ctx else None,
+        name=name,
+        service=SERVICE_NAME or _default_service(),
+        start=time.time(),
+        attributes=attributes,
+    )
+
+
+def finish_span(span: Span | None, error: BaseException | str | None = None) -> None:
+    if span is None:
+        return
+    span.end = time.time()
+    if error is not None:
+        span.status = "error"
+        span.error = str(error) or type(error).__name__
+    _export(span)
+
+
+class _SpanScope:
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self.token)
+        finish_span(self.span, exc if exc_type is not None else None)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, remote_parent: SpanContext | None = None, inherit: bool = True, **attributes):
+    """
+    Context manager running a block as the current span (sync or async code alike). remote_parent
+    (from extract()) continues an incoming trace when there is no current span in this process.
+    """
+    started = start_span(name, remote_parent, inherit, **attributes)
+    return _SpanScope(started) if started is not None else _NO_SPAN
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach an attribute to the current span (no-op without one)."""
+    current = _current.get()
+    if current is not None:
+        current.attributes[key] = value
+
+
+def current_traceparent() -> str | None:
+    current = _current.get()
+    return format_traceparent(current.context) if current is not None else None
+
+
+def inject(carrier: dict | None = None) -> dict:
+    """carrier (metadata or headers) with the current span's traceparent added; a copy, never mutated."""
+    out = dict(carrier or {})
+    value = current_traceparent()
+    if value:
+        out[TRACEPARENT] = value
+    return out
+
+
+def extract(*carriers) -> SpanContext | None:
+    """First valid traceparent among metadata dicts / header mappings / pydantic objects with extras."""
+    for carrier in carriers:
+        if carrier is None:
+            continue
+        value = carrier.get(TRACEPARENT) if hasattr(carrier, "get") else getattr(carrier, TRACEPARENT, None)
+        ctx = parse_traceparent(value)
+        if ctx is not None:
+            return ctx
+    return None
+
+
+# -----------------------------------------------------------------------------
+# Critical path CLI
+# -----------------------------------------------------------------------------
+
+def load_spans(path: str | Path, trace_id: str | None = None) -> list[Span]:
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if trace_id is None or data.get("trace_id") == trace_id:
+                spans.append(Span(**data))
+    return spans
+
+
+def critical_path(spans: list[Span]) -> list[Span]:
+    """
+    Chain of spans that determined the trace's end-to-end latency: from the root, repeatedly the
+    child that finished last before the current cursor, walking back from each span's end.
+    """
+    if not spans:
+        return []
+    ids = {s.span_id for s in spans}
+    children: dict[str | None, list[Span]] = {}
+    for s in spans:
+        children.setdefault(s.parent_id if s.parent_id in ids else None, []).append(s)
+    root = max(children[None], key=lambda s: s.end - s.start)
+
+    def walk(node: Span) -> list[Span]:
+        path = [node]
+        cursor = node.end
+        for child in sorted(children.get(node.span_id, []), key=lambda s: s.end, reverse=True):
+            if child.start >= cursor:
+                continue
+            path += walk(child)
+            cursor = child.start
+        return path
+
+    return sorted(walk(root), key=lambda s: s.start)
+
+
+def _depths(spans: list[Span]) -> dict[str, int]:
+    by_id = {s.span_id: s for s in spans}
+    depths: dict[str, int] = {}
+
+    def depth(s: Span) -> int:
+        if s.span_id not in depths:
+            parent = by_id.get(s.parent_id or "")
+            depths[s.span_id] = depth(parent) + 1 if parent is not None else 0
+        return depths[s.span_id]
+
+    for s in spans:
+        depth(s)
+    return depths
+
+
+def format_trace(spans: list[Span]) -> str:
+    spans = sorted(spans, key=lambda s: s.start)
+    path = critical_path(spans)
+    on_path = {s.span_id for s in path}
+    depths = _depths(spans)
+    origin = spans[0].start
+    total = max(s.end for s in spans) - origin
+    services = sorted({s.service for s in spans})
+    lines = [
+        f"trace {spans[0].trace_id}: {len(spans)} spans, {len(services)} services "
+        f"({', '.join(services)}), {total * 1000:.1f} ms"
+    ]
+    lines.append(f"{'':2}{'start ms':>9} {'dur ms':>9}  {'service':<12} span")
+    for s in spans:
+        mark = "*" if s.span_id in on_path else " "
+        error = f"  [error: {s.error}]" if s.status == "error" else ""
+        indent = "  " * depths[s.span_id]
+        lines.append(
+            f"{mark} {(s.start - origin) * 1000:>9.1f} {s.duration_ms:>9.1f}  {s.service:<12} {indent}{s.name}{error}"
+        )
+    lines.append("critical path (* above), self time per span:")
+    for s in path:
+        self_ms = s.duration_ms - sum(c.duration_ms for c in path if c.parent_id == s.span_id)
+        lines.append(f"  {self_ms:>9.1f} ms  {s.service:<12} {s.name}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print the spans and critical path of a trace.")
+    parser.add_argument("trace_id", nargs="?", help="Trace id (32 hex chars)")
+    parser.add_argument("--file", default=TRACE_FILE or "traces.jsonl", help="Span JSONL file (default A2A_TRACE_FILE)")
+    parser.add_argument("--list", action="store_true", help="List the most recent traces")
+    opts = parser.parse_args()
+    if opts.list or not opts.trace_id:
+        traces: dict[str, list[Span]] = {}
+        for s in load_spans(opts.file):
+            traces.setdefault(s.trace_id, []).append(s)
+        recent = sorted(traces.values(), key=lambda ss: min(s.start for s in ss))[-20:]
+        for ss in recent:
+            root = min(ss, key=lambda s: s.start)
+            total = (max(s.end for s in ss) - root.start) * 1000
+            stamp = time.strftime("%H:%M:%S", time.localtime(root.start))
+            print(f"{ss[0].trace_id}  {stamp}  {total:>9.1f} ms  {len(ss):>3} spans  {root.service}:{root.name}")
+        return
+    spans = load_spans(opts.file, opts.trace_id)
+    if not spans:
+        sys.exit(f"No spans for trace {opts.trace_id} in {opts.file}")
+    print(format_trace(spans))
+
+
+if __name__ == "__main__":
+    main()
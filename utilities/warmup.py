@@ -0,0 +1,117 @@
+"""
+Warm-up at startup and the GET /ready endpoint of the A2A servers.
+
+A server's first requests otherwise pay for importing and building its agent (LangGraph graph,
+chat model client), the MCP handshake and tool manifest, and the first connections to other
+agents. A2AApplication runs its Warmup in the background when the server starts: each step in
+turn (an executor's warm_up(), see the agent, mcp_agent and host executors), then, with
+A2A_WARMUP_PROMPT set, one synthetic message/send with that text through the server's own request
+handler (in process; it goes through the LLM and, on the host, to the agent it routes to).
+
+GET /ready answers 503 {"status": "warming"} until warm-up is over, then 200 {"status": "ready"},
+so a load balancer only sends traffic to warm instances; both list each step's time and error.
+A failed or timed-out step is logged and reported but does not keep the server out of rotation
+(a down MCP server or agent should not take a healthy host down with it). A2A_WARMUP=0 skips the
+steps (ready at once); A2A_WARMUP_TIMEOUT bounds the whole warm-up (seconds, default 120).
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("A2A_WARMUP", "1").lower() not in ("0", "false", "no")
+WARMUP_PROMPT = os.getenv("A2A_WARMUP_PROMPT") or None
+WARMUP_TIMEOUT = float(os.getenv("A2A_WARMUP_TIMEOUT", "120"))
+
+Step = tuple[str, Callable[[], Awaitable]]
+
+
+def synthetic_request_step(handler, prompt: str) -> Step:
+    """Step sending one message/send with prompt to a JSONRPCHandler, in process."""
+    from a2a.server.context import ServerCallContext
+    from a2a.types import Message, MessageSendParams, Part, Role, SendMessageRequest, TextPart
+
+    async def send() -> None:
+        message = Message(
+            message_id=str(uuid.uuid4()),
+            role=Role.user,
+            parts=[Part(root=TextPart(text=prompt))],
+            metadata={"warmup": True},
+        )
+        request = SendMessageRequest(id="warmup", params=MessageSendParams(message=message))
+        response = await handler.on_message_send(request, ServerCallContext())
+        error = getattr(response.root, "error", None)
+        if error is not None:
+            raise RuntimeError(f"synthetic request failed: {error.message}")
+
+    return "synthetic_request", send
+
+
+class Warmup:
+    """Runs warm-up steps once and tracks readiness for GET /ready."""
+
+    def __init__(
+        self,
+        steps: list[Step] | None = None,
+        enabled: bool = WARMUP_ENABLED,
+        timeout: float = WARMUP_TIMEOUT,
+    ):
+        self.steps = list(steps or [])
+        self.enabled = enabled
+        self.timeout = timeout
+        self.status = "pending" if enabled else "ready"
+        self.results: dict[str, dict] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def start(self) -> asyncio.Task:
+        """Run the warm-up in the background on the running loop (once)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def run(self) -> None:
+        if self.status != "pending":
+            return
+        self.status = "warming"
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+        try:
+            for name, step in self.steps:
+                step_started = time.perf_counter()
+                result = self.results[name] = {}
+                try:
+                    await asyncio.wait_for(step(), max(0.0, deadline - time.monotonic()))
+                except TimeoutError:
+                    result["error"] = "timed out"
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                result["ms"] = round((time.perf_counter() - step_started) * 1000, 1)
+                if "error" in result:
+                    logger.warning("Warm-up step %s failed after %.0f ms: %s", name, result["ms"], result["error"])
+        finally:
+            # Also when cancelled (e.g. as a step of an outer warm-up that timed out)
+            self.status = "ready"
+        logger.info("Warm-up done in %.0f ms", (time.perf_counter() - started) * 1000)
+
+    def report(self) -> dict:
+        return {"status": self.status, "steps": self.results}
+
+    async def endpoint(self, request: Request) -> JSONResponse:
+        """Starlette handler for GET /ready."""
+        return JSONResponse(self.report(), status_code=200 if self.ready else 503)